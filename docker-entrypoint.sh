@@ -0,0 +1,33 @@
+#!/bin/sh
+# Container entrypoint of the backend image.
+#
+#   docker run IMAGE            serve the API with gunicorn (myproj/gunicorn_config.py)
+#   docker run IMAGE migrate    apply migrations and exit; run once per release,
+#                               before the new web containers start
+#   docker run IMAGE manage ARGS...   run any manage.py command
+#
+# Serving never migrates on its own, so several web containers can start at once
+# without racing on the schema. For a single local container, RUN_MIGRATIONS=true
+# migrates before serving.
+set -e
+
+command="${1:-web}"
+
+case "$command" in
+    web)
+        if [ "${RUN_MIGRATIONS:-false}" = "true" ]; then
+            python manage.py migrate --noinput
+        fi
+        exec gunicorn -c python:myproj.gunicorn_config
+        ;;
+    migrate)
+        exec python manage.py migrate --noinput
+        ;;
+    manage)
+        shift
+        exec python manage.py "$@"
+        ;;
+    *)
+        exec "$@"
+        ;;
+esac
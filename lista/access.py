@@ -0,0 +1,119 @@
+"""
+Maintenance of the denormalized ListAccess table.
+
+Every list a user can open is recorded in ListAccess, either with the 'owner' role
+(the ListItem owner, always full access) or with the role and permission of the
+GroupList that shares it. The functions in this module keep those rows in step with
+ListItem and GroupList; they are called from the model signals in `lista.signals`
+and from code paths that bypass signals (e.g. bulk operations).
+
+All functions must run inside the transaction that changes the source rows, so the
+access table is never observed out of date. Each of them invalidates the cached
+permissions of the users whose rows changed (see `lista.permissions`).
+
+Functions:
+- grant_owner_access: Records the owner of a list.
+- grant_shared_access: Records (or updates) the access given by a GroupList.
+- revoke_shared_access: Removes the access given by a GroupList.
+- sync_list_access: Rebuilds the access rows of some lists from scratch.
+"""
+
+from .models import GroupList, ListAccess, ListItem
+from .permissions import invalidate_permissions
+
+FULL_ACCESS = 'full_access'
+
+
+def grant_owner_access(list_item):
+    """
+    Records the owner of a list, replacing any previous owner row.
+
+    Args:
+        list_item (ListItem): The list whose owner is recorded.
+    """
+    previous_owners = ListAccess.objects.filter(
+        list_item_id=list_item.id, role=ListAccess.OWNER_ROLE
+    ).exclude(user_id=list_item.user_id)
+    invalidate_permissions(list(previous_owners.values_list('user_id', flat=True)) +
+                           [list_item.user_id])
+    previous_owners.delete()
+    ListAccess.objects.update_or_create(
+        user_id=list_item.user_id,
+        list_item_id=list_item.id,
+        defaults={'permission_type': FULL_ACCESS, 'role': ListAccess.OWNER_ROLE},
+    )
+
+
+def grant_shared_access(user_id, list_item_id, permission_type, role):
+    """
+    Records the access a GroupList gives to a user. The owner row of a list is
+    never downgraded by a share.
+
+    Args:
+        user_id (int): The ID of the user the list is shared with.
+        list_item_id (int): The ID of the shared list.
+        permission_type (str): The permission granted by the GroupList.
+        role (str): The role granted by the GroupList.
+    """
+    invalidate_permissions([user_id])
+    updated = ListAccess.objects.filter(
+        user_id=user_id, list_item_id=list_item_id
+    ).exclude(role=ListAccess.OWNER_ROLE).update(permission_type=permission_type, role=role)
+    if not updated:
+        if ListAccess.objects.filter(user_id=user_id, list_item_id=list_item_id).exists():
+            return
+        ListAccess.objects.create(
+            user_id=user_id, list_item_id=list_item_id,
+            permission_type=permission_type, role=role)
+
+
+def revoke_shared_access(user_id, list_item_id):
+    """
+    Removes the access a GroupList gave to a user. If another GroupList still shares
+    the same list with the user, its access is recorded instead.
+
+    Args:
+        user_id (int): The ID of the user the list was shared with.
+        list_item_id (int): The ID of the list.
+    """
+    remaining = GroupList.objects.filter(
+        user_id=user_id, list_item_id=list_item_id
+    ).values('permission_type', 'role').last()
+    if remaining:
+        grant_shared_access(user_id, list_item_id, remaining['permission_type'],
+                            remaining['role'])
+        return
+    invalidate_permissions([user_id])
+    ListAccess.objects.filter(
+        user_id=user_id, list_item_id=list_item_id
+    ).exclude(role=ListAccess.OWNER_ROLE).delete()
+
+
+def sync_list_access(list_item_ids):
+    """
+    Rebuilds the access rows of the given lists from ListItem and GroupList.
+
+    Args:
+        list_item_ids (iterable): The IDs of the lists to rebuild.
+    """
+    list_item_ids = list(list_item_ids)
+    rows = {}
+    shares = GroupList.objects.filter(
+        list_item_id__in=list_item_ids
+    ).values_list('user_id', 'list_item_id', 'permission_type', 'role').order_by('id')
+    for user_id, list_item_id, permission_type, role in shares:
+        rows[(user_id, list_item_id)] = (permission_type, role)
+
+    owners = ListItem.objects.filter(id__in=list_item_ids).values_list('user_id', 'id')
+    for user_id, list_item_id in owners:
+        rows[(user_id, list_item_id)] = (FULL_ACCESS, ListAccess.OWNER_ROLE)
+
+    previous_rows = ListAccess.objects.filter(list_item_id__in=list_item_ids)
+    invalidate_permissions(list(previous_rows.values_list('user_id', flat=True)) +
+                           [user_id for user_id, _ in rows])
+    previous_rows.delete()
+    ListAccess.objects.bulk_create([
+        ListAccess(user_id=user_id, list_item_id=list_item_id,
+                   permission_type=permission_type, role=role)
+        for (user_id, list_item_id), (permission_type, role) in rows.items()
+    ])
@@ -1,11 +1,13 @@
 from django.contrib import admin
 
 # Register your models here.
-from .models import (Customization, GroupList, ListItem, ListItemImage,
-                     Recommendation)
+from .models import (BatchRequest, Customization, GroupList, ListAccess, ListItem,
+                     ListItemImage, Recommendation)
 
 admin.site.register(ListItem)
 admin.site.register(GroupList)
 admin.site.register(ListItemImage)
 admin.site.register(Customization)
 admin.site.register(Recommendation)
+admin.site.register(ListAccess)
+admin.site.register(BatchRequest)
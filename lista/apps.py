@@ -24,4 +24,6 @@ class ListaConfig(AppConfig):
         Description:
             Typically, this method does not need to be modified unless
             special configuration is required when the application is ready.
+            It connects the model signal handlers defined in `lista.signals`.
         """
+        from . import signals  # pylint: disable=import-outside-toplevel,unused-import
@@ -0,0 +1,166 @@
+"""
+JWT authentication with an in-process cache of validated tokens.
+
+simplejwt's `JWTAuthentication` verifies the token signature and loads the user row
+on every request. `CachedJWTAuthentication` remembers, per raw token, the validated
+token and a snapshot of its user in a small LRU cache, so repeated requests with the
+same access token skip both the verification and the user query.
+
+A cached entry is never used longer than the uncached path would accept it:
+- it expires after JWT_AUTH_CACHE_TTL seconds, and never outlives the token's 'exp';
+- all entries of a user are dropped when the user is saved or deleted (password
+  change, deactivation) and when one of their tokens is blacklisted, so the next
+  request goes through the full checks again (see `lista.signals`).
+The cache lives in each worker process; changes made by another process are picked
+up once the entry expires, which is why the TTL is kept short.
+
+Settings (see `myproj/settings.py`):
+- JWT_AUTH_CACHE_TTL: Seconds an entry is reused, 0 disables the cache.
+- JWT_AUTH_CACHE_SIZE: Maximum number of cached tokens per process.
+
+Classes:
+- TokenCache: Thread-safe TTL/LRU cache of (user, validated token) per raw token.
+- CachedJWTAuthentication: Drop-in replacement for simplejwt's JWTAuthentication.
+
+Functions:
+- forget_user_tokens: Drops the cached tokens of a user.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class TokenCache:
+    """
+    A thread-safe LRU cache of authenticated users keyed by raw token, with expiry.
+
+    Attributes:
+        max_size (int): The maximum number of entries kept.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._tokens_by_user = {}
+        self._lock = threading.Lock()
+
+    def get(self, raw_token, now=None):
+        """
+        Returns the cached (user, validated_token) of a raw token, or None.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(raw_token)
+            if entry is None:
+                return None
+            expires_at, user, validated_token = entry
+            if expires_at <= now:
+                self._remove(raw_token)
+                return None
+            self._entries.move_to_end(raw_token)
+            return user, validated_token
+
+    def set(self, raw_token, user, validated_token, ttl):
+        """
+        Caches the user of a raw token for `ttl` seconds.
+        """
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._remove(raw_token)
+            self._entries[raw_token] = (time.monotonic() + ttl, user, validated_token)
+            self._tokens_by_user.setdefault(user.pk, set()).add(raw_token)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def forget_user(self, user_id):
+        """
+        Drops every cached token of a user.
+        """
+        with self._lock:
+            for raw_token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(raw_token)
+
+    def clear(self):
+        """
+        Drops every cached token.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, raw_token):
+        """
+        Removes one entry; the lock must be held.
+        """
+        entry = self._entries.pop(raw_token, None)
+        if entry is None:
+            return
+        user_id = entry[1].pk
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(raw_token)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+
+
+token_cache = TokenCache(settings.JWT_AUTH_CACHE_SIZE)
+
+
+def forget_user_tokens(user_id):
+    """
+    Drops the cached tokens of a user, so their next request is fully authenticated.
+
+    Args:
+        user_id (int): The ID of the user whose account or tokens changed.
+    """
+    token_cache.forget_user(user_id)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Authenticates requests with a JWT access token, reusing recent validations.
+
+    Each request gets its own copy of the cached user, so changes a view makes to
+    `request.user` never leak into other requests.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        cached = token_cache.get(raw_token)
+        if cached is not None:
+            user, validated_token = cached
+            return copy.copy(user), validated_token
+
+        validated_token = self.get_validated_token(raw_token)
+        user = self.get_user(validated_token)
+        token_cache.set(raw_token, copy.copy(user), validated_token,
+                        self._cache_ttl(validated_token))
+        return user, validated_token
+
+    @staticmethod
+    def _cache_ttl(validated_token):
+        """
+        Returns how long a validated token may be reused: the configured TTL, capped
+        by the time left until the token expires.
+        """
+        ttl = settings.JWT_AUTH_CACHE_TTL
+        expires_at = validated_token.get('exp')
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+        return ttl
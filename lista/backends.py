@@ -0,0 +1,43 @@
+"""
+Authentication backend that checks passwords in the bounded hashing pool.
+
+`PooledPasswordBackend` behaves like Django's `ModelBackend` (same user lookup,
+inactive users rejected, a dummy hash for unknown usernames so response times
+don't reveal which accounts exist), but the password hashing runs through
+`lista.hashing`, so a flood of logins can't occupy every request worker.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .hashing import check_user_password, hash_password
+
+
+class PooledPasswordBackend(ModelBackend):
+    """
+    ModelBackend with password hashing offloaded to the hashing pool.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        """
+        Returns the user matching the credentials, or None.
+
+        Raises:
+            HashingBusy: If the hashing pool is saturated.
+        """
+        user_model = get_user_model()
+        if username is None:
+            username = kwargs.get(user_model.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        try:
+            user = user_model._default_manager.get_by_natural_key(username)
+        except user_model.DoesNotExist:
+            # Spend the same hashing time as for an existing user.
+            hash_password(password)
+            return None
+
+        if check_user_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
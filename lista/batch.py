@@ -0,0 +1,332 @@
+"""
+Execution of /batch/ requests: ordered operations on lists, shares and images,
+applied in one transaction.
+
+A batch is {"operations": [{"method": "POST", "path": "/listitem/", "body": {...}},
+...]}. Each operation is dispatched in-process to the view its path resolves to, as
+the same user and like a request of its own (permissions, validation, logging), but
+within the batch's transaction: when an operation fails (status >= 400) the whole
+batch is rolled back and nothing is applied. Only the list, sharing and image
+viewsets (`BATCH_VIEWSETS`) can be called, with JSON bodies. Their actions that
+write files to storage (uploads) keep their own endpoints: a rollback only undoes
+the database rows, and would leave the files orphaned.
+
+An operation can use the responses of earlier ones: "$<index>.<field>" in its path,
+or as a whole string value in its body, is replaced by that field of the response of
+operation <index>, e.g. "$0.id" for the ID of a list created by operation 0.
+
+Idempotency: a batch sent with an Idempotency-Key header is recorded (BatchRequest)
+in its own transaction, together with its response. A retry with the same key gets
+the stored response back instead of applying the operations again, for
+BATCH_IDEMPOTENCY_TTL seconds. A failed batch isn't recorded, as nothing was applied.
+
+Functions:
+- parse_operations: Validates the body of a batch request.
+- execute_batch: Applies the operations, or replays the response of a retried batch.
+"""
+
+import hashlib
+import json
+import re
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .models import BatchRequest
+
+# The viewsets whose actions a batch may call, with the actions it may not: those
+# writing files to storage, which a rollback of the batch wouldn't delete.
+BATCH_VIEWSETS = {
+    'lista.views.lists.ListItemViewSet': set(),
+    'lista.views.groups.GroupListViewSet': set(),
+    'lista.views.images.ListItemImageViewSet': {'create', 'upload_images', 'confirm_upload'},
+}
+
+METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+# Request metadata passed on to the operations (client address, host, language).
+_FORWARDED_META = ('REMOTE_ADDR', 'SERVER_NAME', 'SERVER_PORT', 'HTTP_HOST',
+                   'HTTP_X_FORWARDED_FOR', 'HTTP_ACCEPT_LANGUAGE', 'HTTP_USER_AGENT',
+                   'wsgi.url_scheme')
+
+_REFERENCE = re.compile(r'\$(\d+)\.([A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)')
+
+
+class InvalidBatch(APIException):
+    """
+    Raised for a malformed batch (400).
+    """
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = "Invalid batch."
+    default_code = 'invalid_batch'
+
+
+class IdempotencyKeyReused(APIException):
+    """
+    Raised when an idempotency key is sent again with different operations (422).
+    """
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "This Idempotency-Key was already used for a different batch."
+    default_code = 'idempotency_key_reused'
+
+
+class BatchInProgress(APIException):
+    """
+    Raised when a batch with the same idempotency key is being applied (409).
+    """
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A batch with this Idempotency-Key is in progress; retry later."
+    default_code = 'batch_in_progress'
+
+
+class _Rollback(Exception):
+    """
+    Raised to roll back the batch after a failed operation.
+    """
+
+    def __init__(self, index):
+        super().__init__(index)
+        self.index = index
+
+
+def parse_operations(data):
+    """
+    Validates the body of a batch request.
+
+    Args:
+        data (dict): The request data, {"operations": [...]}.
+
+    Returns:
+        list: The operations, as dicts with 'method', 'path' and 'body' (or None).
+
+    Raises:
+        InvalidBatch: If the batch or one of its operations is malformed.
+    """
+    operations = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(operations, list) or not operations:
+        raise InvalidBatch("'operations' must be a non-empty list.")
+    if len(operations) > settings.BATCH_MAX_OPERATIONS:
+        raise InvalidBatch(f"A batch accepts at most {settings.BATCH_MAX_OPERATIONS} operations.")
+
+    parsed = []
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            raise InvalidBatch(f"Operation {index} must be an object.")
+        method = str(operation.get('method', '')).upper()
+        path = operation.get('path')
+        body = operation.get('body')
+        if method not in METHODS:
+            raise InvalidBatch(f"Operation {index}: 'method' must be one of {', '.join(METHODS)}.")
+        if not isinstance(path, str) or not path:
+            raise InvalidBatch(f"Operation {index}: 'path' is required.")
+        if body is not None and not isinstance(body, (dict, list)):
+            raise InvalidBatch(f"Operation {index}: 'body' must be an object or a list.")
+        parsed.append({'method': method, 'path': path, 'body': body})
+    return parsed
+
+
+def _fingerprint(operations):
+    """
+    Returns the SHA-256 of the operations' canonical JSON.
+    """
+    canonical = json.dumps(operations, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _referenced_value(results, index, field_path, operation_index):
+    """
+    Returns a field of the response of an earlier operation.
+
+    Raises:
+        InvalidBatch: If the operation or the field doesn't exist.
+    """
+    index = int(index)
+    if index >= operation_index:
+        raise InvalidBatch(f"Operation {operation_index} refers to operation {index}, "
+                           "which hasn't run yet.")
+    value = results[index]['body']
+    for field in field_path.split('.'):
+        if not isinstance(value, dict) or field not in value:
+            raise InvalidBatch(f"Operation {operation_index}: the response of operation "
+                               f"{index} has no '{field_path}'.")
+        value = value[field]
+    return value
+
+
+def _substitute(value, results, operation_index):
+    """
+    Replaces the references to earlier responses in a body.
+    """
+    if isinstance(value, dict):
+        return {key: _substitute(item, results, operation_index) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_substitute(item, results, operation_index) for item in value]
+    if isinstance(value, str):
+        match = _REFERENCE.fullmatch(value)
+        if match:
+            return _referenced_value(results, *match.groups(), operation_index)
+    return value
+
+
+def _substitute_path(path, results, operation_index):
+    """
+    Replaces the references to earlier responses in a path.
+    """
+    return _REFERENCE.sub(
+        lambda match: str(_referenced_value(results, *match.groups(), operation_index)), path)
+
+
+def _operation_request(request, method, path, query, body):
+    """
+    Builds the request of an operation: same user and client as the batch request,
+    with the operation's method, path and JSON body.
+    """
+    parent = request._request
+    operation_request = HttpRequest()
+    operation_request.method = method
+    operation_request.path = operation_request.path_info = path
+    operation_request.META = {
+        key: parent.META[key] for key in _FORWARDED_META if key in parent.META}
+    operation_request.META.update({
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'HTTP_ACCEPT': 'application/json',
+    })
+    operation_request.GET = QueryDict(query)
+    if body is not None:
+        payload = json.dumps(body).encode()
+        operation_request.META['CONTENT_TYPE'] = 'application/json'
+        operation_request.META['CONTENT_LENGTH'] = str(len(payload))
+        # DRF reads an already read body from `body` instead of the stream.
+        operation_request._body = payload
+        operation_request._read_started = True
+    # Authenticated as the batch's user by DRF, without authenticating again.
+    operation_request._force_auth_user = request.user
+    operation_request._force_auth_token = request.auth
+    # The batch's own access changes are only invalidated in the cache on commit.
+    operation_request.permission_cache = False
+    return operation_request
+
+
+def _run_operation(request, index, operation, results):
+    """
+    Runs one operation and returns its result, {"status": int, "body": data}.
+    """
+    url = urlsplit(_substitute_path(operation['path'], results, index))
+    path = '/' + url.path.lstrip('/')
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return {'status': status.HTTP_404_NOT_FOUND, 'body': {'detail': "Not found."}}
+
+    view_class = getattr(match.func, 'cls', None)
+    view_path = view_class and f'{view_class.__module__}.{view_class.__name__}'
+    if view_path not in BATCH_VIEWSETS:
+        return {'status': status.HTTP_400_BAD_REQUEST,
+                'body': {'detail': f"{path} can't be called in a batch."}}
+    action = (getattr(match.func, 'actions', None) or {}).get(operation['method'].lower())
+    if action in BATCH_VIEWSETS[view_path]:
+        return {'status': status.HTTP_400_BAD_REQUEST,
+                'body': {'detail': f"{operation['method']} {path} stores files and can't be "
+                                   "called in a batch; use its own endpoint."}}
+
+    body = _substitute(operation['body'], results, index)
+    operation_request = _operation_request(request, operation['method'], path, url.query, body)
+    response = match.func(operation_request, *match.args, **match.kwargs)
+    return {'status': response.status_code, 'body': getattr(response, 'data', None)}
+
+
+def _stored_response(user, idempotency_key, fingerprint):
+    """
+    Returns the stored (status, body) of a committed batch, or None.
+
+    Raises:
+        IdempotencyKeyReused: If the key was used for other operations.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.BATCH_IDEMPOTENCY_TTL)
+    record = BatchRequest.objects.filter(
+        user=user, idempotency_key=idempotency_key, created_at__gte=cutoff).first()
+    if record is None:
+        return None
+    if record.fingerprint != fingerprint:
+        raise IdempotencyKeyReused()
+    return record.status_code, record.response
+
+
+def execute_batch(request, operations, idempotency_key=None):
+    """
+    Applies the operations of a batch in one transaction, or returns the stored
+    response of a batch already applied with the same idempotency key.
+
+    Args:
+        request (Request): The batch request (its user runs the operations).
+        operations (list): The operations, from `parse_operations`.
+        idempotency_key (str, optional): The client's Idempotency-Key.
+
+    Returns:
+        tuple: (HTTP status, response body, whether the response is a replay). The body
+        is {"committed": bool, "results": [{"status", "body"}...]}, plus
+        "failed_operation" (index) when an operation failed; the status is then the
+        failed operation's.
+
+    Raises:
+        InvalidBatch: If the key or a reference to an earlier response is invalid.
+        IdempotencyKeyReused: If the key was used for other operations.
+        BatchInProgress: If a batch with the same key is being applied concurrently.
+    """
+    user = request.user
+    fingerprint = _fingerprint(operations)
+    if idempotency_key is not None:
+        if not idempotency_key or len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise InvalidBatch(f"Idempotency-Key must be 1 to {IDEMPOTENCY_KEY_MAX_LENGTH} "
+                               "characters long.")
+        stored = _stored_response(user, idempotency_key, fingerprint)
+        if stored is not None:
+            return (*stored, True)
+
+    results = []
+    try:
+        with transaction.atomic():
+            record = None
+            if idempotency_key is not None:
+                cutoff = timezone.now() - timedelta(seconds=settings.BATCH_IDEMPOTENCY_TTL)
+                BatchRequest.objects.filter(user=user, created_at__lt=cutoff).delete()
+                try:
+                    with transaction.atomic():
+                        # Waits for a concurrent batch with the same key, then fails.
+                        record = BatchRequest.objects.create(
+                            user=user, idempotency_key=idempotency_key, fingerprint=fingerprint)
+                except IntegrityError:
+                    stored = _stored_response(user, idempotency_key, fingerprint)
+                    if stored is not None:
+                        return (*stored, True)
+                    raise BatchInProgress()
+
+            for index, operation in enumerate(operations):
+                result = _run_operation(request, index, operation, results)
+                results.append(result)
+                if result['status'] >= 400:
+                    raise _Rollback(index)
+
+            body = {'committed': True, 'results': results}
+            if record is not None:
+                record.response = body
+                record.save(update_fields=['response'])
+    except _Rollback as rollback:
+        failed = results[rollback.index]
+        return failed['status'], {
+            'committed': False,
+            'failed_operation': rollback.index,
+            'results': results,
+        }, False
+    return status.HTTP_200_OK, body, False
@@ -0,0 +1,245 @@
+"""
+Django cache backends of the project.
+
+`TieredCache` keeps a small in-process LRU (L1) in front of another cache alias (L2,
+usually Redis). Reads are served from L1 when possible, which saves a network round
+trip and the unpickling of large entries by the L2 backend; writes go to L2 and L1.
+Entries stay in L1 for at most L1_TIMEOUT seconds, which bounds how long a change
+made by another process can go unnoticed. Keys whose value never changes once
+written (e.g. versioned keys, see `lista.caching.CacheNamespace`) are always fresh.
+
+Configured by myproj/caches.py:
+
+    'default': {
+        'BACKEND': 'lista.cache_backends.TieredCache',
+        'LOCATION': 'shared',  # the L2 alias
+        'OPTIONS': {'L1_SIZE': 1024, 'L1_TIMEOUT': 5},
+    }
+
+L1 stores pickled values, like Django's local-memory cache, so callers can't mutate
+a cached object by accident. Counting and atomic operations (`add`, `incr`, `decr`)
+are always done by L2.
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+_MISSING = object()
+
+
+class LocalLRU:
+    """
+    A thread-safe, size-bounded LRU of pickled values with expiry, shared by the
+    threads of a process.
+
+    Attributes:
+        hits (int): Lookups that found a live entry.
+        misses (int): Lookups that didn't.
+    """
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, size):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the value of a live entry, or `_MISSING`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            pickled = entry[1]
+        return pickle.loads(pickled)
+
+    def set(self, key, value, lifetime):
+        """
+        Stores a value for `lifetime` seconds, evicting the least recently used entries.
+        """
+        if lifetime <= 0:
+            self.delete(key)
+            return
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + lifetime, pickled)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """
+        Drops an entry.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Drops every entry and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+# Django creates a cache backend instance per thread; like LocMemCache, the L1 of a
+# location is kept here so that it is shared by the threads of the process.
+_l1_stores = {}
+_l1_stores_lock = threading.Lock()
+
+
+def _l1_store(location, size):
+    with _l1_stores_lock:
+        if location not in _l1_stores:
+            _l1_stores[location] = LocalLRU(size)
+        return _l1_stores[location]
+
+
+class TieredCache(BaseCache):
+    """
+    An in-process LRU cache (L1) in front of another configured cache (L2).
+
+    Attributes:
+        l1 (LocalLRU): This process's L1, whose `hits` and `misses` count the reads.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._l2_alias = location
+        self._l1_timeout = float(options.get('L1_TIMEOUT', 5))
+        self.l1 = _l1_store(location, int(options.get('L1_SIZE', 1024)))
+
+    @property
+    def l2(self):
+        """
+        The L2 cache (`caches` returns one instance per thread).
+        """
+        return caches[self._l2_alias]
+
+    def _l1_key(self, key, version):
+        return self.l2.make_and_validate_key(key, version=version)
+
+    def _l1_set(self, l1_key, value, timeout=DEFAULT_TIMEOUT):
+        # BaseCache's backend timeout: an absolute expiry time, or None for no expiry.
+        expires_at = self.get_backend_timeout(timeout)
+        lifetime = self._l1_timeout
+        if expires_at is not None:
+            lifetime = min(lifetime, expires_at - time.time())
+        self.l1.set(l1_key, value, lifetime)
+
+    def get(self, key, default=None, version=None):
+        l1_key = self._l1_key(key, version)
+        value = self.l1.get(l1_key)
+        if value is not _MISSING:
+            return value
+        value = self.l2.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            return default
+        # The remaining L2 lifetime isn't known; L1_TIMEOUT bounds the L1 copy.
+        self._l1_set(l1_key, value, timeout=None)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        missing = []
+        for key in keys:
+            value = self.l1.get(self._l1_key(key, version))
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+        if missing:
+            from_l2 = self.l2.get_many(missing, version=version)
+            for key, value in from_l2.items():
+                self._l1_set(self._l1_key(key, version), value, timeout=None)
+            found.update(from_l2)
+        return found
+
+    def has_key(self, key, version=None):
+        if self.l1.get(self._l1_key(key, version)) is not _MISSING:
+            return True
+        return self.l2.has_key(key, version=version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l2.set(key, value, timeout=timeout, version=version)
+        self._l1_set(self._l1_key(key, version), value, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.l2.set_many(data, timeout=timeout, version=version)
+        for key, value in data.items():
+            if key in failed:
+                self.l1.delete(self._l1_key(key, version))
+            else:
+                self._l1_set(self._l1_key(key, version), value, timeout)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.l2.add(key, value, timeout=timeout, version=version)
+        l1_key = self._l1_key(key, version)
+        if added:
+            self._l1_set(l1_key, value, timeout)
+        else:
+            # Another process holds the key; don't trust an older local copy.
+            self.l1.delete(l1_key)
+        return added
+
+    def incr(self, key, delta=1, version=None):
+        l1_key = self._l1_key(key, version)
+        try:
+            value = self.l2.incr(key, delta, version=version)
+        except ValueError:
+            self.l1.delete(l1_key)
+            raise
+        self._l1_set(l1_key, value, timeout=None)
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        return self.incr(key, -delta, version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        touched = self.l2.touch(key, timeout=timeout, version=version)
+        l1_key = self._l1_key(key, version)
+        value = self.l1.get(l1_key) if touched else _MISSING
+        if value is _MISSING:
+            self.l1.delete(l1_key)
+        else:
+            self._l1_set(l1_key, value, timeout)
+        return touched
+
+    def delete(self, key, version=None):
+        self.l1.delete(self._l1_key(key, version))
+        return self.l2.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self.l1.delete(self._l1_key(key, version))
+        self.l2.delete_many(keys, version=version)
+
+    def clear(self):
+        self.clear_local()
+        self.l2.clear()
+
+    def clear_local(self):
+        """
+        Empties this process's L1 only.
+        """
+        self.l1.clear()
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
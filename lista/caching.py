@@ -0,0 +1,226 @@
+"""
+Cache helpers for values that are expensive to compute and invalidated by version.
+
+- CacheNamespace: namespaced keys with a version per namespace (and optional scope,
+  e.g. a user). `invalidate` moves the namespace to a new version, so every entry
+  written under the previous one is never read again and simply expires; there is no
+  need to know or delete the individual keys. Versions live in the shared cache, so
+  an invalidation is seen by every process at once, while the entries themselves
+  never change once written and can be served by a process's L1 (see
+  `lista.cache_backends.TieredCache`).
+- get_or_compute: read-through caching with stampede protection:
+  - probabilistic early expiration (XFetch): each read of an entry close to its
+    expiry recomputes it early with a probability that grows as the expiry
+    approaches and with the time the computation took, so the entry is usually
+    refreshed by one request before it expires instead of by all of them after;
+  - single flight: concurrent misses on a key compute it once. Threads of a process
+    wait for the thread computing it; other processes serve the value being
+    refreshed if there is one, or wait for it (up to the lock timeout) otherwise.
+
+Values stored by `get_or_compute` are wrapped with their expiry, so a key must
+always be read with `get_or_compute` (or `CacheNamespace.get_or_compute`).
+"""
+
+import math
+import random
+import threading
+import time
+
+from django.core.cache import caches
+
+from myproj.caches import SHARED_ALIAS
+
+# Seconds between two checks of a process waiting for another one's computation.
+_POLL_INTERVAL = 0.05
+
+
+class _Flight:
+    """
+    A computation of a key in progress in this process.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def _expires_soon(delta, expires_at, beta):
+    """
+    XFetch: decides whether to recompute an entry before it expires.
+
+    Args:
+        delta (float): Seconds the last computation of the entry took.
+        expires_at (float): When the entry expires (Unix time), None for never.
+        beta (float): > 1 favours earlier recomputation, < 1 later.
+    """
+    if expires_at is None:
+        return False
+    # -log(U) with U uniform in (0, 1] is an exponential draw with mean 1.
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expires_at
+
+
+def _compute_and_store(cache, key, compute, timeout):
+    """
+    Computes a value and stores it with its computation time and expiry.
+    """
+    start = time.time()
+    value = compute()
+    delta = time.time() - start
+    expires_at = None if timeout is None else time.time() + timeout
+    cache.set(key, (value, delta, expires_at), timeout=timeout)
+    return value
+
+
+def _compute_once(cache, key, compute, timeout, stale, lock_timeout):
+    """
+    Computes a key in a single thread of the process and, through a lock in the
+    shared cache, in a single process; returns the value or the one being refreshed.
+    """
+    shared = caches[SHARED_ALIAS]
+    lock_key = f'{key}:computing'
+    if shared.add(lock_key, 1, timeout=lock_timeout):
+        try:
+            return _compute_and_store(cache, key, compute, timeout)
+        finally:
+            shared.delete(lock_key)
+    if stale is not None:
+        return stale[0]
+
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+    # The other process is too slow (or died); compute it here.
+    return _compute_and_store(cache, key, compute, timeout)
+
+
+def get_or_compute(key, compute, timeout, cache_alias='default', beta=1.0, lock_timeout=10):
+    """
+    Returns the cached value of a key, computing it on a miss or shortly before it
+    expires, once for all concurrent callers.
+
+    Args:
+        key (str): The cache key.
+        compute (callable): Returns the value; it may return None.
+        timeout (int): Seconds the value is cached, None for no expiry.
+        cache_alias (str, optional): The cache to store the value in.
+        beta (float, optional): Eagerness of the early recomputation (XFetch).
+        lock_timeout (float, optional): Seconds other processes wait for a computation
+            before doing it themselves.
+
+    Returns:
+        The value.
+    """
+    cache = caches[cache_alias]
+    entry = cache.get(key)
+    if entry is not None:
+        value, delta, expires_at = entry
+        if not _expires_soon(delta, expires_at, beta):
+            return value
+
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        if entry is not None:
+            # Another thread is refreshing it; the current value is still valid.
+            return entry[0]
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    try:
+        flight.value = _compute_once(cache, key, compute, timeout, entry, lock_timeout)
+        return flight.value
+    except Exception as error:
+        flight.error = error
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
+
+
+class CacheNamespace:
+    """
+    Namespaced cache keys invalidated by version.
+
+    Keys look like '<name>:<scope>:v<version>:<parts>'. The version of each
+    (namespace, scope) is kept in the shared cache; values go to `cache_alias`.
+
+    Attributes:
+        name (str): The namespace, e.g. 'list-perms'.
+        cache_alias (str): The cache storing the values.
+    """
+
+    def __init__(self, name, cache_alias='default'):
+        self.name = name
+        self.cache_alias = cache_alias
+
+    def _version_key(self, scope):
+        return f'{self.name}:{scope}:version'
+
+    def version(self, scope=None):
+        """
+        Returns the current version of a scope of the namespace.
+        """
+        shared = caches[SHARED_ALIAS]
+        key = self._version_key(scope)
+        version = shared.get(key)
+        if version is None:
+            shared.add(key, 1, timeout=None)
+            version = shared.get(key, 1)
+        return version
+
+    def key(self, *parts, scope=None):
+        """
+        Returns the key of an entry under the current version.
+
+        Args:
+            *parts: What identifies the entry within the scope.
+            scope (optional): The scope, e.g. a user ID.
+
+        Returns:
+            str: The versioned key.
+        """
+        suffix = ':'.join(str(part) for part in parts)
+        return f'{self.name}:{scope}:v{self.version(scope)}:{suffix}'
+
+    def invalidate(self, scope=None):
+        """
+        Moves a scope of the namespace to a new version, making its entries unreachable.
+        """
+        shared = caches[SHARED_ALIAS]
+        key = self._version_key(scope)
+        try:
+            shared.incr(key)
+        except ValueError:
+            shared.set(key, 2, timeout=None)
+
+    def get_or_compute(self, parts, compute, timeout, scope=None, **kwargs):
+        """
+        `get_or_compute` on a key of the namespace.
+
+        Args:
+            parts (tuple): The key's parts, see `key`.
+            compute (callable): Returns the value.
+            timeout (int): Seconds the value is cached.
+            scope (optional): The scope of the key.
+            **kwargs: Passed to `get_or_compute` (beta, lock_timeout).
+
+        Returns:
+            The value.
+        """
+        return get_or_compute(self.key(*parts, scope=scope), compute, timeout,
+                              cache_alias=self.cache_alias, **kwargs)
@@ -0,0 +1,280 @@
+"""
+Response compression with Accept-Encoding negotiation.
+
+`CompressionMiddleware` compresses API responses with zstd, Brotli or gzip, whichever
+the client accepts first in the server's preference order (COMPRESSION_ENCODINGS).
+Brotli and zstd need the optional `brotli` and `zstandard` packages; encodings whose
+package is not installed are skipped, so gzip (standard library) always works.
+
+A response is left untouched when:
+- it is shorter than COMPRESSION_MIN_SIZE bytes (compression would not pay off),
+- it already has a Content-Encoding, or its Content-Type is already compressed
+  (images, video, audio, archives; see COMPRESSION_EXCLUDED_TYPES),
+- the client accepts none of the available encodings,
+- the compressed body would not be smaller.
+
+Streaming responses are compressed chunk by chunk; each chunk is flushed so the client
+receives data as it is produced, and Content-Length is removed.
+
+Settings (see `myproj/settings.py`):
+- COMPRESSION_ENCODINGS: Encodings in order of preference, e.g. ['zstd', 'br', 'gzip'].
+- COMPRESSION_MIN_SIZE: Minimum body size in bytes.
+- COMPRESSION_LEVELS: Level per encoding, e.g. {'gzip': 6, 'br': 4, 'zstd': 3}.
+- COMPRESSION_EXCLUDED_TYPES: Content-Type prefixes that are never compressed.
+
+Functions:
+- parse_accept_encoding: Parses an Accept-Encoding header into {coding: q}.
+- available_encodings: The encodings usable in this process.
+- compress_bytes: Compresses a body in one shot.
+- stream_compressor: Creates a chunk-by-chunk compressor.
+"""
+
+import gzip
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+DEFAULT_LEVELS = {'gzip': 6, 'br': 4, 'zstd': 3}
+
+
+def parse_accept_encoding(header):
+    """
+    Parses an Accept-Encoding header.
+
+    Args:
+        header (str): The header value, e.g. 'gzip, br;q=0.9, *;q=0'.
+
+    Returns:
+        dict: The lower-cased codings mapped to their quality value (0 to 1).
+    """
+    codings = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        codings[coding] = quality
+    return codings
+
+
+def available_encodings(preferred=None):
+    """
+    Returns the preferred encodings whose implementation is installed.
+
+    Args:
+        preferred (list, optional): Encodings in order of preference. Defaults to
+            `settings.COMPRESSION_ENCODINGS`.
+
+    Returns:
+        list: The usable encodings, in order of preference.
+    """
+    preferred = preferred if preferred is not None else settings.COMPRESSION_ENCODINGS
+    installed = {'gzip': True, 'br': brotli is not None, 'zstd': zstandard is not None}
+    return [encoding for encoding in preferred if installed.get(encoding)]
+
+
+def negotiate_encoding(header, encodings):
+    """
+    Picks the first of `encodings` the client accepts, or None.
+
+    Args:
+        header (str): The request's Accept-Encoding header.
+        encodings (list): The usable encodings in order of preference.
+
+    Returns:
+        str: The chosen encoding, or None if the client accepts none of them.
+    """
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    for encoding in encodings:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compress_bytes(data, encoding, level=None):
+    """
+    Compresses a complete body.
+
+    Args:
+        data (bytes): The body to compress.
+        encoding (str): 'gzip', 'br' or 'zstd'.
+        level (int, optional): The compression level. Defaults to DEFAULT_LEVELS.
+
+    Returns:
+        bytes: The compressed body.
+    """
+    level = DEFAULT_LEVELS[encoding] if level is None else level
+    if encoding == 'gzip':
+        # mtime=0 keeps the output deterministic, so equal bodies give equal bytes.
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class _GzipStream:
+    """
+    Chunk-by-chunk gzip compressor.
+    """
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk):
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    """
+    Chunk-by-chunk Brotli compressor.
+    """
+
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, chunk):
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    """
+    Chunk-by-chunk zstd compressor.
+    """
+
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk):
+        return (self._compressor.compress(chunk) +
+                self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK))
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+_STREAMS = {'gzip': _GzipStream, 'br': _BrotliStream, 'zstd': _ZstdStream}
+
+
+def stream_compressor(encoding, level=None):
+    """
+    Creates a compressor with `compress(chunk)` (flushed output) and `finish()`.
+
+    Args:
+        encoding (str): 'gzip', 'br' or 'zstd'.
+        level (int, optional): The compression level. Defaults to DEFAULT_LEVELS.
+    """
+    return _STREAMS[encoding](DEFAULT_LEVELS[encoding] if level is None else level)
+
+
+def _compress_sequence(sequence, compressor):
+    """
+    Compresses an iterable of chunks, skipping empty output between flushes.
+    """
+    for chunk in sequence:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def _compress_async_sequence(sequence, compressor):
+    """
+    Compresses an async iterable of chunks.
+    """
+    async for chunk in sequence:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses responses with the best encoding the client accepts.
+    Sets the Vary header so caches key compressed responses on Accept-Encoding.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.encodings = available_encodings()
+        self.min_size = settings.COMPRESSION_MIN_SIZE
+        self.levels = {**DEFAULT_LEVELS, **settings.COMPRESSION_LEVELS}
+        self.excluded_types = tuple(settings.COMPRESSION_EXCLUDED_TYPES)
+
+    def _is_compressible(self, response):
+        """
+        Checks the response is worth compressing, regardless of the client.
+        """
+        if response.has_header('Content-Encoding'):
+            return False
+        if not response.streaming and len(response.content) < self.min_size:
+            return False
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        return not content_type.startswith(self.excluded_types)
+
+    def process_response(self, request, response):
+        """
+        Compresses the response body when the client and the response allow it.
+        """
+        if not self.encodings or not self._is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''),
+                                      self.encodings)
+        if encoding is None:
+            return response
+
+        level = self.levels[encoding]
+        if response.streaming:
+            compressor = stream_compressor(encoding, level)
+            if response.is_async:
+                response.streaming_content = _compress_async_sequence(
+                    response.streaming_content, compressor)
+            else:
+                response.streaming_content = _compress_sequence(
+                    response.streaming_content, compressor)
+            # The compressed size is unknown until the whole body has been streamed.
+            del response.headers['Content-Length']
+        else:
+            compressed = compress_bytes(response.content, encoding, level)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # A strong ETag would claim byte equality with the uncompressed representation.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,173 @@
+"""
+Per-user cache of customizations.
+
+The app reads the user's customization on every screen load, while it changes only
+when the user picks another background. `get_customization` reads it through
+Django's cache, keyed by user ID, and caches the absence of a customization too, so
+users without one don't query on every load either. `save_customization` updates the
+user's row, or inserts it, relying on the unique `Customization.user`, and writes the
+new value through to the cache once the transaction commits. Other writes (admin,
+deletions, users deleted with their customization) drop the entry through the model
+signals.
+
+`stats` counts hits and misses per process; the hit rate is logged every
+CUSTOMIZATION_CACHE_STATS_INTERVAL lookups (event 'cache_stats').
+
+Functions:
+- get_customization: Returns a user's customization data, from the cache if possible.
+- save_customization: Creates or updates a user's customization.
+- forget_customization: Drops a user's cached customization.
+"""
+
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+
+from .logging_utils import log_cache_stats
+from .models import Customization
+
+# The customization fields returned by the API (those of CustomizationSerializer).
+FIELDS = ('id', 'user', 'background_image_id')
+
+_KEY = 'customization:{user_id}'
+# Cached for users without a customization; a miss is None.
+_ABSENT = {}
+
+
+class CacheStats:
+    """
+    Thread-safe hit and miss counters of a cache, logged periodically.
+
+    Attributes:
+        name (str): The name of the cache in the logs.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit):
+        """
+        Counts one lookup and logs the counters every CUSTOMIZATION_CACHE_STATS_INTERVAL.
+        """
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            hits, misses = self.hits, self.misses
+        interval = settings.CUSTOMIZATION_CACHE_STATS_INTERVAL
+        if interval and (hits + misses) % interval == 0:
+            log_cache_stats(self.name, hits, misses)
+
+    def hit_rate(self):
+        """
+        Returns the fraction of lookups served from the cache, or None before any lookup.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return self.hits / lookups if lookups else None
+
+    def reset(self):
+        """
+        Sets the counters back to zero.
+        """
+        with self._lock:
+            self.hits = self.misses = 0
+
+
+stats = CacheStats('customization')
+
+
+def _as_data(customization):
+    """
+    Returns the API representation of a customization.
+    """
+    return {
+        'id': customization.id,
+        'user': customization.user_id,
+        'background_image_id': customization.background_image_id,
+    }
+
+
+def get_customization(user_id):
+    """
+    Returns the customization of a user, from the cache or with one indexed query.
+
+    On a miss the value read is only cached when no other value was cached
+    meanwhile, so a slow read never replaces the value `save_customization` wrote.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        dict: The customization's fields ('id', 'user', 'background_image_id'), or
+        None if the user has no customization.
+    """
+    key = _KEY.format(user_id=user_id)
+    data = cache.get(key)
+    stats.record(hit=data is not None)
+    if data is None:
+        data = Customization.objects.filter(user_id=user_id).values(*FIELDS).first() or _ABSENT
+        # add, not set: a save written through since the query above keeps its
+        # newer value instead of being overwritten for the whole timeout.
+        cache.add(key, data, timeout=settings.CUSTOMIZATION_CACHE_TIMEOUT)
+    return data or None
+
+
+def save_customization(user_id, background_image_id):
+    """
+    Creates or updates the customization of a user and writes it through to the
+    cache once the transaction commits.
+
+    The user's row is updated in place, or inserted when there is none; an insert
+    that loses a race with another one for the same user (the unique
+    `Customization.user`) falls back to the update. Whether the customization was
+    created is thus told by the database write itself, never by a (cached) read.
+
+    Updates don't send model signals; this function keeps the cache up to date itself.
+
+    Args:
+        user_id (int): The ID of the user.
+        background_image_id (str): The ID of the background image.
+
+    Returns:
+        tuple: (the saved customization's fields, True if it was created).
+    """
+    customizations = Customization.objects.filter(user_id=user_id)
+    with transaction.atomic():
+        created = False
+        if not customizations.update(background_image_id=background_image_id):
+            try:
+                with transaction.atomic():
+                    customization = Customization.objects.create(
+                        user_id=user_id, background_image_id=background_image_id)
+                created = True
+            except IntegrityError:
+                customizations.update(background_image_id=background_image_id)
+        if not created:
+            customization = Customization(
+                id=customizations.values_list('id', flat=True).get(),
+                user_id=user_id, background_image_id=background_image_id)
+
+    data = _as_data(customization)
+    key = _KEY.format(user_id=user_id)
+    transaction.on_commit(
+        lambda: cache.set(key, data, timeout=settings.CUSTOMIZATION_CACHE_TIMEOUT))
+    return data, created
+
+
+def forget_customization(user_id):
+    """
+    Drops the cached customization of a user once the current transaction commits
+    (immediately when no transaction is active).
+
+    Args:
+        user_id (int): The ID of the user whose customization changed.
+    """
+    key = _KEY.format(user_id=user_id)
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,142 @@
+"""
+Bounded execution of password hashing.
+
+PBKDF2 hashing takes a large slice of a CPU on purpose. Run on request workers, a
+burst of logins or registrations occupies every worker and starves the list
+endpoints. The hashing of `register`, `ResetPasswordView` and the login backend
+(`lista.backends.PooledPasswordBackend`) is therefore run in a small shared pool:
+- at most PASSWORD_HASHING_WORKERS hashes run at the same time per process
+  (hashlib releases the GIL while hashing, so other requests keep running);
+- at most PASSWORD_HASHING_MAX_QUEUE more wait for a worker; beyond that, and when
+  a hash waited longer than PASSWORD_HASHING_TIMEOUT seconds, `HashingBusy` is
+  raised, which DRF returns as 503 Service Unavailable with a Retry-After header.
+With PASSWORD_HASHING_WORKERS=0 hashing runs inline on the request worker.
+
+Only the hashing itself runs in the pool; database access stays on the request
+thread, so the pool threads never hold database connections.
+
+Classes:
+- HashingBusy: Raised when the pool is saturated.
+- HashingPool: The bounded executor.
+
+Functions:
+- hash_password: Hashes a raw password with the default hasher.
+- check_user_password: Checks a user's password, upgrading outdated hashes.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.contrib.auth.hashers import (check_password, get_hasher, identify_hasher,
+                                         make_password)
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingBusy(APIException):
+    """
+    Raised when too many password hashes are running or waiting.
+    """
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'The server is busy, please try again shortly.'
+    default_code = 'hashing_busy'
+    # Sent as the Retry-After header by DRF's exception handler.
+    wait = 1
+
+
+class HashingPool:
+    """
+    Runs hashing functions on a bounded number of threads with a bounded queue.
+
+    Attributes:
+        workers (int): Number of hashing threads; 0 runs functions inline.
+        max_queue (int): Number of calls allowed to wait for a thread.
+        timeout (float): Seconds a caller waits for its result.
+    """
+
+    def __init__(self, workers, max_queue, timeout):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(workers + max_queue) if workers else None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        """
+        Creates the thread pool on first use, so processes that never hash don't start it.
+        """
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix='password-hash')
+        return self._executor
+
+    def run(self, function, *args):
+        """
+        Runs `function(*args)` in the pool and returns its result.
+
+        Raises:
+            HashingBusy: If the queue is full or the result took longer than `timeout`.
+        """
+        if not self.workers:
+            return function(*args)
+
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            future = self._get_executor().submit(function, *args)
+        except RuntimeError:
+            self._slots.release()
+            raise
+        # The slot is freed when the hash finishes, even if the caller gave up waiting.
+        future.add_done_callback(lambda _future: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError as e:
+            raise HashingBusy() from e
+
+
+pool = HashingPool(settings.PASSWORD_HASHING_WORKERS, settings.PASSWORD_HASHING_MAX_QUEUE,
+                   settings.PASSWORD_HASHING_TIMEOUT)
+
+
+def hash_password(raw_password):
+    """
+    Hashes a raw password with the default hasher in the hashing pool.
+
+    Args:
+        raw_password (str): The password to hash.
+
+    Returns:
+        str: The encoded password, ready to be stored in `User.password`.
+    """
+    return pool.run(make_password, raw_password)
+
+
+def check_user_password(user, raw_password):
+    """
+    Checks a user's password in the hashing pool. Like `User.check_password`, a
+    correct password stored with an outdated hasher or iteration count is re-hashed
+    and saved.
+
+    Args:
+        user (User): The user whose password is checked.
+        raw_password (str): The password to check.
+
+    Returns:
+        bool: True if the password is correct.
+    """
+    encoded = user.password
+    if not pool.run(check_password, raw_password, encoded):
+        return False
+
+    preferred = get_hasher('default')
+    hasher = identify_hasher(encoded)
+    if hasher.algorithm != preferred.algorithm or preferred.must_update(encoded):
+        user.password = hash_password(raw_password)
+        user.save(update_fields=['password'])
+    return True
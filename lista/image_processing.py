@@ -0,0 +1,287 @@
+"""
+Image processing helpers for list item image uploads.
+
+This module contains the per-image work performed by the `upload_images` endpoint:
+decoding the base64 payload sent by the client, verifying it with Pillow, stripping
+EXIF metadata and writing the result to storage. The work for a multi-image upload is
+spread over a shared, bounded thread pool so a request with ten photos does not pay
+for each image serially.
+
+Functions:
+- build_image_file_name: Builds the stored file name from the client metadata.
+- extract_metadata: Computes dimensions, size, content hash and perceptual hash.
+- perceptual_hash_bands: Splits a perceptual hash into indexed lookup bands.
+- hamming_distance: Number of differing bits between two perceptual hashes.
+- process_image: Decodes, verifies, strips and saves a single image.
+- process_images: Runs `process_image` for many images with a per-request
+  concurrency limit and removes already written files if any image fails.
+- delete_stored_files: Best-effort removal of files written to storage.
+"""
+
+import base64
+import hashlib
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+IMAGE_UPLOAD_DIR = 'list_item_images'
+
+# The 64-bit perceptual hash is split into this many bands, each stored in an
+# indexed column. Two hashes within PHASH_BANDS - 1 bits of each other always share
+# at least one band, so near-duplicate candidates are found with index lookups.
+PHASH_BANDS = 4
+PHASH_BAND_BITS = 64 // PHASH_BANDS
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_UPLOAD_POOL_SIZE, thread_name_prefix='image-upload')
+
+
+class ImageProcessingError(Exception):
+    """
+    Raised when an uploaded image cannot be decoded, verified or stored.
+    """
+
+
+def build_image_file_name(file_name, mime_type, image_index):
+    """
+    Builds the file name used to store an uploaded image.
+
+    Args:
+        file_name (str): The file name sent by the client, may be empty.
+        mime_type (str): The MIME type of the image (e.g. 'image/png').
+        image_index (int): The index of the image within the list item.
+
+    Returns:
+        str: The file name including an extension derived from the MIME type.
+    """
+    extension = mime_type.split('/')[1] if '/' in mime_type else 'jpeg'
+    return f"{file_name or f'image_{image_index}'}.{extension}"
+
+
+def strip_exif(image_bytes):
+    """
+    Verifies the image bytes with Pillow and removes EXIF metadata.
+
+    Images without EXIF data are returned untouched so they are not re-encoded.
+    When EXIF data is present the orientation tag is applied to the pixels first,
+    so the stored image keeps the orientation the user saw on the device.
+
+    Args:
+        image_bytes (bytes): The decoded image content.
+
+    Returns:
+        bytes: The image content without EXIF metadata.
+
+    Raises:
+        ImageProcessingError: If the bytes are not a valid image.
+    """
+    try:
+        with Image.open(BytesIO(image_bytes)) as image:
+            image.verify()
+        # verify() leaves the image unusable, so it has to be opened again.
+        with Image.open(BytesIO(image_bytes)) as image:
+            image_format = image.format
+            if not image.getexif():
+                return image_bytes
+            image = ImageOps.exif_transpose(image)
+            buffer = BytesIO()
+            save_kwargs = {'quality': 95} if image_format == 'JPEG' else {}
+            image.save(buffer, format=image_format, **save_kwargs)
+            return buffer.getvalue()
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError) as e:
+        raise ImageProcessingError(f"Invalid image data: {e}") from e
+
+
+def _difference_hash(image):
+    """
+    Computes the 64-bit difference hash (dHash) of a Pillow image as 16 hex digits.
+    """
+    # Let the JPEG decoder downscale while decoding; the hash only needs 9x8 pixels.
+    image.draft('L', (64, 64))
+    pixels = list(image.convert('L').resize((9, 8), Image.Resampling.LANCZOS).getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (1 if left > right else 0)
+    return f"{value:016x}"
+
+
+def perceptual_hash_bands(perceptual_hash):
+    """
+    Splits a perceptual hash into the values of the `phash_band_*` model fields.
+
+    Args:
+        perceptual_hash (str): The 16 hex digit perceptual hash.
+
+    Returns:
+        dict: A mapping of 'phash_band_<n>' to the integer value of each band.
+    """
+    value = int(perceptual_hash, 16)
+    mask = (1 << PHASH_BAND_BITS) - 1
+    return {
+        f'phash_band_{band}': (value >> (PHASH_BAND_BITS * (PHASH_BANDS - 1 - band))) & mask
+        for band in range(PHASH_BANDS)
+    }
+
+
+def hamming_distance(first_hash, second_hash):
+    """
+    Returns the number of differing bits between two hex perceptual hashes.
+    """
+    return (int(first_hash, 16) ^ int(second_hash, 16)).bit_count()
+
+
+def extract_metadata(image_bytes):
+    """
+    Computes the metadata stored with every `ListItemImage`.
+
+    Args:
+        image_bytes (bytes): The image content as it is stored.
+
+    Returns:
+        dict: The 'width', 'height', 'byte_size', 'content_hash' (SHA-256),
+        'perceptual_hash' (dHash) and 'phash_band_*' values.
+
+    Raises:
+        ImageProcessingError: If the bytes are not a valid image.
+    """
+    try:
+        with Image.open(BytesIO(image_bytes)) as image:
+            width, height = image.size
+            perceptual_hash = _difference_hash(image)
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError) as e:
+        raise ImageProcessingError(f"Invalid image data: {e}") from e
+
+    return {
+        'width': width,
+        'height': height,
+        'byte_size': len(image_bytes),
+        'content_hash': hashlib.sha256(image_bytes).hexdigest(),
+        'perceptual_hash': perceptual_hash,
+        **perceptual_hash_bands(perceptual_hash),
+    }
+
+
+def process_image(image_data, storage=None):
+    """
+    Decodes, verifies, strips and saves a single uploaded image.
+
+    Args:
+        image_data (str): A JSON string containing 'uri' (base64 content),
+            'fileName', 'mimeType' and 'index'.
+        storage (Storage, optional): The storage to write to. Defaults to
+            `default_storage`.
+
+    Returns:
+        dict: The stored 'file_path', the image 'index', its 'mime_type' and the
+        'metadata' computed by `extract_metadata`.
+
+    Raises:
+        ImageProcessingError: If the payload is malformed or the image is invalid.
+    """
+    storage = storage or default_storage
+    try:
+        image_json = json.loads(image_data)
+        base64_image = image_json['uri']
+        file_name = image_json['fileName']
+        mime_type = image_json['mimeType']
+        image_index = image_json['index']
+        image_bytes = base64.b64decode(base64_image)
+    except (ValueError, KeyError, TypeError) as e:
+        raise ImageProcessingError(f"Failed to decode base64 image: {e}") from e
+
+    image_file_name = build_image_file_name(file_name, mime_type, image_index)
+    stored_bytes = strip_exif(image_bytes)
+    metadata = extract_metadata(stored_bytes)
+    image_content = ContentFile(stored_bytes, name=image_file_name)
+    file_path = storage.save(os.path.join(IMAGE_UPLOAD_DIR, image_file_name), image_content)
+
+    return {
+        'file_path': file_path,
+        'index': image_index,
+        'mime_type': mime_type,
+        'metadata': metadata,
+    }
+
+
+def delete_stored_files(file_paths, storage=None):
+    """
+    Removes files that were already written to storage, ignoring failures.
+
+    Args:
+        file_paths (list): The storage paths to delete.
+        storage (Storage, optional): The storage to delete from. Defaults to
+            `default_storage`.
+    """
+    storage = storage or default_storage
+    for file_path in file_paths:
+        try:
+            storage.delete(file_path)
+        except Exception as e:
+            print(f"Failed to remove uploaded file {file_path}: {e}")
+
+
+def process_images(images_data, max_concurrency=None, storage=None):
+    """
+    Processes many uploaded images in the shared thread pool.
+
+    At most `max_concurrency` images of a single request are in flight at once,
+    so one large upload cannot occupy the whole pool. Results are returned in the
+    order of `images_data`. If any image fails, every file written for this
+    request is deleted before the error is raised.
+
+    Args:
+        images_data (list): The JSON strings sent by the client, one per image.
+        max_concurrency (int, optional): The per-request concurrency limit.
+            Defaults to `settings.IMAGE_UPLOAD_MAX_CONCURRENCY`.
+        storage (Storage, optional): The storage to write to. Defaults to
+            `default_storage`.
+
+    Returns:
+        list: The `process_image` result for each image.
+
+    Raises:
+        ImageProcessingError: If any of the images could not be processed.
+    """
+    max_concurrency = max(1, max_concurrency or settings.IMAGE_UPLOAD_MAX_CONCURRENCY)
+    results = [None] * len(images_data)
+    pending = {}
+    error = None
+    position = 0
+
+    while position < len(images_data) or pending:
+        while error is None and position < len(images_data) and len(pending) < max_concurrency:
+            future = _executor.submit(process_image, images_data[position], storage)
+            pending[future] = position
+            position += 1
+
+        if not pending:
+            break
+
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            index = pending.pop(future)
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                error = error or e
+
+        if error is not None:
+            # Stop scheduling new work; remaining futures are drained by the loop.
+            position = len(images_data)
+
+    if error is not None:
+        delete_stored_files([result['file_path'] for result in results if result], storage)
+        if isinstance(error, ImageProcessingError):
+            raise error
+        raise ImageProcessingError(str(error)) from error
+
+    return results
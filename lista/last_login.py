@@ -0,0 +1,193 @@
+"""
+Write-behind tracking of `User.last_login`.
+
+Every login and registration used to save the whole user row just to set
+`last_login`, taking the database write lock once per login. `LastLoginRecorder`
+instead coalesces the timestamps in memory (one entry per user, the latest wins)
+and writes them periodically with a single statement per batch that only touches
+that column:
+
+    UPDATE auth_user SET last_login = CASE WHEN id = 1 THEN ... WHEN id = 2 THEN ... END
+    WHERE id IN (1, 2, ...)
+
+Pending timestamps are written:
+- every LAST_LOGIN_FLUSH_INTERVAL seconds by a background thread, started on the
+  first recorded login;
+- as soon as LAST_LOGIN_FLUSH_SIZE users are pending;
+- when the process exits (atexit), so a graceful shutdown does not lose them.
+A failed flush puts its timestamps back, unless newer ones were recorded meanwhile,
+and they are retried with the next flush. With LAST_LOGIN_WRITE_BEHIND=false the
+column is updated immediately instead (still a single-column UPDATE).
+
+Classes:
+- LastLoginRecorder: Coalesces and flushes last_login timestamps.
+
+Functions:
+- record_login: Records a login of a user with the shared recorder.
+- flush_last_logins: Writes all pending timestamps of the shared recorder now.
+"""
+
+import atexit
+import threading
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DatabaseError, connections
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+
+# Users updated by one statement; keeps the parameter count well below SQLite's limit.
+FLUSH_BATCH_SIZE = 400
+
+
+def write_last_logins(timestamps):
+    """
+    Writes last_login for many users with one UPDATE ... CASE statement per batch.
+
+    Args:
+        timestamps (dict): The login datetimes keyed by user ID.
+
+    Returns:
+        int: The number of user rows updated.
+    """
+    updated = 0
+    user_ids = list(timestamps)
+    for start in range(0, len(user_ids), FLUSH_BATCH_SIZE):
+        batch = user_ids[start:start + FLUSH_BATCH_SIZE]
+        updated += User.objects.filter(id__in=batch).update(last_login=Case(
+            *[When(id=user_id, then=Value(timestamps[user_id])) for user_id in batch],
+            output_field=DateTimeField(),
+        ))
+    return updated
+
+
+class LastLoginRecorder:
+    """
+    Coalesces last_login timestamps in memory and writes them in bulk.
+
+    Attributes:
+        flush_interval (float): Seconds between background flushes.
+        flush_size (int): Number of pending users that triggers an early flush.
+    """
+
+    def __init__(self, flush_interval, flush_size):
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def record(self, user_id, when=None):
+        """
+        Records a login of a user.
+
+        Args:
+            user_id (int): The ID of the user who logged in.
+            when (datetime, optional): The login time. Defaults to now.
+        """
+        when = when or timezone.now()
+        if not settings.LAST_LOGIN_WRITE_BEHIND:
+            User.objects.filter(id=user_id).update(last_login=when)
+            return
+
+        with self._lock:
+            previous = self._pending.get(user_id)
+            if previous is None or when > previous:
+                self._pending[user_id] = when
+            pending = len(self._pending)
+        self._ensure_thread()
+        if pending >= self.flush_size:
+            self._wakeup.set()
+
+    def pending(self):
+        """
+        Returns the number of users whose last_login has not been written yet.
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """
+        Writes every pending timestamp now.
+
+        Returns:
+            int: The number of user rows updated.
+        """
+        with self._flush_lock:
+            with self._lock:
+                timestamps, self._pending = self._pending, {}
+            if not timestamps:
+                return 0
+            try:
+                return write_last_logins(timestamps)
+            except DatabaseError as e:
+                print(f"Failed to write last_login for {len(timestamps)} users: {e}")
+                self._restore(timestamps)
+                return 0
+
+    def _restore(self, timestamps):
+        """
+        Puts back the timestamps of a failed flush, keeping newer ones recorded since.
+        """
+        with self._lock:
+            for user_id, when in timestamps.items():
+                previous = self._pending.get(user_id)
+                if previous is None or when > previous:
+                    self._pending[user_id] = when
+
+    def _ensure_thread(self):
+        """
+        Starts the background flush thread of this process if it is not running.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name='last-login-flush', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """
+        Flushes pending timestamps every `flush_interval` seconds, or earlier when woken.
+        """
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                # The thread's own database connection is not managed by a request.
+                connections.close_all()
+
+
+recorder = LastLoginRecorder(settings.LAST_LOGIN_FLUSH_INTERVAL, settings.LAST_LOGIN_FLUSH_SIZE)
+
+
+def record_login(user, when=None):
+    """
+    Records a login of a user and updates `user.last_login` on the instance.
+
+    Args:
+        user (User): The user who logged in or registered.
+        when (datetime, optional): The login time. Defaults to now.
+    """
+    when = when or timezone.now()
+    user.last_login = when
+    recorder.record(user.id, when)
+
+
+def flush_last_logins():
+    """
+    Writes all pending last_login timestamps of this process now.
+
+    Returns:
+        int: The number of user rows updated.
+    """
+    return recorder.flush()
+
+
+atexit.register(flush_last_logins)
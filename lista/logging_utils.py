@@ -23,6 +23,8 @@ Functions:
 - log_api_call: Logs information about API calls, including URL, method, 
   status code, and response time.
 - log_deletion: Logs information about deletions (user, object, and type).
+- log_cache_stats: Logs the hit rate of an application cache.
+- describe_result: Describes a function result for the log without evaluating querysets.
 - log: A decorator for logging function calls, including execution time, arguments, and errors.
 
 Dependencies:
@@ -143,8 +145,48 @@ def log_deletion(user_id, object_id, object_type):
     })
 
 
+# ------------------- Cache Statistics Logging -------------------
+def log_cache_stats(cache_name, hits, misses):
+    """
+    Logs the hit rate of an application cache.
+
+    Args:
+        cache_name (str): The name of the cache (e.g., 'customization').
+        hits (int): The number of lookups served from the cache.
+        misses (int): The number of lookups that went to the database.
+    """
+    logger = setup_logger(LOG_FILE)
+    lookups = hits + misses
+    logger.info({
+        "event": "cache_stats",
+        "cache": cache_name,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 4) if lookups else None,
+    })
+
+
 # ------------------- Function Call Logging Decorator -------------------
 
+def describe_result(result):
+    """
+    Returns a loggable description of a function result.
+
+    Querysets are described by their model instead of being converted with str(),
+    which would execute the query and build the representation of every row.
+
+    Args:
+        result: The value returned by the logged function.
+
+    Returns:
+        str: The description of the result.
+    """
+    model = getattr(result, 'model', None)
+    if model is not None and hasattr(result, 'query'):
+        return f"<QuerySet of {model.__name__}>"
+    return str(result)
+
+
 def log(user_id=None, object_id=None):
     """
     Decorator for logging function calls. Logs information about the function call, 
@@ -206,7 +248,7 @@ def log(user_id=None, object_id=None):
                     "event": "function_success",
                     "function": function_name,
                     "execution_time": execution_time,
-                    "result": str(result),
+                    "result": describe_result(result),
                     "dynamic_info": dynamic_info
                 })
                 return result
@@ -0,0 +1,56 @@
+"""
+Management command that computes the stored metadata of images uploaded before
+dimensions, size and hashes were recorded at upload time.
+
+Usage:
+    python manage.py backfill_image_metadata --batch-size 200
+"""
+
+from django.core.management.base import BaseCommand
+
+from lista.image_processing import ImageProcessingError, extract_metadata
+from lista.models import ListItemImage
+
+METADATA_FIELDS = [
+    'width', 'height', 'byte_size', 'content_hash', 'perceptual_hash',
+    'phash_band_0', 'phash_band_1', 'phash_band_2', 'phash_band_3',
+]
+
+
+class Command(BaseCommand):
+    """
+    Reads every image without a content hash once and stores its metadata.
+    """
+    help = "Compute width, height, size and hashes for images missing them."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        images = ListItemImage.objects.filter(content_hash__isnull=True).only('id', 'image')
+        updated = []
+        failed = 0
+
+        for image in images.iterator(chunk_size=options['batch_size']):
+            try:
+                with image.image.open('rb') as image_file:
+                    metadata = extract_metadata(image_file.read())
+            except (ImageProcessingError, OSError, ValueError) as e:
+                failed += 1
+                self.stderr.write(f"Skipping image {image.id}: {e}")
+                continue
+
+            for field, value in metadata.items():
+                setattr(image, field, value)
+            updated.append(image)
+
+            if len(updated) >= options['batch_size']:
+                ListItemImage.objects.bulk_update(updated, METADATA_FIELDS)
+                self.stdout.write(f"Updated {len(updated)} images")
+                updated = []
+
+        if updated:
+            ListItemImage.objects.bulk_update(updated, METADATA_FIELDS)
+            self.stdout.write(f"Updated {len(updated)} images")
+
+        self.stdout.write(self.style.SUCCESS(f"Backfill finished, {failed} images skipped."))
@@ -0,0 +1,138 @@
+"""
+Management command that benchmarks the cache layers of myproj/caches.py.
+
+Without --url it starts the Redis stand-in of `lista.redis_standin` in this process
+and uses it as the shared cache; pass --url to measure a real Redis instead.
+- reads: threads read a skewed set of keys holding permission-sized values, through
+  the shared cache alone (one Redis round trip per read) and through the tiered
+  cache (in-process L1 in front of it); reports reads per second and the L1 hit rate.
+- stampede: threads all miss the same key at once while its computation takes
+  --compute-ms; reports how many times it was computed with a plain
+  get/compute/set and with `lista.caching.get_or_compute` (single flight).
+
+Usage:
+    python manage.py bench_cache
+    python manage.py bench_cache --threads 8 --reads 20000 --url redis://127.0.0.1:6379/0
+"""
+
+import os
+import random
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from lista.caching import get_or_compute
+from lista.redis_standin import RedisStandin
+from myproj.caches import SHARED_ALIAS, cache_config
+
+
+def _run_threads(count, target):
+    """
+    Runs `target(index)` in `count` threads at once and returns the elapsed seconds.
+    """
+    barrier = threading.Barrier(count)
+
+    def run(index):
+        barrier.wait()
+        target(index)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+class Command(BaseCommand):
+    """
+    Compares the shared cache with the tiered cache and measures stampede protection.
+    """
+    help = "Benchmark the shared and tiered caches and the stampede protection."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help="Redis URL of the shared cache "
+                                          "(default: an in-process stand-in).")
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--keys', type=int, default=500)
+        parser.add_argument('--reads', type=int, default=10000, help="Reads per thread.")
+        parser.add_argument('--compute-ms', type=float, default=200)
+
+    def bench_reads(self, alias, options):
+        """
+        Reads a skewed key set through a cache alias from several threads.
+        """
+        rng = random.Random(5)
+        keys = [f'bench-cache:{index}' for index in range(options['keys'])]
+        value = {list_item_id: ('full_access', 'member') for list_item_id in range(50)}
+        caches[SHARED_ALIAS].set_many({key: value for key in keys}, timeout=300)
+        weights = [1 / (rank + 1) for rank in range(len(keys))]
+        sequences = [rng.choices(keys, weights=weights, k=options['reads'])
+                     for _ in range(options['threads'])]
+
+        def read(index):
+            cache = caches[alias]
+            for key in sequences[index]:
+                cache.get(key)
+
+        elapsed = _run_threads(options['threads'], read)
+        total = options['threads'] * options['reads']
+        self.stdout.write(f"{alias:<8} {total / elapsed:10.0f} reads/s")
+
+    def bench_stampede(self, options):
+        """
+        Counts the computations of a key missed by every thread at once.
+        """
+        computations = []
+
+        def compute():
+            computations.append(1)
+            time.sleep(options['compute_ms'] / 1000)
+            return 'value'
+
+        def plain(_index):
+            cache = caches['default']
+            if cache.get('bench-cache:plain') is None:
+                cache.set('bench-cache:plain', compute(), timeout=60)
+
+        def single_flight(_index):
+            get_or_compute('bench-cache:single-flight', compute, 60)
+
+        for name, target in (('plain', plain), ('single flight', single_flight)):
+            computations.clear()
+            elapsed = _run_threads(options['threads'], target)
+            self.stdout.write(f"{name:<14} {len(computations):3} computations "
+                              f"in {elapsed * 1000:6.0f} ms")
+
+    def handle(self, *args, **options):
+        standin = None
+        url = options['url']
+        if not url:
+            standin = RedisStandin()
+            url = standin.start()
+            self.stdout.write(f"Using the Redis stand-in at {url}")
+
+        environment = {'CACHE_URL': url, 'CACHE_KEY_PREFIX': 'bench', 'CACHE_L1_SIZE': '1024'}
+        try:
+            with mock.patch.dict(os.environ, environment), \
+                    override_settings(CACHES=cache_config()):
+                self.stdout.write("Reads:")
+                self.bench_reads(SHARED_ALIAS, options)
+                caches['default'].clear_local()
+                self.bench_reads('default', options)
+                l1 = caches['default'].l1
+                self.stdout.write(f"L1 hit rate {l1.hits / max(1, l1.hits + l1.misses):.1%}")
+
+                self.stdout.write("Stampede:")
+                self.bench_stampede(options)
+                caches['default'].delete_many([
+                    'bench-cache:plain', 'bench-cache:single-flight',
+                    *(f'bench-cache:{index}' for index in range(options['keys']))])
+        finally:
+            if standin is not None:
+                standin.stop()
@@ -0,0 +1,151 @@
+"""
+Management command that measures bytes on the wire with `CompressionMiddleware`.
+
+Representative API responses are passed through the middleware once per encoding
+(and once without Accept-Encoding). For each fixture it reports the transferred size,
+the ratio to the uncompressed body and the time spent compressing, and checks that
+the body decompresses back to the original. A streaming response is measured the
+same way, and a short response checks that the size threshold is respected.
+
+Fixtures:
+- listitem/by-user: the lists of a user with typical multi-line contents.
+- grouplists: the shares of those lists.
+- images: `get_images_for_list_item` metadata with presigned S3 URLs, whose
+  signatures are random and compress poorly.
+
+Usage:
+    python manage.py bench_compression
+    python manage.py bench_compression --lists 5000 --images 50
+"""
+
+import gzip
+import json
+import secrets
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from lista.compression import CompressionMiddleware, available_encodings, brotli, zstandard
+from lista.management.commands.bench_json_renderer import build_by_user_response
+
+
+def build_grouplists_response(size):
+    """
+    Returns `size` rows shaped like the `grouplists` response.
+    """
+    return [
+        {
+            'id': index + 1,
+            'user': 100 + index % 5,
+            'list_item': index + 1,
+            'shared_by_user_id': 100 + index % 5,
+            'date_joined': '2024-05-01',
+            'role': 'member' if index % 3 else 'admin',
+            'permission_type': 'read_only' if index % 2 else 'full_access',
+        }
+        for index in range(size)
+    ]
+
+
+def build_images_response(count):
+    """
+    Returns a `get_images_for_list_item` response with `count` presigned image URLs.
+    """
+    return {'images': [
+        {
+            'id': index + 1,
+            'url': (f"https://lista-media.s3.eu-central-1.amazonaws.com/list_item_images/"
+                    f"photo_{index}.jpeg?X-Amz-Algorithm=AWS4-HMAC-SHA256"
+                    f"&X-Amz-Credential=AKIA{secrets.token_hex(8).upper()}%2F20240501"
+                    f"%2Feu-central-1%2Fs3%2Faws4_request&X-Amz-Date=20240501T120000Z"
+                    f"&X-Amz-Expires=3600&X-Amz-SignedHeaders=host"
+                    f"&X-Amz-Signature={secrets.token_hex(32)}"),
+            'index': index,
+            'mime_type': 'image/jpeg',
+            'width': 1600,
+            'height': 1200,
+            'byte_size': 250000 + index * 731,
+        }
+        for index in range(count)
+    ]}
+
+
+def decompress(body, encoding):
+    """
+    Decompresses a body produced by the middleware.
+    """
+    if encoding is None:
+        return body
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    if encoding == 'br':
+        return brotli.decompress(body)
+    return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+
+
+class Command(BaseCommand):
+    """
+    Reports bytes on the wire per encoding for representative responses.
+    """
+    help = "Measure response sizes and compression time per encoding."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lists', type=int, default=1000)
+        parser.add_argument('--images', type=int, default=20)
+
+    def run_middleware(self, make_response, accept_encoding):
+        """
+        Passes a fresh response through the middleware and returns it with the time taken.
+        """
+        middleware = CompressionMiddleware(lambda request: make_response())
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        start = time.perf_counter()
+        response = middleware(request)
+        if response.streaming:
+            body = b''.join(response.streaming_content)
+        else:
+            body = response.content
+        return response, body, time.perf_counter() - start
+
+    def measure(self, name, make_response, original):
+        """
+        Reports the size of one fixture for every encoding and checks the round trip.
+        """
+        for encoding in [None] + available_encodings():
+            response, body, elapsed = self.run_middleware(make_response, encoding or '')
+            used = response.get('Content-Encoding')
+            if used != encoding and len(original) >= settings.COMPRESSION_MIN_SIZE:
+                raise CommandError(f"{name}: expected {encoding}, got {used}")
+            if decompress(body, used) != original:
+                raise CommandError(f"{name}: {used} body does not round-trip")
+            self.stdout.write(
+                f"{name:<22} {used or 'identity':<9} {len(body):>9} bytes "
+                f"({len(body) / len(original):6.1%})  {elapsed * 1000:7.2f} ms")
+
+    def handle(self, *args, **options):
+        fixtures = {
+            'listitem/by-user': build_by_user_response(options['lists']),
+            'grouplists': build_grouplists_response(options['lists']),
+            'images': build_images_response(options['images']),
+            'short': {'permission_type': 'full_access'},
+        }
+        self.stdout.write(f"Available encodings: {', '.join(available_encodings())}")
+        for name, data in fixtures.items():
+            body = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode()
+            self.measure(
+                name, lambda body=body: HttpResponse(body, content_type='application/json'), body)
+
+        rows = build_by_user_response(options['lists'])
+        chunks = [json.dumps(rows[start:start + 100]).encode() for start in range(0, len(rows), 100)]
+        self.measure(
+            'listitem (streaming)',
+            lambda: StreamingHttpResponse(iter(chunks), content_type='application/json'),
+            b''.join(chunks))
+
+        response, _, _ = self.run_middleware(
+            lambda: HttpResponse(b'\x89PNG' + b'\0' * 4096, content_type='image/png'), 'gzip')
+        if response.has_header('Content-Encoding'):
+            raise CommandError("Images must not be compressed")
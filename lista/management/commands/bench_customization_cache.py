@@ -0,0 +1,105 @@
+"""
+Management command that benchmarks the per-user customization cache.
+
+It creates users (some with a customization) and replays app
+screen loads, each reading the user's customization, with an occasional background
+change in between:
+- database: the previous lookup, one query per screen load;
+- cached: `lista.customization_cache`, read-through with write-through updates.
+It reports operations per second, queries and the cache hit rate and checks that
+every read returned the latest background. Write-through happens when a transaction
+commits, so the fixtures are committed, under names unique to the run, and deleted
+at the end together with their cache entries.
+
+Usage:
+    python manage.py bench_customization_cache
+    python manage.py bench_customization_cache --users 500 --loads 20000 --write-ratio 0.01
+"""
+
+import random
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+
+from lista import customization_cache
+from lista.models import Customization
+
+
+class Command(BaseCommand):
+    """
+    Compares database lookups with the cached customization lookups.
+    """
+    help = "Benchmark the per-user customization cache against direct queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--loads', type=int, default=5000)
+        parser.add_argument('--write-ratio', type=float, default=0.02,
+                            help="Fraction of operations that change a background.")
+
+    def replay(self, name, operations, read, write):
+        """
+        Runs the operations with the given read and write functions and reports.
+        """
+        reset_queries()
+        expected = {}
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            for user_id, background in operations:
+                if background is None:
+                    background = (read(user_id) or {}).get('background_image_id')
+                    if user_id in expected and background != expected[user_id]:
+                        raise CommandError(f"{name}: stale customization for user {user_id}")
+                else:
+                    write(user_id, background)
+                    expected[user_id] = background
+            elapsed = time.perf_counter() - start
+        self.stdout.write(f"{name:<9} {len(operations) / elapsed:9.0f} ops/s  "
+                          f"{len(captured.captured_queries):6} queries")
+
+    def handle(self, *args, **options):
+        rng = random.Random(3)
+        run_id = uuid.uuid4().hex[:8]
+        users = User.objects.bulk_create([
+            User(username=f"custom-{run_id}-{index}", email=f"custom-{run_id}-{index}@example.com")
+            for index in range(options['users'])
+        ])
+        user_ids = [user.id for user in users]
+        try:
+            Customization.objects.bulk_create([
+                Customization(user_id=user_id, background_image_id=f"bg{user_id}")
+                for user_id in user_ids if rng.random() < 0.7
+            ])
+
+            # Few users account for most screen loads.
+            weights = [1 / (rank + 1) for rank in range(len(user_ids))]
+            operations = [
+                (user_id, f"new{index}" if rng.random() < options['write_ratio'] else None)
+                for index, user_id in enumerate(
+                    rng.choices(user_ids, weights=weights, k=options['loads']))
+            ]
+
+            def database_read(user_id):
+                return Customization.objects.filter(user_id=user_id).values(
+                    *customization_cache.FIELDS).first()
+
+            def database_write(user_id, background):
+                Customization.objects.update_or_create(
+                    user_id=user_id, defaults={'background_image_id': background})
+
+            self.replay('database', operations, database_read, database_write)
+
+            customization_cache.stats.reset()
+            self.replay('cached', operations, customization_cache.get_customization,
+                        customization_cache.save_customization)
+            stats = customization_cache.stats
+            self.stdout.write(f"hit rate  {stats.hit_rate():.1%} "
+                              f"({stats.hits} hits, {stats.misses} misses)")
+        finally:
+            User.objects.filter(id__in=user_ids).delete()
+            cache.delete_many([f'customization:{user_id}' for user_id in user_ids])
@@ -0,0 +1,113 @@
+"""
+Management command that load tests a running server over HTTP.
+
+It is meant to validate the runtime profile (myproj/gunicorn_config.py) locally:
+start the server, then drive an endpoint from N concurrent keep-alive connections
+for a fixed time and read the throughput, latency percentiles and errors. The
+server under test is reached through the network only; this process doesn't touch
+the database unless --login is given, which creates a temporary user (deleted at
+the end) and sends its access token with every request.
+
+Usage:
+    gunicorn -c python:myproj.gunicorn_config &
+    python manage.py bench_http_load --url http://127.0.0.1:8000/listitem/accessible/ --login
+    python manage.py bench_http_load --url http://127.0.0.1:8000/index/ --concurrency 32
+"""
+
+import http.client
+import statistics
+import threading
+import time
+import uuid
+from collections import Counter
+from urllib.parse import urlsplit
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+def _percentile(values, fraction):
+    """
+    Returns the value below which `fraction` of the sorted `values` fall.
+    """
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Command(BaseCommand):
+    """
+    Sends requests from concurrent keep-alive connections and reports latency.
+    """
+    help = "Load test a running server over HTTP."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000/index/')
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--seconds', type=float, default=10)
+        parser.add_argument('--login', action='store_true',
+                            help="Authenticate as a temporary user.")
+
+    def connection_loop(self, url, headers, deadline, latencies, statuses):
+        """
+        Sends requests over one keep-alive connection until the deadline.
+        """
+        parts = urlsplit(url)
+        connection_class = (http.client.HTTPSConnection if parts.scheme == 'https'
+                            else http.client.HTTPConnection)
+        path = parts.path + (f'?{parts.query}' if parts.query else '')
+        conn = None
+        while time.monotonic() < deadline:
+            if conn is None:
+                conn = connection_class(parts.netloc, timeout=30)
+            start = time.perf_counter()
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException) as e:
+                statuses[type(e).__name__] += 1
+                conn.close()
+                conn = None
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status] += 1
+            if response.will_close:
+                conn.close()
+                conn = None
+        if conn is not None:
+            conn.close()
+
+    def handle(self, *args, **options):
+        headers = {'Accept-Encoding': 'gzip'}
+        user = None
+        if options['login']:
+            user = User.objects.create(username=f'load-{uuid.uuid4().hex[:8]}')
+            headers['Authorization'] = f'Bearer {AccessToken.for_user(user)}'
+
+        latencies = []
+        statuses = Counter()
+        deadline = time.monotonic() + options['seconds']
+        threads = [
+            threading.Thread(target=self.connection_loop,
+                             args=(options['url'], headers, deadline, latencies, statuses))
+            for _ in range(options['concurrency'])
+        ]
+        try:
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+        finally:
+            if user is not None:
+                user.delete()
+
+        if not latencies:
+            raise CommandError(f"No request succeeded: {dict(statuses)}")
+        latencies.sort()
+        summary = '  '.join(f"{code}: {count}" for code, count in sorted(statuses.items(), key=str))
+        self.stdout.write(
+            f"{len(latencies) / elapsed:8.0f} req/s  p50 {statistics.median(latencies):7.1f} ms  "
+            f"p95 {_percentile(latencies, 0.95):7.1f} ms  p99 {_percentile(latencies, 0.99):7.1f} ms"
+            f"  {summary}")
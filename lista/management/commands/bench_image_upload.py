@@ -0,0 +1,82 @@
+"""
+Management command that benchmarks the image upload pipeline.
+
+It generates synthetic JPEG photos with EXIF metadata, encodes them the way the mobile
+client does (base64 inside a JSON string) and measures the wall-clock time of
+processing them serially versus through `process_images`. Files are written to a
+temporary directory, so the benchmark never touches `MEDIA_ROOT`.
+
+Usage:
+    python manage.py bench_image_upload --images 10 --size 2000 --rounds 3
+"""
+
+import base64
+import json
+import tempfile
+import time
+from io import BytesIO
+
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from lista.image_processing import process_image, process_images
+
+
+def build_payload(count, size):
+    """
+    Builds `count` JSON image payloads of `size`x`size` pixels with EXIF data.
+    """
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: rotate 90 CW
+    payload = []
+    for index in range(count):
+        image = Image.effect_noise((size, size), 64 + index).convert('RGB')
+        buffer = BytesIO()
+        image.save(buffer, format='JPEG', quality=90, exif=exif)
+        payload.append(json.dumps({
+            'uri': base64.b64encode(buffer.getvalue()).decode(),
+            'fileName': f'bench_{index}',
+            'mimeType': 'image/jpeg',
+            'index': index,
+        }))
+    return payload
+
+
+class Command(BaseCommand):
+    """
+    Compares serial and pooled processing of a multi-image upload.
+    """
+    help = "Benchmark serial vs thread-pool processing of multi-image uploads."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--images', type=int, default=10)
+        parser.add_argument('--size', type=int, default=1600)
+        parser.add_argument('--rounds', type=int, default=3)
+        parser.add_argument('--concurrency', type=int, default=None)
+
+    def handle(self, *args, **options):
+        payload = build_payload(options['images'], options['size'])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            storage = FileSystemStorage(location=tmp_dir)
+
+            serial_times = []
+            pooled_times = []
+            for _ in range(options['rounds']):
+                start = time.perf_counter()
+                for image_data in payload:
+                    process_image(image_data, storage)
+                serial_times.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                process_images(payload, options['concurrency'], storage)
+                pooled_times.append(time.perf_counter() - start)
+
+        serial = min(serial_times)
+        pooled = min(pooled_times)
+        self.stdout.write(
+            f"{options['images']} images of {options['size']}px, best of {options['rounds']}:")
+        self.stdout.write(f"  serial:      {serial * 1000:8.1f} ms")
+        self.stdout.write(f"  thread pool: {pooled * 1000:8.1f} ms")
+        self.stdout.write(f"  speedup:     {serial / pooled:8.2f}x")
@@ -0,0 +1,115 @@
+"""
+Management command that benchmarks the orjson renderer and parser against DRF's.
+
+It builds a typical `listitem/by-user` response for each size, with multi-line list
+contents and non-ASCII titles, and measures rendering it to JSON and parsing it
+back with `JSONRenderer`/`JSONParser` and `ORJSONRenderer`/`ORJSONParser`. The
+command fails if the rendered bytes or the parsed data differ, and also checks the
+types passed to DRF's encoder (datetimes, Decimals, lazy strings) render identically.
+
+Usage:
+    python manage.py bench_json_renderer
+    python manage.py bench_json_renderer --sizes 100 1000 10000 --rounds 5
+"""
+
+import datetime
+import time
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.translation import gettext_lazy
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from lista.renderers import ORJSONParser, ORJSONRenderer
+
+
+def build_by_user_response(size):
+    """
+    Returns `size` rows shaped like the `listitem/by-user` response.
+    """
+    return [
+        {
+            'id': index + 1,
+            'title': f"Einkaufsliste {index} – Woche {index % 52}",
+            'items': "Milch\nBrot\nEier\nÄpfel\nKaffee\nKäse\nTomaten\nNudeln",
+            'date_created': datetime.date(2024, 1, 1 + index % 28).isoformat(),
+            'is_active': index % 7 != 0,
+            'user': 42,
+        }
+        for index in range(size)
+    ]
+
+
+def _best_time(function, rounds):
+    """
+    Returns the fastest of `rounds` runs of `function` in seconds, and its last result.
+    """
+    best = None
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class Command(BaseCommand):
+    """
+    Compares DRF's JSON renderer/parser with the orjson-based pair.
+    """
+    help = "Benchmark DRF JSONRenderer/JSONParser vs ORJSONRenderer/ORJSONParser."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+        parser.add_argument('--rounds', type=int, default=5)
+
+    def check_special_types(self):
+        """
+        Fails if values handled by DRF's encoder render differently.
+        """
+        data = {
+            'created_at': datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc),
+            'naive': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456),
+            'time': datetime.time(8, 15),
+            'date': datetime.date(2024, 5, 1),
+            'price': Decimal('12.50'),
+            'label': gettext_lazy('Member'),
+            'duration': datetime.timedelta(minutes=5),
+            'separators': 'line\u2028paragraph\u2029end',
+            1: 'int key',
+        }
+        expected = JSONRenderer().render(data)
+        rendered = ORJSONRenderer().render(data)
+        if rendered != expected:
+            raise CommandError(f"Special types differ:\n  drf:    {expected!r}\n"
+                               f"  orjson: {rendered!r}")
+
+    def handle(self, *args, **options):
+        self.check_special_types()
+        drf_renderer, fast_renderer = JSONRenderer(), ORJSONRenderer()
+        drf_parser, fast_parser = JSONParser(), ORJSONParser()
+
+        for size in options['sizes']:
+            data = build_by_user_response(size)
+            drf_time, drf_bytes = _best_time(lambda: drf_renderer.render(data), options['rounds'])
+            fast_time, fast_bytes = _best_time(lambda: fast_renderer.render(data), options['rounds'])
+            if drf_bytes != fast_bytes:
+                raise CommandError(f"N={size}: rendered output differs")
+
+            drf_parse_time, drf_parsed = _best_time(
+                lambda: drf_parser.parse(BytesIO(drf_bytes)), options['rounds'])
+            fast_parse_time, fast_parsed = _best_time(
+                lambda: fast_parser.parse(BytesIO(drf_bytes)), options['rounds'])
+            if drf_parsed != fast_parsed:
+                raise CommandError(f"N={size}: parsed data differs")
+
+            self.stdout.write(
+                f"N={size:<6} {len(drf_bytes) / 1024:8.1f} KiB  "
+                f"render: drf {drf_time * 1000:7.2f} ms, orjson {fast_time * 1000:7.2f} ms "
+                f"({drf_time / fast_time:4.1f}x)  "
+                f"parse: drf {drf_parse_time * 1000:7.2f} ms, "
+                f"orjson {fast_parse_time * 1000:7.2f} ms "
+                f"({drf_parse_time / fast_parse_time:4.1f}x)")
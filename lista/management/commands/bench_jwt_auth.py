@@ -0,0 +1,102 @@
+"""
+Management command that benchmarks JWT authentication on the grouplists endpoints.
+
+It creates a user with shared lists inside a transaction, issues an access token and
+sends the same authenticated requests through simplejwt's `JWTAuthentication` and
+through `CachedJWTAuthentication`, reporting the time and queries per request. The
+transaction is rolled back, so the database is left untouched.
+
+Usage:
+    python manage.py bench_jwt_auth
+    python manage.py bench_jwt_auth --requests 500 --lists 20
+"""
+
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from lista.authentication import CachedJWTAuthentication, token_cache
+from lista.models import GroupList, ListItem
+from lista.views.groups import GroupListViewSet
+
+
+class Rollback(Exception):
+    """
+    Raised to roll back the benchmark fixtures.
+    """
+
+
+ENDPOINTS = {
+    'grouplists list': ({'get': 'list'}, '/grouplists/', {}),
+    'grouplists by-user': ({'get': 'list_by_user'}, '/grouplists/by-user/{user_id}/',
+                           {'user_id': '{user_id}'}),
+}
+
+
+class Command(BaseCommand):
+    """
+    Compares the uncached and cached JWT authentication classes.
+    """
+    help = "Benchmark JWTAuthentication vs CachedJWTAuthentication on grouplists endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=300)
+        parser.add_argument('--lists', type=int, default=10)
+
+    def create_fixtures(self, list_count):
+        """
+        Creates a user with `list_count` lists shared with them and returns the user.
+        """
+        owner = User.objects.create(username='bench-owner', email='bench-owner@example.com')
+        member = User.objects.create(username='bench-member', email='bench-member@example.com')
+        for index in range(list_count):
+            list_item = ListItem.objects.create(user=owner, title=f"List {index}")
+            GroupList.objects.create(user=member, list_item=list_item)
+        return member
+
+    def run(self, authentication_class, actions, path, kwargs, token, count):
+        """
+        Sends `count` requests and returns (ms per request, queries per request).
+        """
+        view = GroupListViewSet.as_view(actions, authentication_classes=[authentication_class])
+        factory = APIRequestFactory()
+        token_cache.clear()
+        queries = 0
+        start = time.perf_counter()
+        for _ in range(count):
+            request = factory.get(path, HTTP_AUTHORIZATION=f"Bearer {token}")
+            with CaptureQueriesContext(connection) as captured:
+                response = view(request, **kwargs)
+            if response.status_code != 200:
+                raise CommandError(f"{path} returned {response.status_code}: {response.data}")
+            queries += len(captured)
+        elapsed = time.perf_counter() - start
+        return elapsed * 1000 / count, queries / count
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                user = self.create_fixtures(options['lists'])
+                token = str(AccessToken.for_user(user))
+                for name, (actions, path, kwargs) in ENDPOINTS.items():
+                    path = path.format(user_id=user.id)
+                    kwargs = {key: value.format(user_id=user.id) for key, value in kwargs.items()}
+                    results = {
+                        label: self.run(cls, actions, path, kwargs, token, options['requests'])
+                        for label, cls in (('simplejwt', JWTAuthentication),
+                                           ('cached', CachedJWTAuthentication))
+                    }
+                    (plain_ms, plain_queries), (cached_ms, cached_queries) = results.values()
+                    self.stdout.write(
+                        f"{name:<20} simplejwt: {plain_ms:6.3f} ms, {plain_queries:.2f} queries  "
+                        f"cached: {cached_ms:6.3f} ms, {cached_queries:.2f} queries  "
+                        f"({plain_ms / cached_ms:.2f}x)")
+                raise Rollback
+        except Rollback:
+            pass
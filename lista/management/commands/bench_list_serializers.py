@@ -0,0 +1,110 @@
+"""
+Management command that benchmarks the serialization of list endpoints.
+
+For each size it creates that many lists (and as many shares of them) for a benchmark
+user inside a transaction, serializes them with the model serializers used before
+and with the `values_list()`-based read serializers, checks both produce the same
+data, and rolls the transaction back, so the database is left untouched. The timings
+include the query, as the endpoints do.
+
+Usage:
+    python manage.py bench_list_serializers
+    python manage.py bench_list_serializers --sizes 1000 10000 --rounds 5
+"""
+
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from lista.models import GroupList, ListItem
+from lista.serializer import (
+    GroupListReadSerializer,
+    GroupListSerializer,
+    ListItemReadSerializer,
+    ListItemSerializer,
+)
+
+
+class Rollback(Exception):
+    """
+    Raised to roll back the benchmark fixtures.
+    """
+
+
+def _best_time(function, rounds):
+    """
+    Returns the fastest of `rounds` runs of `function` in seconds, and its last result.
+    """
+    best = None
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class Command(BaseCommand):
+    """
+    Compares model serializers with the read serializers for 1k/10k lists.
+    """
+    help = "Benchmark ModelSerializer vs values()-based read serializers on list endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+        parser.add_argument('--rounds', type=int, default=3)
+
+    def create_fixtures(self, size):
+        """
+        Creates `size` lists owned by one user and shared with another.
+        """
+        owner = User.objects.create(username='bench-owner', email='bench-owner@example.com')
+        member = User.objects.create(username='bench-member', email='bench-member@example.com')
+        lists = ListItem.objects.bulk_create([
+            ListItem(user=owner, title=f"List {index}",
+                     items="Milk\nBread\nEggs\nApples\nCoffee")
+            for index in range(size)
+        ], batch_size=500)
+        GroupList.objects.bulk_create([
+            GroupList(user=member, list_item=list_item) for list_item in lists
+        ], batch_size=500)
+        return owner, member
+
+    def compare(self, name, size, model_path, read_path, rounds):
+        """
+        Times both serialization paths, checks their output matches and reports it.
+        """
+        model_time, model_data = _best_time(model_path, rounds)
+        read_time, read_data = _best_time(read_path, rounds)
+        if [dict(row) for row in model_data] != read_data:
+            raise CommandError(f"{name}: read serializer output differs from the model serializer")
+
+        self.stdout.write(
+            f"{name:<20} N={size:<6} model: {model_time * 1000:8.1f} ms "
+            f"({size / model_time:9.0f} rows/s)  read: {read_time * 1000:8.1f} ms "
+            f"({size / read_time:9.0f} rows/s)  speedup: {model_time / read_time:.1f}x")
+
+    def handle(self, *args, **options):
+        for size in options['sizes']:
+            try:
+                with transaction.atomic():
+                    owner, member = self.create_fixtures(size)
+                    lists = ListItem.objects.filter(user=owner)
+                    shares = GroupList.objects.filter(user=member)
+
+                    self.compare(
+                        'listitem/by-user', size,
+                        lambda: ListItemSerializer(lists.all(), many=True).data,
+                        lambda: ListItemReadSerializer(lists.all()).data,
+                        options['rounds'])
+                    self.compare(
+                        'grouplists', size,
+                        lambda: GroupListSerializer(shares.all(), many=True).data,
+                        lambda: GroupListReadSerializer(shares.all()).data,
+                        options['rounds'])
+                    raise Rollback
+            except Rollback:
+                pass
@@ -0,0 +1,167 @@
+"""
+Management command that load tests the list endpoints during a login flood.
+
+A probe client repeatedly fetches /listitem/accessible/ while flood threads post
+real logins (with PBKDF2 password checks) to /login/. It runs:
+- baseline: the probe alone;
+- inline: the flood with hashing on the request threads (PASSWORD_HASHING_WORKERS=0);
+- pool: the flood with hashing in the bounded pool of lista.hashing;
+- throttled: the pool flood from a single IP address with the configured
+  AUTH_THROTTLE_BUCKETS.
+Throttling is disabled in the inline and pool runs so every login is hashed. For
+each run it reports the probe's median and p95 latency and the login responses by
+status code (200 logged in, 429 throttled, 503 hashing pool saturated).
+
+The flood needs several database connections, so its users and list items are
+committed, under names unique to the run, and deleted at the end.
+
+Usage:
+    python manage.py bench_login_flood
+    python manage.py bench_login_flood --threads 8 --logins 4 --pool-workers 1
+"""
+
+import statistics
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import override_settings
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from lista import hashing
+from lista.access import sync_list_access
+from lista.models import ListItem
+
+PASSWORD = 'flood-Password-123'
+# Large enough that no login of the unthrottled runs is rejected.
+UNTHROTTLED = {'auth_ip': (10 ** 9, 1), 'auth_account': (10 ** 9, 1)}
+
+
+def _percentile(values, fraction):
+    """
+    Returns the value below which `fraction` of the sorted `values` fall.
+    """
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Command(BaseCommand):
+    """
+    Measures list endpoint latency during a login flood, with and without the hashing pool.
+    """
+    help = "Load test list endpoint latency during a flood of logins."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=6)
+        parser.add_argument('--logins', type=int, default=3, help="Logins per flood thread.")
+        parser.add_argument('--items', type=int, default=50)
+        parser.add_argument('--pool-workers', type=int, default=1)
+
+    def probe(self, token, stop):
+        """
+        Fetches the accessible lists until `stop` is set; returns the latencies in ms.
+        """
+        client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f'Bearer {token}')
+        latencies = []
+        try:
+            while not stop.is_set():
+                start = time.perf_counter()
+                response = client.get('/listitem/accessible/')
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    raise CommandError(f"Probe got {response.status_code}")
+                time.sleep(0.01)
+        finally:
+            connections.close_all()
+        return latencies
+
+    def flood(self, usernames, address, statuses):
+        """
+        Logs in as each of `usernames` from `address`, counting response statuses.
+        """
+        client = Client(HTTP_HOST='localhost', REMOTE_ADDR=address)
+        try:
+            for username in usernames:
+                response = client.post('/login/', {'username': username, 'password': PASSWORD},
+                                       content_type='application/json')
+                statuses[response.status_code] += 1
+        finally:
+            connections.close_all()
+
+    def run(self, name, token, batches=(), address='192.0.2.1'):
+        """
+        Runs the probe alongside one flood thread per batch of usernames and reports.
+        """
+        stop = threading.Event()
+        statuses = Counter()
+        results = {}
+
+        def probe():
+            results['latencies'] = self.probe(token, stop)
+
+        probe_thread = threading.Thread(target=probe)
+        flood_threads = [threading.Thread(target=self.flood, args=(batch, address, statuses))
+                         for batch in batches]
+        start = time.perf_counter()
+        probe_thread.start()
+        if flood_threads:
+            for thread in flood_threads:
+                thread.start()
+            for thread in flood_threads:
+                thread.join()
+        else:
+            time.sleep(1)
+        stop.set()
+        probe_thread.join()
+        elapsed = time.perf_counter() - start
+
+        latencies = results['latencies']
+        summary = '  '.join(f"{code}: {count}" for code, count in sorted(statuses.items()))
+        self.stdout.write(f"{name:<10} probe p50 {statistics.median(latencies):7.1f} ms  "
+                          f"p95 {_percentile(latencies, 0.95):7.1f} ms  "
+                          f"{elapsed:5.1f} s  {summary}")
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        threads, logins = options['threads'], options['logins']
+        encoded = make_password(PASSWORD)
+
+        probe_user = User.objects.create(username=f'flood-{run_id}-probe', password=encoded)
+        users = User.objects.bulk_create([
+            User(username=f'flood-{run_id}-{index}', email=f'flood-{run_id}-{index}@example.com',
+                 password=encoded)
+            for index in range(threads * logins * 2)
+        ])
+        original_pool = hashing.pool
+        try:
+            items = ListItem.objects.bulk_create([
+                ListItem(user=probe_user, title=f'Flood list {index}')
+                for index in range(options['items'])
+            ])
+            sync_list_access([item.id for item in items])
+            token = str(AccessToken.for_user(probe_user))
+            usernames = [user.username for user in users]
+            half = len(usernames) // 2
+            first = [usernames[i:half:threads] for i in range(threads)]
+            second = [usernames[half + i::threads] for i in range(threads)]
+
+            self.run('baseline', token)
+            with override_settings(AUTH_THROTTLE_BUCKETS=UNTHROTTLED):
+                hashing.pool = hashing.HashingPool(0, 0, None)
+                self.run('inline', token, first)
+                hashing.pool = hashing.HashingPool(options['pool_workers'], threads * logins, 60)
+                self.run('pool', token, second)
+            self.run('throttled', token, [first[0] + second[0]] * threads,
+                     address=f'198.51.100.{int(run_id[:2], 16) % 250 + 1}')
+        finally:
+            hashing.pool = original_pool
+            all_users = [probe_user, *users]
+            OutstandingToken.objects.filter(user__in=all_users).delete()
+            User.objects.filter(id__in=[user.id for user in all_users]).delete()
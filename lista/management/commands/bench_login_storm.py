@@ -0,0 +1,103 @@
+"""
+Management command that benchmarks last_login tracking during a login storm.
+
+It creates users inside a transaction and simulates logins of random users: a token
+pair is issued for each login and its last_login is tracked with one of:
+- save: the previous behaviour, a full-row `user.save()` per login;
+- immediate: a single-column UPDATE per login (LAST_LOGIN_WRITE_BEHIND=false);
+- write-behind: timestamps coalesced in memory and written by one flush.
+Password hashing is not part of the measurement. It reports logins per second and
+UPDATE statements, checks every user's last_login was written, and rolls back.
+
+Usage:
+    python manage.py bench_login_storm
+    python manage.py bench_login_storm --users 500 --logins 5000
+"""
+
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from lista.last_login import LastLoginRecorder
+
+
+class Rollback(Exception):
+    """
+    Raised to roll back the benchmark fixtures.
+    """
+
+
+def _updates(captured):
+    """
+    Returns the number of UPDATE statements captured.
+    """
+    return sum(1 for query in captured.captured_queries if query['sql'].startswith('UPDATE'))
+
+
+class Command(BaseCommand):
+    """
+    Compares per-login saves with write-behind last_login tracking.
+    """
+    help = "Benchmark last_login tracking strategies under a login storm."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--logins', type=int, default=2000)
+
+    def storm(self, name, sequence, track, finish=None):
+        """
+        Issues a token for every user of `sequence`, tracking each login with `track`,
+        then runs `finish` and reports throughput and UPDATE statements.
+        """
+        # The query log holds 9000 queries; start empty so none are dropped.
+        reset_queries()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            for user in sequence:
+                TokenObtainPairSerializer.get_token(user)
+                track(user, timezone.now())
+            if finish:
+                finish()
+            elapsed = time.perf_counter() - start
+        self.stdout.write(f"{name:<13} {len(sequence) / elapsed:9.0f} logins/s  "
+                          f"{elapsed * 1000:8.1f} ms  {_updates(captured):6} UPDATE statements")
+
+    def handle(self, *args, **options):
+        # A private recorder whose background thread never flushes during the run.
+        recorder = LastLoginRecorder(flush_interval=3600, flush_size=10 ** 9)
+
+        def save(user, when):
+            user.last_login = when
+            user.save()
+
+        try:
+            with transaction.atomic():
+                users = User.objects.bulk_create([
+                    User(username=f"storm{index}", email=f"storm{index}@example.com")
+                    for index in range(options['users'])
+                ])
+                rng = random.Random(7)
+                sequence = [rng.choice(users) for _ in range(options['logins'])]
+
+                self.storm('save', sequence, save)
+                with override_settings(LAST_LOGIN_WRITE_BEHIND=False):
+                    self.storm('immediate', sequence,
+                               lambda user, when: recorder.record(user.id, when))
+                User.objects.update(last_login=None)
+                with override_settings(LAST_LOGIN_WRITE_BEHIND=True):
+                    self.storm('write-behind', sequence,
+                               lambda user, when: recorder.record(user.id, when), recorder.flush)
+
+                logged_in = {user.id for user in sequence}
+                missing = User.objects.filter(id__in=logged_in, last_login__isnull=True).count()
+                if missing:
+                    raise CommandError(f"{missing} users have no last_login after the flush")
+                raise Rollback
+        except Rollback:
+            pass
@@ -0,0 +1,109 @@
+"""
+Management command that measures SQLite lock contention between worker processes.
+
+Each process plays the role of a gunicorn worker running a login-like transaction
+(read the user row, then update its last_login) in a loop, mixed with read-only
+queries. The benchmark runs once with SQLite's defaults, as Django uses them out of
+the box, and once with the pragmas and BEGIN IMMEDIATE of SQLITE_PRODUCTION_MODE,
+and reports throughput and the number of 'database is locked' errors.
+
+A temporary database file is used, the project database is never touched.
+
+Usage:
+    python manage.py bench_sqlite_contention --workers 4 --seconds 5
+"""
+
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from myproj.database import sqlite_init_command, sqlite_pragmas
+
+USERS = 100
+
+
+def _prepare_database(path):
+    """
+    Creates a small auth_user-like table in a fresh database file.
+    """
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE auth_user (id INTEGER PRIMARY KEY, username TEXT, "
+                     "last_login TEXT)")
+        conn.executemany("INSERT INTO auth_user (id, username) VALUES (?, ?)",
+                         [(user_id, f"user{user_id}") for user_id in range(1, USERS + 1)])
+
+
+def _worker(args):
+    """
+    Runs login-like write transactions and reads until the deadline.
+    """
+    path, tuned, deadline, seed = args
+    # Django's default busy timeout for SQLite is 5 seconds.
+    conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+    if tuned:
+        conn.executescript(sqlite_init_command(sqlite_pragmas()))
+    begin = "BEGIN IMMEDIATE" if tuned else "BEGIN"
+
+    writes = reads = errors = 0
+    user_id = seed
+    while time.time() < deadline:
+        user_id = user_id % USERS + 1
+        try:
+            conn.execute(begin)
+            conn.execute("SELECT id, username FROM auth_user WHERE id = ?", (user_id,)).fetchone()
+            conn.execute("UPDATE auth_user SET last_login = ? WHERE id = ?",
+                         (str(time.time()), user_id))
+            conn.execute("COMMIT")
+            writes += 1
+        except sqlite3.OperationalError as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            if 'locked' not in str(e):
+                raise
+            errors += 1
+
+        for _ in range(4):
+            conn.execute("SELECT COUNT(*) FROM auth_user WHERE last_login IS NOT NULL").fetchone()
+            reads += 1
+
+    conn.close()
+    return writes, reads, errors
+
+
+class Command(BaseCommand):
+    """
+    Compares default and production-mode SQLite settings under concurrent writers.
+    """
+    help = "Benchmark SQLite lock contention across worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--seconds', type=float, default=5)
+
+    def run(self, tuned, workers, seconds):
+        """
+        Runs one benchmark round and returns (writes, reads, errors).
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'bench.sqlite3')
+            _prepare_database(path)
+            deadline = time.time() + seconds
+            with multiprocessing.Pool(workers) as pool:
+                results = pool.map(_worker, [(path, tuned, deadline, seed * 17)
+                                             for seed in range(workers)])
+        return tuple(sum(values) for values in zip(*results))
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        seconds = options['seconds']
+        self.stdout.write(f"{workers} worker processes, {seconds}s per mode")
+
+        for label, tuned in (("default", False), ("production mode", True)):
+            writes, reads, errors = self.run(tuned, workers, seconds)
+            self.stdout.write(
+                f"  {label:16} writes/s: {writes / seconds:9.1f}  "
+                f"reads/s: {reads / seconds:9.1f}  locked errors: {errors}")
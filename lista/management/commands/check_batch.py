@@ -0,0 +1,126 @@
+"""
+Management command that checks the operations a /batch/ request accepts behave as
+their own endpoints do, with the JSON bodies a batch sends.
+
+Each scenario posts a batch, in-process, as the owner of a list with images, and
+checks its response and what it changed. The fixtures are created inside a
+transaction rolled back afterwards and the caches are replaced by a dummy cache
+meanwhile, so the database and the caches are left untouched.
+
+Usage:
+    python manage.py check_batch
+"""
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+
+from lista.access import sync_list_access
+from lista.models import ListItem, ListItemImage
+
+from .check_endpoint_access import call_endpoint
+from .check_query_counts import DUMMY_CACHES, Rollback
+
+
+def _batch(*operations):
+    return {'operations': [
+        {'method': method, 'path': path, 'body': body} for method, path, body in operations]}
+
+
+def _committed(response):
+    if response.status_code != 200 or not response.data.get('committed'):
+        return f"returned {response.status_code}: {response.data}"
+    return None
+
+
+def update_image_indexes(list_item, images):
+    """
+    update_images with the indexes as a JSON array: the image at index 1 moves to 0.
+    """
+    def check(response):
+        failure = _committed(response)
+        if failure is None:
+            indexes = [ListItemImage.objects.get(id=image.id).index for image in images]
+            if indexes != [0, 0]:
+                failure = f"left the indexes at {indexes} instead of [0, 0]"
+        return failure
+
+    return _batch(('POST', '/listitemimages/update_images/',
+                   {'list_item_id': list_item.id, 'updatedImagesIndex[]': [1]})), check
+
+
+def _rejected_upload(method, path, body):
+    """
+    Returns a scenario checking that an action storing files is rejected (400) and
+    that nothing of the batch is applied.
+    """
+    def scenario(list_item, images):
+        def check(response):
+            if response.status_code != 400 or response.data.get('committed'):
+                return f"returned {response.status_code} instead of a rolled back 400"
+            if ListItem.objects.filter(title='Batch before upload').exists():
+                return "applied the operation before the upload"
+            return None
+
+        return _batch(
+            ('POST', '/listitem/', {'title': 'Batch before upload', 'user': list_item.user_id}),
+            (method, path, {'list_item': list_item.id, **body}),
+        ), check
+    return scenario
+
+
+# Each scenario returns (batch body, check) for a list and its images; the check
+# returns None when the response and the database are as expected, an explanation
+# otherwise.
+SCENARIOS = {
+    'update image indexes': update_image_indexes,
+    'upload images rejected': _rejected_upload('POST', '/listitemimages/upload_images/', {}),
+    'confirm upload rejected': _rejected_upload(
+        'POST', '/listitemimages/confirm_upload/', {'key': 'list_item_images/cb.jpg'}),
+    'create image rejected': _rejected_upload(
+        'POST', '/listitemimages/', {'image': 'cb.jpg', 'index': 0}),
+}
+
+
+class Command(BaseCommand):
+    """
+    Runs every scenario and fails when one of them doesn't behave as expected.
+    """
+    help = "Fail when an operation misbehaves in a /batch/ request."
+
+    def run_scenario(self, scenario):
+        """
+        Runs one scenario on fresh fixtures and returns its failure, or None.
+        """
+        try:
+            with override_settings(CACHES=DUMMY_CACHES, ALLOWED_HOSTS=['testserver']), \
+                    transaction.atomic():
+                owner = User.objects.create(username='cb-owner', email='cb-owner@example.com')
+                list_item = ListItem.objects.create(user=owner, title='Batch')
+                sync_list_access([list_item.id])
+                images = ListItemImage.objects.bulk_create([
+                    ListItemImage(list_item=list_item, image=f'cb/{index}.jpg', index=index)
+                    for index in range(2)
+                ])
+                body, check = scenario(list_item, images)
+                try:
+                    failure = check(call_endpoint(owner, 'post', '/batch/', body))
+                except Exception as error:  # a 500 in production
+                    failure = f"raised {error!r}"
+                raise Rollback
+        except Rollback:
+            return failure
+
+    def handle(self, *args, **options):
+        failures = []
+        for name, scenario in SCENARIOS.items():
+            failure = self.run_scenario(scenario)
+            marker = self.style.SUCCESS("ok") if failure is None else self.style.ERROR("FAIL")
+            self.stdout.write(f"[{marker}] {name}" + (f": {failure}" if failure else ""))
+            if failure is not None:
+                failures.append(name)
+
+        if failures:
+            raise CommandError(f"Batch operations misbehave: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("Every batch operation behaves as expected."))
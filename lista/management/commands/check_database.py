@@ -0,0 +1,59 @@
+"""
+Management command that reports the active database configuration and checks
+that the backend is reachable and migrated.
+
+Run it against each backend to validate a deployment locally, e.g. with the
+PostgreSQL container from docker-compose.yml:
+
+    docker compose up -d postgres
+    DB_ENGINE=postgres DB_PASSWORD=lista python manage.py migrate
+    DB_ENGINE=postgres DB_PASSWORD=lista python manage.py check_database
+    python manage.py check_database                      # SQLite
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+from lista.models import ListItem
+
+
+class Command(BaseCommand):
+    """
+    Prints the database vendor, connection settings and round-trip latency.
+    """
+    help = "Check the configured database backend and its connection settings."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=200,
+                            help="Number of round-trips used to measure latency.")
+
+    def handle(self, *args, **options):
+        settings_dict = connection.settings_dict
+        self.stdout.write(f"Vendor: {connection.vendor}")
+        self.stdout.write(f"Name: {settings_dict['NAME']}")
+        self.stdout.write(f"CONN_MAX_AGE: {settings_dict['CONN_MAX_AGE']}")
+        self.stdout.write(f"CONN_HEALTH_CHECKS: {settings_dict['CONN_HEALTH_CHECKS']}")
+        self.stdout.write(f"Pool: {settings_dict.get('OPTIONS', {}).get('pool', False)}")
+
+        try:
+            connection.ensure_connection()
+        except Exception as e:
+            raise CommandError(f"Cannot connect to the database: {e}") from e
+
+        executor = MigrationExecutor(connection)
+        pending = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if pending:
+            raise CommandError(f"{len(pending)} migrations are not applied.")
+
+        start = time.perf_counter()
+        for _ in range(options['queries']):
+            ListItem.objects.filter(id=0).exists()
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            f"Round-trip: {elapsed / options['queries'] * 1000:.3f} ms per query "
+            f"({options['queries']} queries)")
+        self.stdout.write(self.style.SUCCESS("Database check passed."))
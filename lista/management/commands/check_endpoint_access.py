@@ -0,0 +1,239 @@
+"""
+Management command that checks a user cannot read or change the lists of others
+through the list, sharing, image and batch endpoints.
+
+Each scenario calls an endpoint, through the URL configuration and in-process, as a
+user with no access to another user's list (or with access to one list only), and
+checks that the request is denied or that the response leaves that list out. The
+fixtures are created inside a transaction rolled back afterwards and the caches are
+replaced by a dummy cache meanwhile, so the database and the caches are left
+untouched.
+
+Usage:
+    python manage.py check_endpoint_access
+"""
+
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+from django.urls import resolve
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from lista.access import sync_list_access
+from lista.image_processing import perceptual_hash_bands
+from lista.models import GroupList, ListItem, ListItemImage
+
+from .check_query_counts import DUMMY_CACHES, Rollback
+
+DENIED = (403, 404)
+
+
+def call_endpoint(user, method, path, data=None):
+    """
+    Calls an endpoint as `user` and returns the rendered response.
+    """
+    request = getattr(APIRequestFactory(), method)(path, data, format='json')
+    force_authenticate(request, user=user)
+    match = resolve(urlsplit(path).path)
+    response = match.func(request, *match.args, **match.kwargs)
+    response.render()
+    return response
+
+
+def _denied(response):
+    if response.status_code in DENIED:
+        return None
+    return f"returned {response.status_code} instead of 403/404"
+
+
+def _leaves_out(list_item_id, field='id'):
+    """
+    Returns a check that a listing succeeded without the rows of the list.
+    """
+    def check(response):
+        if response.status_code != 200:
+            return f"returned {response.status_code}"
+        if any(row.get(field) == list_item_id for row in response.data):
+            return "returned the other user's list"
+        return None
+    return check
+
+
+class _BatchResult:
+    """
+    The result of one operation of a batch response, seen as a response.
+    """
+
+    def __init__(self, response, index):
+        results = response.data.get('results') or [] if response.status_code == 200 else []
+        result = results[index] if index < len(results) else {}
+        self.status_code = result.get('status', response.status_code)
+        self.data = result.get('body')
+
+
+def _batch_denied(response):
+    if response.status_code in DENIED and not response.data.get('committed'):
+        return None
+    return f"returned {response.status_code} instead of a rolled back 403/404"
+
+
+def _similar_leaves_out(list_item_id):
+    """
+    Returns a check that `similar` succeeded without the images of the list.
+    """
+    def check(response):
+        if response.status_code != 200:
+            return f"returned {response.status_code}"
+        if any(row['list_item'] == list_item_id for row in response.data['images']):
+            return "returned an image of the owner's private list"
+        return None
+    return check
+
+
+def _not_moved(model, row_id, list_item_id):
+    """
+    Returns a check that an update left the row in its own list.
+    """
+    def check(response):
+        if model.objects.get(id=row_id).list_item_id != list_item_id:
+            return f"moved it to the other user's list ({response.status_code})"
+        if response.status_code != 400:
+            return f"returned {response.status_code} instead of 400"
+        return None
+    return check
+
+
+def scenarios(fixtures):
+    """
+    Returns {name: (user, method, path, data, check)} for the fixtures built by
+    `Command.create_fixtures`; a check returns None when the response is as expected,
+    an explanation otherwise.
+    """
+    owner, intruder, member = fixtures.owner, fixtures.intruder, fixtures.member
+    image, intruder_list_id = fixtures.image, fixtures.intruder_list_item.id
+    list_id = fixtures.list_item.id
+    return {
+        'list lists': (
+            intruder, 'get', '/listitem/', None, _leaves_out(list_id)),
+        'list lists by owner': (
+            intruder, 'get', f'/listitem/?user_id={owner.id}', None, _leaves_out(list_id)),
+        'retrieve list': (
+            intruder, 'get', f'/listitem/{list_id}/', None, _denied),
+        'list lists in a batch': (
+            intruder, 'post', '/batch/',
+            {'operations': [{'method': 'GET', 'path': '/listitem/'}]},
+            lambda response: _leaves_out(list_id)(_BatchResult(response, 0))),
+        'list images': (
+            intruder, 'get', '/listitemimages/', None, _leaves_out(list_id, 'list_item')),
+        'create image': (
+            intruder, 'post', '/listitemimages/',
+            {'list_item': list_id, 'image': 'intruder.jpg', 'index': 0}, _denied),
+        'create image without list': (
+            intruder, 'post', '/listitemimages/', {'image': 'intruder.jpg'}, _denied),
+        'retrieve image': (
+            intruder, 'get', f'/listitemimages/{image.id}/', None, _denied),
+        'list shares of another user': (
+            intruder, 'get', f'/grouplists/?user_id={owner.id}', None,
+            _leaves_out(list_id, 'list_item')),
+        'similar images of a private list': (
+            member, 'get', f'/listitemimages/{image.id}/similar/', None,
+            _similar_leaves_out(fixtures.private_list_item.id)),
+        'permission type': (
+            intruder, 'get',
+            f'/grouplists/permission_type/?user_id={owner.id}&list_item_id={list_id}',
+            None, _denied),
+        'permission type with a malformed list': (
+            intruder, 'get', f'/grouplists/permission_type/?user_id={owner.id}&list_item_id=x',
+            None, _denied),
+        'share list': (
+            intruder, 'post', '/grouplists/', {'list_item': list_id, 'user': intruder.id},
+            _denied),
+        'move share to another list': (
+            intruder, 'put', f'/grouplists/{fixtures.intruder_share.id}/',
+            {'list_item': list_id, 'user': owner.id},
+            _not_moved(GroupList, fixtures.intruder_share.id, intruder_list_id)),
+        'move image to another list': (
+            intruder, 'patch', f'/listitemimages/{fixtures.intruder_image.id}/',
+            {'list_item': list_id},
+            _not_moved(ListItemImage, fixtures.intruder_image.id, intruder_list_id)),
+        'update images': (
+            intruder, 'post', '/listitemimages/update_images/', {'list_item_id': list_id},
+            _denied),
+        'update images in a batch': (
+            intruder, 'post', '/batch/',
+            {'operations': [{'method': 'POST', 'path': '/listitemimages/update_images/',
+                             'body': {'list_item_id': list_id}}]},
+            _batch_denied),
+    }
+
+
+class Command(BaseCommand):
+    """
+    Runs every scenario and fails when one of them exposes the other user's list.
+    """
+    help = "Fail when an endpoint gives access to the lists of another user."
+
+    @staticmethod
+    def create_fixtures():
+        """
+        Creates a list shared with a member, a private list of the same owner with
+        the same photo, and a list of the intruder shared with the owner.
+        """
+        owner, intruder, member = User.objects.bulk_create([
+            User(username=f'ea-{name}', email=f'ea-{name}@example.com')
+            for name in ('owner', 'intruder', 'member')
+        ])
+        list_item, private_list_item, intruder_list_item = ListItem.objects.bulk_create([
+            ListItem(user=owner, title='Endpoint access'),
+            ListItem(user=owner, title='Endpoint access (private)'),
+            ListItem(user=intruder, title='Endpoint access (intruder)'),
+        ])
+        GroupList.objects.create(user=member, list_item=list_item)
+        intruder_share = GroupList.objects.create(user=owner, list_item=intruder_list_item)
+        sync_list_access([list_item.id, private_list_item.id, intruder_list_item.id])
+        # The same photo in the shared list and in the private one.
+        hashes = {'content_hash': 'ea' * 32, 'perceptual_hash': '00ff00ff00ff00ff',
+                  **perceptual_hash_bands('00ff00ff00ff00ff')}
+        image, _, intruder_image = ListItemImage.objects.bulk_create([
+            ListItemImage(list_item=item, image=f'ea/{item.id}.jpg', index=0, **hashes)
+            for item in (list_item, private_list_item, intruder_list_item)
+        ])
+        return SimpleNamespace(
+            owner=owner, intruder=intruder, member=member, list_item=list_item,
+            private_list_item=private_list_item, intruder_list_item=intruder_list_item,
+            intruder_share=intruder_share, image=image, intruder_image=intruder_image)
+
+    def run_scenarios(self):
+        """
+        Returns {name: failure or None} for every scenario.
+        """
+        outcomes = {}
+        try:
+            with override_settings(CACHES=DUMMY_CACHES, ALLOWED_HOSTS=['testserver']), \
+                    transaction.atomic():
+                fixtures = self.create_fixtures()
+                for name, (user, method, path, data, check) in scenarios(fixtures).items():
+                    try:
+                        with transaction.atomic():
+                            outcomes[name] = check(call_endpoint(user, method, path, data))
+                    except Exception as error:  # a 500 in production
+                        outcomes[name] = f"raised {error!r}"
+                raise Rollback
+        except Rollback:
+            return outcomes
+
+    def handle(self, *args, **options):
+        failures = []
+        for name, failure in self.run_scenarios().items():
+            marker = self.style.SUCCESS("ok") if failure is None else self.style.ERROR("OPEN")
+            self.stdout.write(f"[{marker}] {name}" + (f": {failure}" if failure else ""))
+            if failure is not None:
+                failures.append(name)
+
+        if failures:
+            raise CommandError(f"Access to another user's list through: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("Every endpoint denies access to other users' lists."))
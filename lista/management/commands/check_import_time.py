@@ -0,0 +1,118 @@
+"""
+Management command that measures the application's start-up import time and checks
+it against the budget tracked in myproj/import_time_budget.json.
+
+Each run starts a fresh interpreter that does what a worker does before serving its
+first request: `django.setup()` and loading the URLconf (which imports every view).
+The median of the runs is compared with the budget, and the command fails if it is
+over the budget or if any of the budget's deferred modules (SDKs that must only be
+imported on first use, see `lista.providers`) was imported at start-up. A final run
+under `python -X importtime` lists the slowest top-level imports.
+
+Usage:
+    python manage.py check_import_time
+    python manage.py check_import_time --runs 10 --top 20
+    python manage.py check_import_time --record   # store the measurement as the new baseline
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+BUDGET_FILE = Path(settings.BASE_DIR) / 'myproj' / 'import_time_budget.json'
+
+# Headroom over the recorded time given to the budget by --record.
+BUDGET_HEADROOM = 1.5
+
+STARTUP_SCRIPT = """
+import json, os, sys, time
+start = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproj.settings')
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({'ms': (time.perf_counter() - start) * 1000, 'modules': sorted(sys.modules)}))
+"""
+
+
+def _run_startup(importtime=False):
+    """
+    Runs the start-up script in a new interpreter.
+
+    Returns:
+        tuple: (the script's JSON output, its stderr).
+    """
+    command = [sys.executable, *(['-X', 'importtime'] if importtime else []), '-c', STARTUP_SCRIPT]
+    result = subprocess.run(command, cwd=settings.BASE_DIR, env=os.environ.copy(),
+                            capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        raise CommandError(f"Start-up failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def _top_level_imports(stderr):
+    """
+    Parses `-X importtime` output into (cumulative ms, module) of top-level imports.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _self, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit() and not name.startswith('  ', 1):
+            imports.append((int(cumulative) / 1000, name.strip()))
+    return sorted(imports, reverse=True)
+
+
+class Command(BaseCommand):
+    """
+    Checks start-up import time and deferred imports against the tracked budget.
+    """
+    help = "Measure start-up import time and check it against myproj/import_time_budget.json."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--top', type=int, default=10)
+        parser.add_argument('--record', action='store_true',
+                            help="Write the measured time and a new budget to the budget file.")
+
+    def handle(self, *args, **options):
+        budget = json.loads(BUDGET_FILE.read_text())
+
+        results = [_run_startup()[0] for _ in range(options['runs'])]
+        median_ms = statistics.median(result['ms'] for result in results)
+        loaded = set(results[-1]['modules'])
+        deferred = [module for module in budget['deferred_modules'] if module in loaded]
+
+        _result, stderr = _run_startup(importtime=True)
+        self.stdout.write("Slowest top-level imports (cumulative, under -X importtime):")
+        for cumulative_ms, module in _top_level_imports(stderr)[:options['top']]:
+            self.stdout.write(f"  {cumulative_ms:8.1f} ms  {module}")
+        self.stdout.write(f"Start-up: {median_ms:.0f} ms (median of {options['runs']} runs), "
+                          f"budget {budget['startup_ms']} ms, "
+                          f"recorded {budget['recorded_ms']} ms on {budget['recorded_on']}")
+
+        if options['record']:
+            budget['recorded_ms'] = round(median_ms)
+            budget['recorded_on'] = date.today().isoformat()
+            budget['startup_ms'] = round(median_ms * BUDGET_HEADROOM)
+            BUDGET_FILE.write_text(json.dumps(budget, indent=2) + '\n')
+            self.stdout.write(f"Recorded in {BUDGET_FILE.name}.")
+
+        errors = []
+        if deferred:
+            errors.append(f"imported at start-up but must be deferred: {', '.join(deferred)}")
+        if median_ms > budget['startup_ms']:
+            errors.append(f"start-up takes {median_ms:.0f} ms, over the budget of "
+                          f"{budget['startup_ms']} ms")
+        if errors:
+            raise CommandError('; '.join(errors))
+        self.stdout.write(self.style.SUCCESS("Within the import time budget."))
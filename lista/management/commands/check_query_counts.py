@@ -0,0 +1,139 @@
+"""
+Management command that checks endpoint query counts do not grow with the number of
+rows returned (N+1 regressions).
+
+Each scenario creates N rows inside a transaction, calls the endpoint view in-process
+while capturing the executed queries, and rolls the transaction back, so the database
+is left untouched. The caches are replaced by a dummy cache meanwhile, so every run
+measures the uncached queries and nothing is cached for the rolled-back rows. The
+command fails when a scenario issues a different number of queries for different N.
+
+Usage:
+    python manage.py check_query_counts
+    python manage.py check_query_counts --sizes 1 5 50 --verbose-queries
+"""
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from lista.access import sync_list_access
+from lista.models import Customization, GroupList, ListItem, ListItemImage
+from lista.views.bootstrap import bootstrap
+from lista.views.groups import GroupListViewSet
+
+DUMMY_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+    for alias in ('default', 'shared')
+}
+
+
+class Rollback(Exception):
+    """
+    Raised to roll back the fixtures of a scenario.
+    """
+
+
+def _create_users(prefix, count):
+    return User.objects.bulk_create([
+        User(username=f"{prefix}{index}", email=f"{prefix}{index}@example.com")
+        for index in range(count)
+    ])
+
+
+def grouplists_list(size):
+    """
+    GET /grouplists/ for an owner whose list is shared with `size` users.
+    """
+    owner = User.objects.create(username='qc-owner', email='qc-owner@example.com')
+    list_item = ListItem.objects.create(user=owner, title='Query count')
+    for member in _create_users('qc-member', size):
+        GroupList.objects.create(user=member, list_item=list_item)
+
+    request = APIRequestFactory().get('/grouplists/')
+    force_authenticate(request, user=owner)
+    return GroupListViewSet.as_view({'get': 'list'}), request, {}
+
+
+def home_screen(size):
+    """
+    GET /bootstrap/ for a user with `size` own lists and `size` shared lists, each
+    with two images.
+    """
+    user, other = _create_users('qc-home', 2)
+    Customization.objects.create(user=user, background_image_id='qc-background')
+    own = ListItem.objects.bulk_create(
+        [ListItem(user=user, title=f'Own {index}') for index in range(size)])
+    shared = ListItem.objects.bulk_create(
+        [ListItem(user=other, title=f'Shared {index}') for index in range(size)])
+    GroupList.objects.bulk_create([GroupList(user=user, list_item=list_item) for list_item in shared])
+    sync_list_access([list_item.id for list_item in own + shared])
+    ListItemImage.objects.bulk_create([
+        ListItemImage(list_item=list_item, image=f'qc/{list_item.id}-{index}.jpg', index=index)
+        for list_item in own + shared for index in range(2)
+    ])
+
+    request = APIRequestFactory().get('/bootstrap/')
+    force_authenticate(request, user=user)
+    return bootstrap, request, {}
+
+
+SCENARIOS = {
+    'grouplists list': grouplists_list,
+    'bootstrap': home_screen,
+}
+
+
+class Command(BaseCommand):
+    """
+    Runs every scenario for several sizes and compares the query counts.
+    """
+    help = "Fail when endpoint query counts grow with the number of returned rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 50])
+        parser.add_argument('--verbose-queries', action='store_true')
+
+    def measure(self, scenario, size):
+        """
+        Returns the queries executed by the scenario's view for `size` rows.
+        """
+        try:
+            with override_settings(CACHES=DUMMY_CACHES), transaction.atomic():
+                view, request, kwargs = scenario(size)
+                with CaptureQueriesContext(connection) as captured:
+                    response = view(request, **kwargs)
+                    response.render()
+                if response.status_code >= 400:
+                    raise CommandError(f"Scenario returned {response.status_code}: "
+                                       f"{response.content[:200]!r}")
+                queries = list(captured.captured_queries)
+                raise Rollback
+        except Rollback:
+            return queries
+
+    def handle(self, *args, **options):
+        failures = []
+        for name, scenario in SCENARIOS.items():
+            counts = {}
+            for size in options['sizes']:
+                queries = self.measure(scenario, size)
+                counts[size] = len(queries)
+                if options['verbose_queries']:
+                    self.stdout.write(f"  {name} N={size}:")
+                    for query in queries:
+                        self.stdout.write(f"      {query['sql']}")
+
+            constant = len(set(counts.values())) == 1
+            marker = self.style.SUCCESS("ok") if constant else self.style.ERROR("GROWS")
+            summary = ", ".join(f"N={size}: {count}" for size, count in counts.items())
+            self.stdout.write(f"[{marker}] {name} ({summary})")
+            if not constant:
+                failures.append(name)
+
+        if failures:
+            raise CommandError(f"Query count grows with N for: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All scenarios use a constant number of queries."))
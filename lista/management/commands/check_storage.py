@@ -0,0 +1,57 @@
+"""
+Management command that checks the configured media storage end to end.
+
+It writes, reads, signs and deletes a small object through `default_storage`, which
+makes it easy to validate an S3-compatible configuration against a local stand-in
+before deploying, e.g. MinIO:
+
+    docker run -p 9000:9000 -e MINIO_ROOT_USER=minio -e MINIO_ROOT_PASSWORD=minio123 \
+        minio/minio server /data
+    STORAGE_BACKEND=s3 S3_ENDPOINT_URL=http://localhost:9000 S3_ACCESS_KEY_ID=minio \
+        S3_SECRET_ACCESS_KEY=minio123 python manage.py check_storage --create-bucket
+"""
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from lista.image_processing import IMAGE_UPLOAD_DIR
+from lista.storage import generate_presigned_upload, supports_presigned_urls
+
+
+class Command(BaseCommand):
+    """
+    Runs a save/read/url/delete round-trip against the default storage.
+    """
+    help = "Check that the configured media storage backend works."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--create-bucket', action='store_true',
+                            help="Create the S3 bucket if it does not exist.")
+
+    def handle(self, *args, **options):
+        storage = default_storage
+        self.stdout.write(f"Storage backend: {storage.__class__.__module__}."
+                          f"{storage.__class__.__name__}")
+
+        if supports_presigned_urls(storage) and options['create_bucket']:
+            if not storage.bucket.creation_date:
+                storage.bucket.create()
+                self.stdout.write(f"Created bucket {storage.bucket.name}")
+
+        payload = b"lista storage check"
+        name = storage.save(f"{IMAGE_UPLOAD_DIR}/storage_check.txt", ContentFile(payload))
+        try:
+            with storage.open(name) as stored:
+                if stored.read() != payload:
+                    raise CommandError("Stored content does not match.")
+            self.stdout.write(f"Saved and read back {name}")
+            self.stdout.write(f"Download URL: {storage.url(name)}")
+
+            if supports_presigned_urls(storage):
+                presigned = generate_presigned_upload(0, 'check', 'image/png', 0, storage)
+                self.stdout.write(f"Presigned upload URL: {presigned['url']}")
+        finally:
+            storage.delete(name)
+
+        self.stdout.write(self.style.SUCCESS("Storage check passed."))
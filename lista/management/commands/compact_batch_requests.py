@@ -0,0 +1,63 @@
+"""
+Management command that purges expired idempotency records of /batch/ requests.
+
+Every batch sent with an Idempotency-Key stores its response in a BatchRequest row,
+replayed to retries for BATCH_IDEMPOTENCY_TTL seconds (see `lista.batch`). A user's
+expired rows are deleted when they send their next keyed batch; this command deletes
+the rest, in small batches using the index on `created_at`.
+
+Schedule it daily, next to compact_token_blacklist:
+    python manage.py compact_batch_requests
+
+Usage:
+    python manage.py compact_batch_requests --batch-size 1000
+    python manage.py compact_batch_requests --dry-run
+"""
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from lista.models import BatchRequest
+
+
+class Command(BaseCommand):
+    """
+    Deletes BatchRequest rows older than BATCH_IDEMPOTENCY_TTL in batches.
+    """
+    help = "Purge expired /batch/ idempotency records in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0.05,
+                            help="Seconds to sleep between batches to let other writers in.")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=settings.BATCH_IDEMPOTENCY_TTL)
+        expired = BatchRequest.objects.filter(created_at__lt=cutoff)
+
+        if options['dry_run']:
+            self.stdout.write(f"{expired.count()} expired batch requests would be deleted.")
+            return
+
+        deleted = batches = 0
+        start = time.perf_counter()
+        while True:
+            ids = list(expired.order_by('created_at').values_list(
+                'id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            with transaction.atomic():
+                deleted += BatchRequest.objects.filter(id__in=ids).delete()[0]
+            batches += 1
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted} batch requests in {batches} batches "
+            f"({time.perf_counter() - start:.1f}s)."))
@@ -0,0 +1,70 @@
+"""
+Management command that purges expired JWTs from the token blacklist tables.
+
+Every login creates an OutstandingToken row and every refresh token rotation a
+BlacklistedToken row. Refresh tokens live 90 days, so without maintenance both
+tables grow forever. Expired tokens are rejected by their 'exp' claim anyway, so
+their rows can be deleted. Unlike simplejwt's `flushexpiredtokens`, which deletes
+everything in one statement (and one long write lock), this command deletes in
+small batches, each in its own transaction, using the index on `expires_at`.
+
+Schedule it daily, e.g. as a Render cron job or a crontab entry:
+    python manage.py compact_token_blacklist
+
+Usage:
+    python manage.py compact_token_blacklist --batch-size 1000 --grace-hours 24
+    python manage.py compact_token_blacklist --dry-run
+"""
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class Command(BaseCommand):
+    """
+    Deletes expired outstanding tokens and their blacklist entries in batches.
+    """
+    help = "Purge expired tokens from the simplejwt blacklist tables in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--grace-hours', type=float, default=0,
+                            help="Keep tokens that expired less than this many hours ago.")
+        parser.add_argument('--pause', type=float, default=0.05,
+                            help="Seconds to sleep between batches to let other writers in.")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        expired = OutstandingToken.objects.filter(expires_at__lte=cutoff)
+
+        if options['dry_run']:
+            self.stdout.write(
+                f"{expired.count()} expired outstanding tokens "
+                f"({BlacklistedToken.objects.filter(token__expires_at__lte=cutoff).count()} "
+                f"blacklisted) would be deleted.")
+            return
+
+        outstanding_deleted = blacklisted_deleted = batches = 0
+        start = time.perf_counter()
+        while True:
+            ids = list(expired.order_by('expires_at').values_list(
+                'id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            with transaction.atomic():
+                blacklisted_deleted += BlacklistedToken.objects.filter(
+                    token_id__in=ids).delete()[0]
+                outstanding_deleted += OutstandingToken.objects.filter(id__in=ids).delete()[0]
+            batches += 1
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {outstanding_deleted} outstanding and {blacklisted_deleted} blacklisted "
+            f"tokens in {batches} batches ({time.perf_counter() - start:.1f}s)."))
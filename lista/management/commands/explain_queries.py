@@ -0,0 +1,94 @@
+"""
+Management command that captures the query plan of every endpoint query and fails
+when one of them needs a full table scan.
+
+The querysets below mirror the lookups performed by the views in `lista/views/`.
+When a view changes its filtering, the matching entry here should change with it,
+so a missing index is caught before it reaches production.
+
+On PostgreSQL, sequential scans are disabled for the session so the check reports
+whether an index *can* serve the query, independently of table statistics.
+
+Usage:
+    python manage.py explain_queries
+    python manage.py explain_queries --verbose-plans
+"""
+
+import re
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from lista.models import Customization, GroupList, ListItem, ListItemImage, Recommendation
+
+FULL_SCAN_PATTERNS = {
+    # "SCAN table" without an index is a full table scan; "SCAN t USING INDEX" reads a
+    # whole index and is reported as well.
+    'sqlite': re.compile(r'\bSCAN\b(?! CONSTANT ROW)'),
+    'postgresql': re.compile(r'\bSeq Scan\b'),
+}
+
+
+def endpoint_queries(user_id=1, list_item_id=1, email='user@example.com'):
+    """
+    Returns the querysets executed by the API endpoints, keyed by a description.
+    """
+    return {
+        'grouplists/permission_type: membership by user and list':
+            GroupList.objects.filter(user_id=user_id, list_item_id=list_item_id),
+        'grouplists/by-user: lists shared with a user':
+            GroupList.objects.filter(user_id=user_id).values_list('list_item_id', flat=True),
+        'grouplists: members of a list':
+            GroupList.objects.filter(list_item_id=list_item_id),
+        'listitem/by-user: lists owned by a user':
+            ListItem.objects.filter(user_id=user_id),
+        'listitem: active lists owned by a user':
+            ListItem.objects.filter(user_id=user_id, is_active=True),
+        'listitemimages/get_images_for_list_item: images of a list':
+            ListItemImage.objects.filter(list_item_id=list_item_id),
+        'listitemimages/update_images: image by list and index':
+            ListItemImage.objects.filter(list_item_id=list_item_id, index=0),
+        'recommendations: latest recommendations of a list':
+            Recommendation.objects.filter(list_item_id=list_item_id).order_by('-created_at'),
+        'customizations/get_user_customization: customization of a user':
+            Customization.objects.filter(user_id=user_id),
+        'get_user_info / reset_password: user by email':
+            User.objects.filter(email=email),
+    }
+
+
+class Command(BaseCommand):
+    """
+    Runs EXPLAIN for every endpoint query and fails on full table scans.
+    """
+    help = "Capture EXPLAIN plans of the endpoint queries and fail on full table scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true',
+                            help="Print the full plan of every query.")
+
+    def handle(self, *args, **options):
+        pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f"Unsupported database vendor: {connection.vendor}")
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+
+        failures = []
+        for description, queryset in endpoint_queries().items():
+            plan = queryset.explain()
+            full_scan = pattern.search(plan)
+            marker = self.style.ERROR("FULL SCAN") if full_scan else self.style.SUCCESS("ok")
+            self.stdout.write(f"[{marker}] {description}")
+            if options['verbose_plans'] or full_scan:
+                for line in plan.splitlines():
+                    self.stdout.write(f"      {line}")
+            if full_scan:
+                failures.append(description)
+
+        if failures:
+            raise CommandError(f"{len(failures)} endpoint queries need a full table scan.")
+        self.stdout.write(self.style.SUCCESS("All endpoint queries use an index."))
@@ -0,0 +1,36 @@
+"""
+Management command that serves the Redis-compatible stand-in of
+`lista.redis_standin`, for running the project with a shared cache (CACHE_URL) on a
+machine without Redis, e.g. several local gunicorn workers or tests.
+
+Usage:
+    python manage.py run_redis_standin
+    python manage.py run_redis_standin --host 0.0.0.0 --port 6380
+"""
+
+from django.core.management.base import BaseCommand
+
+from lista.redis_standin import RedisStandin
+
+
+class Command(BaseCommand):
+    """
+    Serves the in-memory Redis stand-in until interrupted.
+    """
+    help = "Serve an in-memory Redis-compatible stand-in for local runs and tests."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=6379)
+
+    def handle(self, *args, **options):
+        server = RedisStandin().make_server(options['host'], options['port'])
+        host, port = server.server_address[:2]
+        self.stdout.write(f"Redis stand-in listening on redis://{host}:{port}/0 "
+                          "(CONTROL-C to quit).")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.1 on 2026-10-19 13:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def clear_duplicate_emails(apps, schema_editor):
+    """
+    Keeps a shared email on the oldest account only and clears it on the others, so
+    the unique email index can be created. Those accounts keep logging in with their
+    username and can set a new email from their profile.
+    """
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    duplicated = User.objects.exclude(email='').values('email').annotate(
+        count=models.Count('id'), first_id=models.Min('id')).filter(count__gt=1)
+    for duplicate in duplicated:
+        User.objects.filter(email=duplicate['email']).exclude(
+            id=duplicate['first_id']).update(email='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lista', '0030_listitemimage_metadata'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='grouplist',
+            index=models.Index(fields=['user', 'list_item'], name='grouplist_user_item_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user'], name='listitem_active_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listitemimage',
+            index=models.Index(fields=['list_item', 'index'], name='listitemimage_index_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recommendation',
+            index=models.Index(fields=['list_item', '-created_at'], name='recommendation_created_idx'),
+        ),
+        # auth.User is not owned by this app, so its email indexes are created with SQL.
+        # Lookups by email use the plain index (a partial index can't serve `email = %s`).
+        # Uniqueness excludes empty emails so accounts created without one don't collide.
+        migrations.RunSQL(
+            sql="CREATE INDEX auth_user_email_idx ON auth_user (email)",
+            reverse_sql="DROP INDEX auth_user_email_idx",
+        ),
+        migrations.RunPython(clear_duplicate_emails, migrations.RunPython.noop),
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX auth_user_email_uniq ON auth_user (email) WHERE email <> ''",
+            reverse_sql="DROP INDEX auth_user_email_uniq",
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.1 on 2026-10-19 13:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_list_access(apps, schema_editor):
+    """
+    Fills ListAccess from the existing list owners and GroupList shares.
+    """
+    ListItem = apps.get_model('lista', 'ListItem')
+    GroupList = apps.get_model('lista', 'GroupList')
+    ListAccess = apps.get_model('lista', 'ListAccess')
+
+    rows = {}
+    shares = GroupList.objects.values_list(
+        'user_id', 'list_item_id', 'permission_type', 'role').order_by('id')
+    for user_id, list_item_id, permission_type, role in shares.iterator():
+        rows[(user_id, list_item_id)] = (permission_type, role)
+    for user_id, list_item_id in ListItem.objects.values_list('user_id', 'id').iterator():
+        rows[(user_id, list_item_id)] = ('full_access', 'owner')
+
+    ListAccess.objects.bulk_create([
+        ListAccess(user_id=user_id, list_item_id=list_item_id,
+                   permission_type=permission_type, role=role)
+        for (user_id, list_item_id), (permission_type, role) in rows.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lista', '0031_query_pattern_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('permission_type', models.CharField(choices=[('read_only', 'Read-Only'), ('full_access', 'Full Access')], max_length=20)),
+                ('role', models.CharField(choices=[('owner', 'Owner'), ('member', 'Member'), ('admin', 'Admin')], max_length=10)),
+                ('list_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='access_entries', to='lista.listitem')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='list_access', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'list_item'), name='listaccess_user_item_uniq')],
+            },
+        ),
+        migrations.RunPython(populate_list_access, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-19 13:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def remove_duplicate_shares(apps, schema_editor):
+    """
+    Keeps only the most recent GroupList of every (user, list_item) pair, which is
+    also the one ListAccess was built from.
+    """
+    GroupList = apps.get_model('lista', 'GroupList')
+    latest_ids = GroupList.objects.values('user_id', 'list_item_id').annotate(
+        latest_id=models.Max('id')).values('latest_id')
+    GroupList.objects.exclude(id__in=models.Subquery(latest_ids)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lista', '0032_listaccess'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_shares, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='grouplist',
+            name='grouplist_user_item_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='grouplist',
+            constraint=models.UniqueConstraint(fields=('user', 'list_item'), name='grouplist_user_item_uniq'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-19 13:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lista', '0033_grouplist_unique_share'),
+        ('token_blacklist', '0012_alter_outstandingtoken_user'),
+    ]
+
+    operations = [
+        # The token blacklist tables belong to simplejwt, so the index used by
+        # `compact_token_blacklist` to find expired tokens is created with SQL.
+        migrations.RunSQL(
+            sql="CREATE INDEX token_outstanding_expires_idx "
+                "ON token_blacklist_outstandingtoken (expires_at)",
+            reverse_sql="DROP INDEX token_outstanding_expires_idx",
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.1 on 2026-10-19 13:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def remove_duplicate_customizations(apps, schema_editor):
+    """
+    Keeps only the most recent Customization of every user (with duplicates, reading
+    or updating the user's customization failed with MultipleObjectsReturned).
+    """
+    Customization = apps.get_model('lista', 'Customization')
+    latest_ids = Customization.objects.values('user_id').annotate(
+        latest_id=models.Max('id')).values('latest_id')
+    Customization.objects.exclude(id__in=models.Subquery(latest_ids)).delete()
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lista', '0034_outstandingtoken_expires_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_customizations, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='customization',
+            constraint=models.UniqueConstraint(fields=('user',), name='customization_user_uniq'),
+        ),
+    ]
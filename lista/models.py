@@ -10,11 +10,16 @@ Models:
    role (member/admin), permission type (read-only/full access), and the date the
    user joined the group.
 3. ListItemImage: Represents an image associated with a ListItem, including image
-   file, index, and mime type.
+   file, index, mime type, and metadata (dimensions, size, content and perceptual hashes)
+   computed once at upload.
 4. Customization: Represents user-specific customization settings, including the
    background image ID.
 5. Recommendation: Represents a list of recommended items for a particular ListItem,
    including a creation timestamp.
+6. ListAccess: A denormalized index of the lists each user owns or has been shared,
+   with the effective permission, maintained by `lista.access`.
+7. BatchRequest: The stored response of a committed /batch/ request, looked up by
+   the client's idempotency key so a retried batch is not applied twice.
 
 Each model leverages Django's built-in features like ForeignKey relationships, model
 fields, and auto-generated timestamps.
@@ -22,6 +27,7 @@ fields, and auto-generated timestamps.
 
 
 from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 class ListItem(models.Model):
     """
@@ -43,6 +49,16 @@ class ListItem(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='owned_lists')
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        """
+        Meta class defining the indexes of the ListItem table. Active lists are looked up
+        by owner on every home screen load, so they get a partial index.
+        """
+        indexes = [
+            models.Index(fields=['user'], condition=models.Q(is_active=True),
+                         name='listitem_active_user_idx'),
+        ]
+
     def __str__(self):
         """
         Returns a string representation of the ListItem, displaying the title.
@@ -86,6 +102,16 @@ class GroupList(models.Model):
     permission_type = models.CharField(
     max_length=20,choices=PERMISSION_CHOICES, default='read_only')
 
+    class Meta:
+        """
+        Meta class defining the unique (user, list_item) pair: a list is shared with a
+        user at most once. Its index serves membership lookups, and it is the conflict
+        target of the bulk share upsert.
+        """
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'list_item'], name='grouplist_user_item_uniq'),
+        ]
+
     def __str__(self):
         """
         Returns a string representation of the GroupList showing the user ID, list item ID,
@@ -94,8 +120,8 @@ class GroupList(models.Model):
         Returns:
             str: A formatted string showing user ID, list item ID, role, and permission type.
         """
-        user_id = self.user.pk if self.user else None
-        list_item_id = self.list_item.pk if self.list_item else None
+        user_id = self.user_id
+        list_item_id = self.list_item_id
         role = self.role
         permission_type = self.permission_type
 
@@ -110,12 +136,22 @@ class ListItemImage(models.Model):
     """
     Represents an image associated with a specific ListItem. The image is stored along
     with metadata such as the image index and MIME type.
+
+    Dimensions, size and hashes are computed once at upload, so listing endpoints can
+    return them without opening the file and near-duplicate detection is an index lookup.
     
     Attributes:
         list_item (ForeignKey): A reference to the ListItem the image is associated with.
         image (ImageField): The actual image file uploaded for the ListItem.
         index (int): The index or order of the image within the ListItem.
         mime_type (str): The MIME type of the image, if available.
+        width (int): The width of the stored image in pixels.
+        height (int): The height of the stored image in pixels.
+        byte_size (int): The size of the stored file in bytes.
+        content_hash (str): The SHA-256 hex digest of the stored file (exact duplicates).
+        perceptual_hash (str): The 64-bit difference hash of the image as 16 hex digits.
+        phash_band_0..phash_band_3 (int): The perceptual hash split into four 16-bit
+            indexed bands used to find near-duplicate candidates.
     """
     list_item = models.ForeignKey(
         ListItem, on_delete=models.CASCADE, related_name='images')
@@ -123,6 +159,24 @@ class ListItemImage(models.Model):
         null=True, blank=True, default='/placeholder.png', upload_to='list_item_images/')
     index = models.PositiveIntegerField(default=0)
     mime_type = models.CharField(max_length=50, blank=True, null=True)
+    width = models.PositiveIntegerField(blank=True, null=True)
+    height = models.PositiveIntegerField(blank=True, null=True)
+    byte_size = models.PositiveIntegerField(blank=True, null=True)
+    content_hash = models.CharField(max_length=64, blank=True, null=True, db_index=True)
+    perceptual_hash = models.CharField(max_length=16, blank=True, null=True, db_index=True)
+    phash_band_0 = models.PositiveIntegerField(blank=True, null=True, db_index=True)
+    phash_band_1 = models.PositiveIntegerField(blank=True, null=True, db_index=True)
+    phash_band_2 = models.PositiveIntegerField(blank=True, null=True, db_index=True)
+    phash_band_3 = models.PositiveIntegerField(blank=True, null=True, db_index=True)
+
+    class Meta:
+        """
+        Meta class defining the indexes of the ListItemImage table. Images are fetched,
+        reordered and deleted by (list_item, index).
+        """
+        indexes = [
+            models.Index(fields=['list_item', 'index'], name='listitemimage_index_idx'),
+        ]
 
     def __str__(self):
         """
@@ -132,7 +186,7 @@ class ListItemImage(models.Model):
         Returns:
             str: A formatted string showing ListItem ID and image name.
         """
-        return f"Image for ListItem PK: {self.list_item.pk} - {self.image.name}"
+        return f"Image for ListItem PK: {self.list_item_id} - {self.image.name}"
 
 class Customization(models.Model):
     """
@@ -146,6 +200,16 @@ class Customization(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     background_image_id = models.CharField(max_length=20, default='')
 
+    class Meta:
+        """
+        Meta class defining one customization per user. The unique index serves the
+        per-user lookup and rejects a second customization created concurrently
+        (see `save_customization`).
+        """
+        constraints = [
+            models.UniqueConstraint(fields=['user'], name='customization_user_uniq'),
+        ]
+
     def __str__(self):
         """
         Returns a string representation of the Customization, showing the user ID and the background
@@ -154,7 +218,7 @@ class Customization(models.Model):
         Returns:
             str: A formatted string showing user ID and background image ID.
         """
-        user_identifier = self.user.id
+        user_identifier = self.user_id
         background_image = self.background_image_id
 
         return (f"Customization for user {user_identifier} - "
@@ -178,6 +242,16 @@ class Recommendation(models.Model):
     recommended_items = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        """
+        Meta class defining the indexes of the Recommendation table. Recommendations are
+        read per list item, newest first.
+        """
+        indexes = [
+            models.Index(fields=['list_item', '-created_at'],
+                         name='recommendation_created_idx'),
+        ]
+
     def __str__(self):
         """
         Returns a string representation of the Recommendation, displaying the ListItem ID and
@@ -186,5 +260,95 @@ class Recommendation(models.Model):
         Returns:
             str: A formatted string showing ListItem ID and creation timestamp.
         """
-        return (f"Recommendation for ListItem ID: {self.list_item.id} "
+        return (f"Recommendation for ListItem ID: {self.list_item_id} "
+                f"at {self.created_at}")
+
+
+class ListAccess(models.Model):
+    """
+    Denormalized index of every list a user can access, either as its owner or because
+    the list is shared with them through a GroupList. Rows are maintained by
+    `lista.access` whenever a list is created or a share is added, changed or removed,
+    so "all lists I own or that are shared with me" is a single range scan on
+    (user, list_item) that already carries the effective permission.
+
+    Attributes:
+        ROLE_CHOICES (list of tuples): The owner role plus the GroupList roles.
+        user (ForeignKey): A reference to the User who can access the list.
+        list_item (ForeignKey): A reference to the accessible ListItem.
+        permission_type (str): The effective permission (read-only or full access).
+        role (str): 'owner' for the list owner, otherwise the GroupList role.
+    """
+    OWNER_ROLE = 'owner'
+    ROLE_CHOICES = [(OWNER_ROLE, 'Owner')] + GroupList.ROLE_CHOICES
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='list_access')
+    list_item = models.ForeignKey(
+        ListItem, on_delete=models.CASCADE, related_name='access_entries')
+    permission_type = models.CharField(max_length=20, choices=GroupList.PERMISSION_CHOICES)
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+
+    class Meta:
+        """
+        Meta class defining the unique (user, list_item) pair, whose index serves the
+        per-user range scan.
+        """
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'list_item'], name='listaccess_user_item_uniq'),
+        ]
+
+    def __str__(self):
+        """
+        Returns a string representation of the ListAccess showing the user ID, list item ID,
+        role, and permission type.
+
+        Returns:
+            str: A formatted string showing user ID, list item ID, role, and permission type.
+        """
+        return (f"User ID: {self.user_id} - List Item ID: {self.list_item_id} - "
+                f"{self.role} - {self.permission_type}")
+
+
+class BatchRequest(models.Model):
+    """
+    Idempotency record of a /batch/ request (see `lista.batch`). It is written in the
+    transaction that applies the batch, so it exists exactly when the batch was
+    committed, and a retry with the same key gets the stored response instead of
+    applying the operations again.
+
+    Attributes:
+        user (ForeignKey): The User who sent the batch; keys are unique per user.
+        idempotency_key (str): The client's Idempotency-Key header.
+        fingerprint (str): SHA-256 of the operations, to reject a key reused for
+            another batch.
+        status_code (int): The HTTP status of the stored response.
+        response (dict): The stored response body.
+        created_at (DateTimeField): When the batch was committed; records expire after
+            BATCH_IDEMPOTENCY_TTL seconds.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='batch_requests')
+    idempotency_key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(default=200)
+    response = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        """
+        Meta class defining the unique (user, idempotency_key) pair, which also makes
+        concurrent retries of the same batch wait for, then fail on, the first one.
+        """
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'idempotency_key'],
+                                    name='batchrequest_user_key_uniq'),
+        ]
+
+    def __str__(self):
+        """
+        Returns a string representation of the BatchRequest showing the user ID and key.
+
+        Returns:
+            str: A formatted string showing user ID, idempotency key and creation time.
+        """
+        return (f"User ID: {self.user_id} - Batch {self.idempotency_key} "
                 f"at {self.created_at}")
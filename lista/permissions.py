@@ -0,0 +1,239 @@
+"""
+Permission resolution for lists and everything attached to them.
+
+A user's effective permissions (owner, shared read-only, shared full access) are
+stored in the denormalized ListAccess table. `PermissionResolver` loads all of them
+for a user with one indexed query and keeps them:
+- per request: one resolver per user is memoized on the request object, so several
+  checks during the same request never hit the database or cache twice;
+- across requests: in Django's cache, in the 'list-perms' `CacheNamespace` scoped by
+  user. `invalidate_permissions` moves the user to a new version after the
+  transaction that changed the access rows commits, so stale entries are never read
+  again and simply expire. Concurrent misses for a user load the rows once.
+  The invalidation must reach every worker, so this is only done when the shared
+  cache is remote (CACHE_URL set to Redis or files). With a per-process cache, a
+  revoked share would keep working in the other workers until the entry expires;
+  permissions are then read from ListAccess on every request.
+
+`HasListPermission` is the DRF permission class used by the list, group and image
+viewsets: reading requires any access to the list, writing requires full access.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.permissions import SAFE_METHODS, BasePermission
+
+from myproj.caches import SHARED_ALIAS, is_remote
+
+from .caching import CacheNamespace
+from .models import GroupList, ListAccess, ListItem
+
+FULL_ACCESS = 'full_access'
+
+_namespace = CacheNamespace('list-perms')
+
+
+def _bump_versions(user_ids):
+    """
+    Moves the given users to a new permissions version.
+    """
+    for user_id in user_ids:
+        _namespace.invalidate(scope=user_id)
+
+
+def _cache_shared_by_workers():
+    """
+    Tells whether cached permissions are invalidated in every worker, i.e. whether
+    the shared cache is remote.
+    """
+    return is_remote(settings.CACHES.get(SHARED_ALIAS, {}))
+
+
+def invalidate_permissions(user_ids):
+    """
+    Invalidates the cached permissions of the given users once the current
+    transaction commits (immediately when no transaction is active).
+
+    Args:
+        user_ids (iterable): The IDs of the users whose access rows changed.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if user_ids:
+        transaction.on_commit(lambda: _bump_versions(user_ids))
+
+
+class PermissionResolver:
+    """
+    Resolves the effective permissions of one user on lists.
+
+    Attributes:
+        user_id (int): The ID of the user whose permissions are resolved.
+        use_cache (bool): False to always read ListAccess, e.g. inside a transaction
+            whose own access changes are only invalidated in the cache on commit.
+            The cache is never used when the shared cache isn't remote.
+    """
+
+    def __init__(self, user_id, use_cache=True):
+        self.user_id = int(user_id)
+        self.use_cache = use_cache
+        self._permissions = None
+
+    def _load(self):
+        """
+        Returns {list_item_id: (permission_type, role)} for every accessible list,
+        from the cache or with one query on ListAccess.
+        """
+        if self._permissions is not None:
+            return self._permissions
+
+        def load_rows():
+            return {
+                list_item_id: (permission_type, role)
+                for list_item_id, permission_type, role in ListAccess.objects.filter(
+                    user_id=self.user_id
+                ).values_list('list_item_id', 'permission_type', 'role')
+            }
+
+        if not (self.use_cache and _cache_shared_by_workers()):
+            self._permissions = load_rows()
+            return self._permissions
+        self._permissions = _namespace.get_or_compute(
+            ('all',), load_rows, settings.PERMISSION_CACHE_TIMEOUT, scope=self.user_id)
+        return self._permissions
+
+    def permissions_for(self, list_item_ids):
+        """
+        Returns the permissions of the user on a set of lists.
+
+        Args:
+            list_item_ids (iterable): The IDs of the lists.
+
+        Returns:
+            dict: {list_item_id: (permission_type, role)} for the accessible lists only.
+        """
+        permissions = self._load()
+        return {
+            int(list_item_id): permissions[int(list_item_id)]
+            for list_item_id in list_item_ids if int(list_item_id) in permissions
+        }
+
+    def permission_type(self, list_item_id):
+        """
+        Returns the permission type of the user on a list, or None without access.
+        """
+        entry = self._load().get(int(list_item_id))
+        return entry[0] if entry else None
+
+    def role(self, list_item_id):
+        """
+        Returns the role of the user on a list ('owner', 'admin', 'member'), or None.
+        """
+        entry = self._load().get(int(list_item_id))
+        return entry[1] if entry else None
+
+    def can_read(self, list_item_id):
+        """
+        Checks whether the user can read a list.
+        """
+        return self.permission_type(list_item_id) is not None
+
+    def can_write(self, list_item_id):
+        """
+        Checks whether the user can modify a list and what belongs to it.
+        """
+        return self.permission_type(list_item_id) == FULL_ACCESS
+
+
+def get_permission_resolver(request, user_id=None):
+    """
+    Returns the resolver of a user memoized on the request.
+
+    Requests with a false `permission_cache` attribute (the operations of a batch, see
+    `lista.batch`) get resolvers that bypass the cache.
+
+    Args:
+        request (Request): The current request.
+        user_id (int, optional): The user to resolve. Defaults to the logged-in user.
+
+    Returns:
+        PermissionResolver: The resolver, shared by every check of this request.
+    """
+    user_id = int(user_id if user_id is not None else request.user.id)
+    # DRF requests proxy attribute reads to the Django request, so store it there.
+    http_request = getattr(request, '_request', request)
+    resolvers = getattr(http_request, 'permission_resolvers', None)
+    if resolvers is None:
+        resolvers = {}
+        http_request.permission_resolvers = resolvers
+    if user_id not in resolvers:
+        resolvers[user_id] = PermissionResolver(
+            user_id, use_cache=getattr(http_request, 'permission_cache', True))
+    return resolvers[user_id]
+
+
+def _list_item_id_of(obj):
+    """
+    Returns the ID of the list an object belongs to.
+    """
+    if isinstance(obj, ListItem):
+        return obj.id
+    if isinstance(obj, GroupList) or hasattr(obj, 'list_item_id'):
+        return obj.list_item_id
+    return None
+
+
+class HasListPermission(BasePermission):
+    """
+    Allows access to list, group and image endpoints based on the user's effective
+    permission on the list involved.
+
+    Safe methods require any access to the list, other methods require full access.
+    The list is taken from the request for actions listed in the view's
+    `list_item_lookups`, a dict of {action name: (source, key)} where source is 'data',
+    'query' or 'kwargs', and from the object for the other detail routes (which must
+    call `get_object`). Actions mapped to None involve no single list and only require
+    authentication; they must scope what they return to the user themselves (e.g. the
+    `list` querysets through ListAccess). Any other action is denied, and so is a
+    request whose list ID is missing or malformed.
+    """
+    message = "You do not have permission to access this list."
+
+    def _allowed(self, request, list_item_id):
+        resolver = get_permission_resolver(request)
+        if request.method in SAFE_METHODS:
+            return resolver.can_read(list_item_id)
+        return resolver.can_write(list_item_id)
+
+    def has_permission(self, request, view):
+        if not (request.user and request.user.is_authenticated):
+            return False
+
+        lookups = getattr(view, 'list_item_lookups', {})
+        action = getattr(view, 'action', None)
+        if action not in lookups:
+            # Detail routes are checked on their object by `get_object`.
+            return bool(getattr(view, 'detail', False))
+        lookup = lookups[action]
+        if lookup is None:
+            return True
+
+        source, key = lookup
+        if source == 'kwargs':
+            list_item_id = view.kwargs.get(key)
+        elif source == 'query':
+            list_item_id = request.query_params.get(key)
+        else:
+            data = request.data
+            list_item_id = data.get(key) if hasattr(data, 'get') else None
+
+        try:
+            list_item_id = int(list_item_id)
+        except (TypeError, ValueError):
+            return False
+        return self._allowed(request, list_item_id)
+
+    def has_object_permission(self, request, view, obj):
+        list_item_id = _list_item_id_of(obj)
+        if list_item_id is None:
+            return True
+        return self._allowed(request, list_item_id)
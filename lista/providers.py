@@ -0,0 +1,77 @@
+"""
+Lazily loaded clients of the third-party services used by the views.
+
+The OpenAI and SendGrid SDKs are only needed by the recommendations endpoint and
+the password reset email, but importing them takes a large share of a worker's
+start-up time (the openai package alone imports hundreds of modules). They are
+therefore imported on first use, here, instead of when the views are loaded;
+`python manage.py check_import_time` fails if they are imported at start-up again.
+
+Functions:
+- get_openai: Returns the configured `openai` module.
+- send_email: Sends a plain-text email through SendGrid.
+"""
+
+import threading
+
+from django.conf import settings
+
+_lock = threading.Lock()
+_sendgrid_client = None
+
+
+def get_openai():
+    """
+    Imports the OpenAI SDK on first use and configures it with OPENAI_API_KEY.
+
+    Returns:
+        module: The `openai` module, ready for module-level calls such as
+        `openai.completions.create(...)`. Its errors derive from `openai.OpenAIError`.
+    """
+    import openai  # pylint: disable=import-outside-toplevel
+
+    if openai.api_key != settings.OPENAI_API_KEY:
+        openai.api_key = settings.OPENAI_API_KEY
+    return openai
+
+
+def _get_sendgrid_client():
+    """
+    Creates the SendGrid client of this process on first use.
+    """
+    global _sendgrid_client  # pylint: disable=global-statement
+    if _sendgrid_client is None:
+        with _lock:
+            if _sendgrid_client is None:
+                from sendgrid import SendGridAPIClient  # pylint: disable=import-outside-toplevel
+
+                _sendgrid_client = SendGridAPIClient(api_key=settings.SENDGRID_API_KEY)
+    return _sendgrid_client
+
+
+def send_email(to_address, subject, text):
+    """
+    Sends a plain-text email from DEFAULT_FROM_EMAIL through SendGrid.
+
+    Args:
+        to_address (str): The recipient's email address.
+        subject (str): The subject line.
+        text (str): The plain-text body.
+
+    Returns:
+        int: The HTTP status code of SendGrid's response.
+
+    Raises:
+        Exception: Any error of the SendGrid client (network, authentication...).
+    """
+    # pylint: disable=import-outside-toplevel
+    from sendgrid.helpers.mail import Content, Email, Mail
+
+    mail = Mail(
+        from_email=Email(settings.DEFAULT_FROM_EMAIL),
+        to_email=Email(to_address),
+        subject=subject,
+        content=Content("text/plain", text),
+    )
+    response = _get_sendgrid_client().client.mail.send.post(request_body=mail.get())
+    return response.status_code
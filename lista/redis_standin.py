@@ -0,0 +1,406 @@
+"""
+A Redis-compatible stand-in for local runs and tests.
+
+It speaks the Redis protocol (RESP2) over TCP and implements the commands used by
+Django's Redis cache backend and by redis-py when it connects, with the same replies
+and expiry semantics as Redis, so the project can run with CACHE_URL=redis://...
+without a Redis server. Data lives in the memory of the process serving it; there is
+no persistence, eviction or replication. Use a real Redis in production.
+
+    python manage.py run_redis_standin --port 6379
+    CACHE_URL=redis://127.0.0.1:6379/0 python manage.py runserver
+
+In tests or benchmarks it can run in a background thread of the current process:
+
+    standin = RedisStandin()
+    url = standin.start()  # 'redis://127.0.0.1:<free port>/0'
+    ...
+    standin.stop()
+
+Supported commands: PING, ECHO, SELECT, CLIENT, INFO, QUIT, GET, SET (EX, PX, NX, XX,
+KEEPTTL, GET), SETEX, MGET, MSET, DEL, UNLINK, EXISTS, INCR, INCRBY, DECR, DECRBY,
+EXPIRE, PEXPIRE, PERSIST, TTL, PTTL, KEYS, DBSIZE, FLUSHDB, FLUSHALL, MULTI, EXEC,
+DISCARD.
+"""
+
+import fnmatch
+import socketserver
+import threading
+import time
+
+
+class ReplyError(Exception):
+    """
+    An error reply ('-ERR ...') to a command.
+    """
+
+
+class _Database:
+    """
+    The keys of one logical database, with their expiry (monotonic time or None).
+    """
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.entries[key]
+            return None
+        return entry
+
+    def live_keys(self):
+        return [key for key in list(self.entries) if self.get(key) is not None]
+
+
+def _integer(value, error="value is not an integer or out of range"):
+    try:
+        return int(value)
+    except (TypeError, ValueError) as exc:
+        raise ReplyError(error) from exc
+
+
+class RedisStandin:
+    """
+    The stand-in's data and command implementations, shared by its connections.
+
+    Attributes:
+        server (socketserver.ThreadingTCPServer): The server, once started.
+    """
+    databases_count = 16
+
+    def __init__(self):
+        self.databases = [_Database() for _ in range(self.databases_count)]
+        self.lock = threading.Lock()
+        self.server = None
+        self._thread = None
+
+    def make_server(self, host='127.0.0.1', port=6379):
+        """
+        Creates the TCP server; port 0 picks a free port.
+        """
+        standin = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                _Connection(standin, self.rfile, self.wfile).serve()
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        server = socketserver.ThreadingTCPServer((host, port), Handler)
+        server.daemon_threads = True
+        self.server = server
+        return server
+
+    def start(self, host='127.0.0.1', port=0):
+        """
+        Serves in a background thread.
+
+        Returns:
+            str: The redis:// URL of database 0.
+        """
+        server = self.make_server(host, port)
+        self._thread = threading.Thread(target=server.serve_forever, daemon=True,
+                                        name='redis-standin')
+        self._thread.start()
+        host, port = server.server_address[:2]
+        return f'redis://{host}:{port}/0'
+
+    def stop(self):
+        """
+        Stops a server started with `start`.
+        """
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def execute(self, db_index, name, args):
+        """
+        Runs one data command on a database.
+
+        Returns:
+            The reply: None (nil), bytes (bulk), int, str (status), list or ReplyError.
+        """
+        method = getattr(self, f'cmd_{name}', None)
+        if method is None:
+            raise ReplyError(f"unknown command '{name}'")
+        with self.lock:
+            return method(self.databases[db_index], *args)
+
+    @staticmethod
+    def _arity(args, minimum, maximum=None):
+        if len(args) < minimum or (maximum is not None and len(args) > maximum):
+            raise ReplyError("wrong number of arguments")
+
+    def cmd_get(self, db, *args):
+        self._arity(args, 1, 1)
+        entry = db.get(args[0])
+        return None if entry is None else entry[0]
+
+    def cmd_mget(self, db, *args):
+        self._arity(args, 1)
+        return [self.cmd_get(db, key) for key in args]
+
+    def cmd_set(self, db, *args):
+        self._arity(args, 2)
+        key, value, options = args[0], args[1], [arg.upper() for arg in args[2:]]
+        expires_at = None
+        nx = xx = keepttl = get = False
+        index = 0
+        while index < len(options):
+            option = options[index]
+            if option in (b'EX', b'PX'):
+                if index + 1 >= len(options):
+                    raise ReplyError("syntax error")
+                amount = _integer(args[2 + index + 1])
+                if amount <= 0:
+                    raise ReplyError("invalid expire time in 'set' command")
+                seconds = amount if option == b'EX' else amount / 1000
+                expires_at = time.monotonic() + seconds
+                index += 1
+            elif option == b'NX':
+                nx = True
+            elif option == b'XX':
+                xx = True
+            elif option == b'KEEPTTL':
+                keepttl = True
+            elif option == b'GET':
+                get = True
+            else:
+                raise ReplyError("syntax error")
+            index += 1
+
+        current = db.get(key)
+        previous = None if current is None else current[0]
+        if (nx and current is not None) or (xx and current is None):
+            return previous if get else None
+        if keepttl and current is not None:
+            expires_at = current[1]
+        db.entries[key] = (value, expires_at)
+        return previous if get else 'OK'
+
+    def cmd_setex(self, db, *args):
+        self._arity(args, 3, 3)
+        return self.cmd_set(db, args[0], args[2], b'EX', args[1])
+
+    def cmd_mset(self, db, *args):
+        if not args or len(args) % 2:
+            raise ReplyError("wrong number of arguments for 'mset' command")
+        for index in range(0, len(args), 2):
+            db.entries[args[index]] = (args[index + 1], None)
+        return 'OK'
+
+    def cmd_del(self, db, *args):
+        self._arity(args, 1)
+        deleted = 0
+        for key in args:
+            if db.get(key) is not None:
+                del db.entries[key]
+                deleted += 1
+        return deleted
+
+    cmd_unlink = cmd_del
+
+    def cmd_exists(self, db, *args):
+        self._arity(args, 1)
+        return sum(1 for key in args if db.get(key) is not None)
+
+    def cmd_incrby(self, db, *args):
+        self._arity(args, 2, 2)
+        key, delta = args[0], _integer(args[1])
+        entry = db.get(key)
+        value, expires_at = (b'0', None) if entry is None else entry
+        value = _integer(value) + delta
+        db.entries[key] = (str(value).encode(), expires_at)
+        return value
+
+    def cmd_incr(self, db, *args):
+        self._arity(args, 1, 1)
+        return self.cmd_incrby(db, args[0], b'1')
+
+    def cmd_decrby(self, db, *args):
+        self._arity(args, 2, 2)
+        return self.cmd_incrby(db, args[0], str(-_integer(args[1])).encode())
+
+    def cmd_decr(self, db, *args):
+        self._arity(args, 1, 1)
+        return self.cmd_incrby(db, args[0], b'-1')
+
+    def _expire(self, db, key, seconds):
+        entry = db.get(key)
+        if entry is None:
+            return 0
+        if seconds <= 0:
+            del db.entries[key]
+        else:
+            db.entries[key] = (entry[0], time.monotonic() + seconds)
+        return 1
+
+    def cmd_expire(self, db, *args):
+        self._arity(args, 2, 2)
+        return self._expire(db, args[0], _integer(args[1]))
+
+    def cmd_pexpire(self, db, *args):
+        self._arity(args, 2, 2)
+        return self._expire(db, args[0], _integer(args[1]) / 1000)
+
+    def cmd_persist(self, db, *args):
+        self._arity(args, 1, 1)
+        entry = db.get(args[0])
+        if entry is None or entry[1] is None:
+            return 0
+        db.entries[args[0]] = (entry[0], None)
+        return 1
+
+    def _remaining(self, db, key, scale):
+        entry = db.get(key)
+        if entry is None:
+            return -2
+        if entry[1] is None:
+            return -1
+        return round((entry[1] - time.monotonic()) * scale)
+
+    def cmd_ttl(self, db, *args):
+        self._arity(args, 1, 1)
+        return self._remaining(db, args[0], 1)
+
+    def cmd_pttl(self, db, *args):
+        self._arity(args, 1, 1)
+        return self._remaining(db, args[0], 1000)
+
+    def cmd_keys(self, db, *args):
+        self._arity(args, 1, 1)
+        pattern = args[0].decode('latin-1')
+        return [key for key in db.live_keys() if fnmatch.fnmatchcase(key.decode('latin-1'), pattern)]
+
+    def cmd_dbsize(self, db, *args):
+        self._arity(args, 0, 0)
+        return len(db.live_keys())
+
+    def cmd_flushdb(self, db, *args):
+        db.entries.clear()
+        return 'OK'
+
+    def cmd_flushall(self, db, *args):
+        for database in self.databases:
+            database.entries.clear()
+        return 'OK'
+
+
+class _Connection:
+    """
+    One client connection: parses requests, keeps the selected database and the
+    queued commands of a MULTI block, and writes the replies.
+    """
+
+    def __init__(self, standin, rfile, wfile):
+        self.standin = standin
+        self.rfile = rfile
+        self.wfile = wfile
+        self.db_index = 0
+        self.queued = None
+
+    def serve(self):
+        while True:
+            try:
+                request = self.read_request()
+            except (ConnectionError, ValueError):
+                return
+            if request is None:
+                return
+            if not request:
+                continue
+            name, args = request[0].decode('latin-1').lower(), request[1:]
+            try:
+                reply = self.dispatch(name, args)
+            except ReplyError as error:
+                reply = error
+            self.wfile.write(self.encode(reply))
+            self.wfile.flush()
+            if name == 'quit':
+                return
+
+    def read_request(self):
+        """
+        Returns the next command as a list of bytes, or None when the client is gone.
+        """
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b'*'):
+            # Inline command, e.g. typed in telnet.
+            return line.split()
+        arguments = []
+        for _ in range(int(line[1:])):
+            header = self.rfile.readline()
+            if not header.startswith(b'$'):
+                raise ValueError("expected a bulk string")
+            length = int(header[1:])
+            data = self.rfile.read(length + 2)
+            if len(data) < length + 2:
+                return None
+            arguments.append(data[:length])
+        return arguments
+
+    def dispatch(self, name, args):
+        if name == 'multi':
+            if self.queued is not None:
+                raise ReplyError("MULTI calls can not be nested")
+            self.queued = []
+            return 'OK'
+        if name == 'exec':
+            if self.queued is None:
+                raise ReplyError("EXEC without MULTI")
+            queued, self.queued = self.queued, None
+            replies = []
+            for queued_name, queued_args in queued:
+                try:
+                    replies.append(self.run(queued_name, queued_args))
+                except ReplyError as error:
+                    replies.append(error)
+            return replies
+        if name == 'discard':
+            if self.queued is None:
+                raise ReplyError("DISCARD without MULTI")
+            self.queued = None
+            return 'OK'
+        if self.queued is not None:
+            self.queued.append((name, args))
+            return 'QUEUED'
+        return self.run(name, args)
+
+    def run(self, name, args):
+        if name == 'ping':
+            return args[0] if args else 'PONG'
+        if name == 'echo':
+            return args[0]
+        if name == 'select':
+            index = _integer(args[0] if args else None)
+            if not 0 <= index < self.standin.databases_count:
+                raise ReplyError("DB index is out of range")
+            self.db_index = index
+            return 'OK'
+        if name in ('client', 'quit'):
+            return 'OK'
+        if name == 'info':
+            return b'# Server\r\nredis_version:7.0.0\r\nredis_mode:standalone\r\n'
+        return self.standin.execute(self.db_index, name, args)
+
+    def encode(self, reply):
+        if reply is None:
+            return b'$-1\r\n'
+        if isinstance(reply, ReplyError):
+            return f'-ERR {reply}\r\n'.encode()
+        if isinstance(reply, bool):
+            reply = int(reply)
+        if isinstance(reply, int):
+            return b':%d\r\n' % reply
+        if isinstance(reply, str):
+            return f'+{reply}\r\n'.encode()
+        if isinstance(reply, bytes):
+            return b'$%d\r\n%s\r\n' % (len(reply), reply)
+        return b'*%d\r\n' % len(reply) + b''.join(self.encode(item) for item in reply)
@@ -0,0 +1,134 @@
+"""
+Renderers and parsers for the REST API: fast JSON based on orjson, and MessagePack.
+
+They produce and accept the same JSON as DRF's `JSONRenderer` and `JSONParser`, but
+encode and decode in C, which matters for large list and group payloads. They are
+enabled with FAST_JSON=true (see REST_FRAMEWORK in `myproj/settings.py`).
+
+Types orjson doesn't handle natively are passed to DRF's `JSONEncoder`, so they are
+rendered exactly as before:
+- datetimes and times (DRF's ISO 8601 format, with 'Z' for UTC),
+- Decimals (string or float depending on COERCE_DECIMAL_TO_STRING),
+- lazy translation strings, timedeltas, querysets and other iterables.
+Dates, UUIDs and dataclasses are encoded natively in the same format.
+
+Pretty-printed responses (`Accept: application/json; indent=4` and the browsable
+API) are rare and delegated to DRF's renderer, which supports any indent.
+
+MessagePack is returned to clients that send `Accept: application/msgpack` (the
+mobile app uses it for list syncs) and accepted as a request body with that
+Content-Type. The encoded data has exactly the structure of the JSON responses:
+the same serializers run, and dates, Decimals and other non-native values become
+the same strings (or numbers) as in JSON, so clients can share one schema.
+
+Classes:
+- ORJSONRenderer: Drop-in replacement for `rest_framework.renderers.JSONRenderer`.
+- ORJSONParser: Drop-in replacement for `rest_framework.parsers.JSONParser`.
+- MessagePackRenderer: Renders responses as MessagePack.
+- MessagePackParser: Parses MessagePack request bodies.
+"""
+
+import codecs
+
+import msgpack
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+_fallback_encoder = encoders.JSONEncoder()
+
+
+def _default(obj):
+    """
+    Encodes the values orjson passes through, the way DRF's JSONEncoder does.
+    """
+    return _fallback_encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Renders data to JSON with orjson, falling back to DRF's renderer for indented output.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Renders `data` into JSON, returning a bytestring.
+        """
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_default, option=_OPTIONS)
+
+        # Like DRF, escape U+2028 and U+2029 so the output is a strict JavaScript subset.
+        if b'\xe2\x80' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    """
+    Parses JSON request bodies with orjson. NaN and Infinity are rejected, as with
+    DRF's parser in strict mode.
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Parses the incoming bytestream as JSON and returns the resulting data.
+        """
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        try:
+            content = stream.read() if stream is not None else b''
+            if codecs.lookup(encoding).name != 'utf-8':
+                content = content.decode(encoding)
+            return orjson.loads(content)
+        except (ValueError, LookupError) as exc:
+            raise ParseError(f'JSON parse error - {exc}') from exc
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders data as MessagePack, with values encoded as in the JSON responses.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Renders `data` into MessagePack, returning a bytestring.
+        """
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parses MessagePack request bodies. Map keys must be strings, as in JSON.
+    """
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Parses the incoming bytestream as MessagePack and returns the resulting data.
+        """
+        try:
+            content = stream.read() if stream is not None else b''
+            return msgpack.unpackb(content, raw=False)
+        except (ValueError, TypeError, msgpack.UnpackException) as exc:
+            raise ParseError(
+                f'MessagePack parse error - {str(exc) or type(exc).__name__}') from exc
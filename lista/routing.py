@@ -0,0 +1,100 @@
+"""
+URL patterns whose views are imported on first use.
+
+Django imports every view of a URLconf when the URLconf is loaded. With these helpers
+`lista.urls` names views by dotted path instead, and a view module is imported only
+when a request for one of its URLs is resolved:
+- lazy_include: routes a URL prefix to the `urlpatterns` of a module (e.g. a module
+  with a router), imported the first time a URL under the prefix is resolved;
+- lazy_view: a single URL whose view (function or class-based) is imported on its
+  first request.
+
+Resolving a URL only visits the patterns before the match, and those whose prefix
+doesn't match the path are never imported. Reversing a URL (`reverse`, the API root)
+or running the system checks loads every pattern, which imports all the modules.
+`load_all` does that on purpose, e.g. in a preloading server master before forking.
+"""
+
+from functools import cached_property
+from importlib import import_module
+
+from django.urls import URLResolver, get_resolver, path
+from django.urls.resolvers import RoutePattern
+from django.utils.module_loading import import_string
+
+
+class LazyURLResolver(URLResolver):
+    """
+    A URL prefix whose patterns are the `urlpatterns` of a module imported on first use.
+    """
+
+    def __init__(self, prefix, module_path):
+        super().__init__(RoutePattern(prefix, is_endpoint=False), module_path)
+
+    @cached_property
+    def urlconf_module(self):
+        return import_module(self.urlconf_name)
+
+
+def lazy_include(prefix, module_path):
+    """
+    Routes URLs under `prefix` to the `urlpatterns` of `module_path`, importing it lazily.
+
+    Args:
+        prefix (str): The route prefix, e.g. 'listitemimages/'.
+        module_path (str): The dotted path of the module, e.g. 'lista.views.images'.
+
+    Returns:
+        LazyURLResolver: The pattern to add to `urlpatterns`.
+    """
+    return LazyURLResolver(prefix, module_path)
+
+
+def lazy_view(route, view_path, name=None, **initkwargs):
+    """
+    Routes `route` to the view at `view_path`, importing it on the first request.
+
+    Args:
+        route (str): The route, as for `django.urls.path`.
+        view_path (str): The dotted path of a view function or of a class-based view,
+            e.g. 'lista.views.auth.register'.
+        name (str, optional): The URL name.
+        **initkwargs: Passed to `as_view()` for class-based views (e.g. `actions` for
+            a viewset).
+
+    Returns:
+        URLPattern: The pattern to add to `urlpatterns`.
+    """
+    resolved = []
+
+    def load():
+        if not resolved:
+            target = import_string(view_path)
+            resolved.append(target.as_view(**initkwargs) if isinstance(target, type) else target)
+        return resolved[0]
+
+    def view(request, *args, **kwargs):
+        return load()(request, *args, **kwargs)
+
+    # Only DRF views are routed lazily and they are all CSRF exempt (DRF enforces CSRF
+    # itself for session authentication); the middleware checks before the import.
+    view.csrf_exempt = True
+    view.__name__ = view_path.rsplit('.', 1)[-1]
+    view.__qualname__ = view.__name__
+    view.__module__ = view_path.rsplit('.', 1)[0]
+    view.load = load
+    return path(route, view, name=name)
+
+
+def load_all():
+    """
+    Imports every lazily routed view module of the root URLconf.
+    """
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns)
+            elif hasattr(pattern.callback, 'load'):
+                pattern.callback.load()
+
+    walk(get_resolver().url_patterns)
@@ -11,6 +11,8 @@ Models Handled:
 4. ListItemImage: Serializes a model that stores images associated with ListItem objects.
 5. Customization: Serializes a model representing user-specific customizations or preferences.
 6. Recommendation: Serializes a model for storing recommendations associated with ListItem objects.
+7. ListItemReadSerializer / GroupListReadSerializer: Read-only serializers for list endpoints
+   that build the same JSON as the model serializers directly from `values_list()` rows.
 
 Key Features:
 - Each serializer maps model fields to their respective JSON representations.
@@ -20,6 +22,10 @@ Key Features:
   shared a particular list.
 - The extra_kwargs attribute is used in the ListItemSerializer to define custom requirements for 
   fields, like making the user field required and images optional.
+- The read serializers skip model instantiation and DRF field machinery: the columns to fetch
+  and the per-column converters are computed once per class, so each row costs a tuple fetch
+  and a dict build. They are used by read-heavy endpoints (`listitem/by-user`,
+  `listitem/accessible`, `grouplists/by-user`) and must stay in step with the model serializers.
 
 Purpose:
 The serializers are part of the API infrastructure and ensure that the application’s models can 
@@ -28,6 +34,7 @@ accessible for web or mobile interfaces.
 """
 
 from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 from .models import (Customization, GroupList, ListItem, ListItemImage, Recommendation)
 
@@ -71,6 +78,29 @@ class ListItemSerializer(serializers.ModelSerializer):
         }
 
 
+def _keep_list_item(serializer, list_item):
+    """
+    Rejects moving an existing row to another list.
+
+    Access is checked against the list a row belongs to, so letting an update change
+    `list_item` would move a share or an image into a list the user has no access to.
+
+    Parameters:
+    - serializer: The serializer validating the request.
+    - list_item: The ListItem requested.
+
+    Returns:
+    - list_item: The ListItem, when the row is being created or keeps its list.
+
+    Raises:
+    - ValidationError: If an update changes the list of the row.
+    """
+    instance = serializer.instance
+    if instance is not None and list_item.id != instance.list_item_id:
+        raise serializers.ValidationError("The list cannot be changed once set.")
+    return list_item
+
+
 class GroupListSerializer(serializers.ModelSerializer):
     """
     Serializer for the GroupList model, used to convert GroupList instances into JSON format.
@@ -83,6 +113,7 @@ class GroupListSerializer(serializers.ModelSerializer):
 
     Methods:
     - get_shared_by_user_id: Retrieves the ID of the user who shared the list item.
+    - validate_list_item: Keeps the list of an existing share.
     - validate: Ensures that the 'user' field is included in the request.
     """
     user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
@@ -102,16 +133,24 @@ class GroupListSerializer(serializers.ModelSerializer):
         If the list item is shared with the user, the user's ID is returned.
         Otherwise, None is returned.
 
+        The GroupList being serialized is itself the share of its list item with its
+        user, so the value is read from the row's own `user_id` column. This keeps the
+        serializer free of per-row queries (it used to look the share up again through
+        `list_item.shared_with` and then load its user, ~3 queries per row).
+
         Parameters:
         - obj: The GroupList instance for which to fetch the shared_by_user_id.
 
         Returns:
         - The user ID of the user who shared the list, or None if not shared.
         """
-        shared_with = obj.list_item.shared_with.filter(user=obj.user).first()
-        if shared_with:
-            return shared_with.user.id
-        return None
+        return obj.user_id
+
+    def validate_list_item(self, value):
+        """
+        Rejects an update that moves the share to another list.
+        """
+        return _keep_list_item(self, value)
 
     def validate(self, attrs):
         """
@@ -140,7 +179,7 @@ class ListItemImageSerializer(serializers.ModelSerializer):
 
     Fields:
     - image: The image associated with a ListItem object.
-    - list_item: The related ListItem object.
+    - list_item: The related ListItem object, fixed once the image is created.
     """
     class Meta:
         """
@@ -149,6 +188,12 @@ class ListItemImageSerializer(serializers.ModelSerializer):
         model = ListItemImage
         fields = '__all__'
 
+    def validate_list_item(self, value):
+        """
+        Rejects an update that moves the image to another list.
+        """
+        return _keep_list_item(self, value)
+
 
 class CustomizationSerializer(serializers.ModelSerializer):
     """
@@ -182,3 +227,126 @@ class RecommendationSerializer(serializers.ModelSerializer):
         """
         model = Recommendation
         fields = '__all__'
+
+
+class ValuesReadSerializer:
+    """
+    Base class of the read-only serializers that build responses from `values_list()`.
+
+    Subclasses declare `fields`, a sequence of (output key, column) pairs in output order,
+    `date_fields`, the output keys holding dates, and `converters`, {output key: function}
+    for other columns that are not returned as stored. The output matches the
+    corresponding ModelSerializer (or view), so endpoints can switch between them without
+    changing their JSON.
+
+    Usage mirrors DRF serializers for reads: `ListItemReadSerializer(queryset).data`.
+
+    Attributes:
+        queryset (QuerySet): The rows to serialize; only the declared columns are fetched.
+        column_prefix (str): Prefix added to every column, to serialize a related model
+            (e.g. 'list_item__' when the queryset is on ListAccess).
+        extra_fields (tuple): Additional (output key, column) pairs appended to each row,
+            read from the queryset's own model without the prefix.
+    """
+    fields = ()
+    date_fields = ()
+    converters = {}
+
+    def __init__(self, queryset, column_prefix='', extra_fields=()):
+        self.queryset = queryset
+        self.column_prefix = column_prefix
+        self.extra_fields = tuple(extra_fields)
+
+    def _layout(self):
+        """
+        Returns the output keys, the columns to fetch and the converters of each column.
+        """
+        keys = [key for key, _ in self.fields] + [key for key, _ in self.extra_fields]
+        columns = ([self.column_prefix + column for _, column in self.fields] +
+                   [column for _, column in self.extra_fields])
+        converters = [(position, _date_to_representation if key in self.date_fields
+                       else self.converters[key])
+                      for position, key in enumerate(keys[:len(self.fields)])
+                      if key in self.date_fields or key in self.converters]
+        return tuple(keys), columns, converters
+
+    @property
+    def data(self):
+        """
+        Returns the serialized rows as a list of dicts.
+        """
+        keys, columns, converters = self._layout()
+        rows = self.queryset.values_list(*columns)
+        if not converters:
+            return [dict(zip(keys, row)) for row in rows]
+
+        data = []
+        for row in rows:
+            row = list(row)
+            for position, convert in converters:
+                row[position] = convert(row[position])
+            data.append(dict(zip(keys, row)))
+        return data
+
+
+def _date_to_representation(value):
+    """
+    Formats a date like DRF's DateField (ISO 8601, None stays None).
+    """
+    return value.isoformat() if value is not None else None
+
+
+class ListItemReadSerializer(ValuesReadSerializer):
+    """
+    Read-only serializer producing the same JSON as ListItemSerializer.
+    """
+    fields = (
+        ('id', 'id'),
+        ('title', 'title'),
+        ('items', 'items'),
+        ('date_created', 'date_created'),
+        ('is_active', 'is_active'),
+        ('user', 'user_id'),
+    )
+    date_fields = ('date_created',)
+
+
+class GroupListReadSerializer(ValuesReadSerializer):
+    """
+    Read-only serializer producing the same JSON as GroupListSerializer, including
+    `shared_by_user_id` (the share's own user, see `get_shared_by_user_id`).
+    """
+    fields = (
+        ('id', 'id'),
+        ('user', 'user_id'),
+        ('list_item', 'list_item_id'),
+        ('shared_by_user_id', 'user_id'),
+        ('date_joined', 'date_joined'),
+        ('role', 'role'),
+        ('permission_type', 'permission_type'),
+    )
+    date_fields = ('date_joined',)
+
+
+def _image_download_url(name):
+    """
+    Returns the download URL of a stored image, from the storage.
+    """
+    return default_storage.url(name)
+
+
+class ListItemImageReadSerializer(ValuesReadSerializer):
+    """
+    Read-only serializer producing the image entries of `get_images_for_list_item`,
+    with the download URL of each image and the metadata stored at upload.
+    """
+    fields = (
+        ('id', 'id'),
+        ('url', 'image'),
+        ('index', 'index'),
+        ('mime_type', 'mime_type'),
+        ('width', 'width'),
+        ('height', 'height'),
+        ('byte_size', 'byte_size'),
+    )
+    converters = {'url': _image_download_url}
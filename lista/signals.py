@@ -0,0 +1,111 @@
+"""
+Model signal handlers of the lista application.
+
+They keep the denormalized ListAccess table in step with ListItem and GroupList, so
+every code path that saves or deletes these models through the ORM (viewsets, admin,
+shell) updates the access rows in the same transaction. Bulk operations that bypass
+signals must call the functions of `lista.access` themselves.
+
+They also drop the cached authentications of a user (see `lista.authentication`)
+when the user changes or one of their tokens is blacklisted, and the cached
+customization of a user (see `lista.customization_cache`) when it is saved or
+deleted outside of `save_customization`.
+"""
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .access import (grant_owner_access, grant_shared_access, revoke_shared_access,
+                     sync_list_access)
+from .authentication import forget_user_tokens
+from .customization_cache import forget_customization
+from .models import Customization, GroupList, ListAccess, ListItem
+from .permissions import invalidate_permissions
+
+
+@receiver(post_save, sender=ListItem)
+def record_list_owner(sender, instance, created, **kwargs):
+    """
+    Records the owner of a new list, and rebuilds the access rows of a list whose
+    owner changed.
+    """
+    if created:
+        grant_owner_access(instance)
+        return
+    owner_recorded = ListAccess.objects.filter(
+        list_item_id=instance.id, user_id=instance.user_id, role=ListAccess.OWNER_ROLE
+    ).exists()
+    if not owner_recorded:
+        sync_list_access([instance.id])
+
+
+@receiver(pre_save, sender=GroupList)
+def remember_previous_share(sender, instance, **kwargs):
+    """
+    Remembers which user and list an existing GroupList pointed to before the update,
+    so the access of the previous pair can be revoked if it changes.
+    """
+    instance._previous_share = None
+    if instance.pk:
+        instance._previous_share = GroupList.objects.filter(
+            pk=instance.pk).values_list('user_id', 'list_item_id').first()
+
+
+@receiver(post_save, sender=GroupList)
+def record_share(sender, instance, **kwargs):
+    """
+    Records the access given by a created or updated GroupList.
+    """
+    previous_share = getattr(instance, '_previous_share', None)
+    if previous_share and previous_share != (instance.user_id, instance.list_item_id):
+        revoke_shared_access(*previous_share)
+    grant_shared_access(instance.user_id, instance.list_item_id,
+                        instance.permission_type, instance.role)
+
+
+@receiver(post_delete, sender=GroupList)
+def remove_share(sender, instance, **kwargs):
+    """
+    Removes the access given by a deleted GroupList.
+    """
+    revoke_shared_access(instance.user_id, instance.list_item_id)
+
+
+@receiver(post_delete, sender=ListAccess)
+def forget_cached_access(sender, instance, **kwargs):
+    """
+    Invalidates cached permissions when access rows disappear through a cascade,
+    e.g. when a list or a user is deleted.
+    """
+    invalidate_permissions([instance.user_id])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    """
+    Drops the cached authentications of a user whose account changed (password,
+    active flag) or was deleted.
+    """
+    forget_user_tokens(instance.pk)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def forget_blacklisted_user(sender, instance, **kwargs):
+    """
+    Drops the cached authentications of a user when one of their tokens is
+    blacklisted (logout, refresh token rotation).
+    """
+    forget_user_tokens(instance.token.user_id)
+
+
+@receiver(post_save, sender=Customization)
+@receiver(post_delete, sender=Customization)
+def forget_cached_customization(sender, instance, **kwargs):
+    """
+    Drops the cached customization of a user whose customization was saved through
+    the ORM (admin, shell) or deleted, including with the user.
+    """
+    forget_customization(instance.user_id)
@@ -0,0 +1,137 @@
+"""
+Storage helpers for list item images.
+
+The image views always go through `default_storage`, which is configured in
+`myproj/settings.py` by the STORAGE_BACKEND environment variable: the local file
+system for development, or an S3-compatible bucket (AWS S3, MinIO, a moto server)
+when several instances share the same media.
+
+On top of the regular Django storage API, S3-compatible backends allow clients to
+upload directly to the bucket through presigned requests, so large photos don't
+have to pass through the application workers. Downloads use `storage.url`, which
+is a presigned URL on those backends (see STORAGES in settings).
+
+Direct uploads are stored under a prefix of the user who requested them
+(`direct_upload_prefix`), so that a user can only register their own uploads.
+
+Functions:
+- supports_presigned_urls: Checks whether a storage can sign direct requests.
+- direct_upload_prefix: Returns the storage prefix of a user's direct uploads.
+- is_direct_upload_key: Checks that a key is one of a user's direct uploads.
+- generate_presigned_upload: Creates a presigned POST for a direct image upload.
+"""
+
+import posixpath
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils.text import get_valid_filename
+
+from .image_processing import IMAGE_UPLOAD_DIR, build_image_file_name
+
+
+class StorageFeatureUnavailable(Exception):
+    """
+    Raised when the configured storage backend does not support an operation,
+    e.g. presigned uploads on the local file system storage.
+    """
+
+
+def supports_presigned_urls(storage=None):
+    """
+    Checks whether the storage is an S3-compatible backend able to sign requests.
+
+    Args:
+        storage (Storage, optional): The storage to check. Defaults to `default_storage`.
+
+    Returns:
+        bool: True if presigned uploads and downloads are available.
+    """
+    storage = storage or default_storage
+    return hasattr(storage, 'bucket') and hasattr(storage, 'connection')
+
+
+def direct_upload_prefix(user_id):
+    """
+    Returns the storage prefix of the direct uploads of a user, e.g.
+    'list_item_images/direct/42/'.
+    """
+    return f"{IMAGE_UPLOAD_DIR}/direct/{int(user_id)}/"
+
+
+def is_direct_upload_key(key, user_id):
+    """
+    Checks that a storage key names a direct upload of the given user: a file right
+    under the user's prefix, without any relative path segments.
+
+    Args:
+        key: The key sent by the client.
+        user_id (int): The ID of the user registering the upload.
+
+    Returns:
+        bool: True if the key was issued to this user by `generate_presigned_upload`.
+    """
+    if not isinstance(key, str):
+        return False
+    prefix = direct_upload_prefix(user_id)
+    name = key[len(prefix):]
+    return (key.startswith(prefix) and bool(name) and '/' not in name
+            and posixpath.normpath(key) == key)
+
+
+def _bucket_key(storage, name):
+    """
+    Returns the object key of a storage name, taking the storage location into account.
+    """
+    location = (getattr(storage, 'location', '') or '').strip('/')
+    return f"{location}/{name}" if location else name
+
+
+def generate_presigned_upload(user_id, file_name, mime_type, image_index, storage=None):
+    """
+    Creates a presigned POST that lets the client upload one image directly to storage.
+
+    The object key is placed under the user's `direct_upload_prefix` and made unique
+    with a random prefix so that no round-trip to the bucket is needed to find a free
+    name. The policy restricts the upload to the given content type and to
+    `settings.PRESIGNED_UPLOAD_MAX_BYTES`.
+
+    Args:
+        user_id (int): The ID of the user uploading the image.
+        file_name (str): The file name sent by the client, may be empty.
+        mime_type (str): The MIME type of the image.
+        image_index (int): The index of the image within the list item.
+        storage (Storage, optional): The storage to upload to. Defaults to
+            `default_storage`.
+
+    Returns:
+        dict: The upload 'url', the form 'fields' to post with the file, and the
+        storage 'key' to confirm once the upload finished.
+
+    Raises:
+        StorageFeatureUnavailable: If the storage does not support presigned uploads.
+    """
+    storage = storage or default_storage
+    if not supports_presigned_urls(storage):
+        raise StorageFeatureUnavailable("Direct uploads require an S3-compatible storage.")
+
+    image_file_name = get_valid_filename(build_image_file_name(file_name, mime_type, image_index))
+    key = f"{direct_upload_prefix(user_id)}{uuid.uuid4().hex}_{image_file_name}"
+
+    presigned_post = storage.connection.meta.client.generate_presigned_post(
+        Bucket=storage.bucket.name,
+        Key=_bucket_key(storage, key),
+        Fields={'Content-Type': mime_type},
+        Conditions=[
+            {'Content-Type': mime_type},
+            ['content-length-range', 1, settings.PRESIGNED_UPLOAD_MAX_BYTES],
+        ],
+        ExpiresIn=storage.querystring_expire,
+    )
+    return {
+        'url': presigned_post['url'],
+        'fields': presigned_post['fields'],
+        'key': key,
+    }
+
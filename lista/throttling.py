@@ -0,0 +1,131 @@
+"""
+Token-bucket throttles for the authentication endpoints.
+
+Login, registration and password reset hash passwords, which is deliberately slow.
+These throttles limit how often a client can call them, with two buckets shared by
+all of those endpoints:
+- AuthIPThrottle: per client IP address, read from X-Forwarded-For only behind the
+  NUM_PROXIES trusted proxies configured in settings;
+- AuthAccountThrottle: per account and client IP address, the account being taken
+  from the 'username' or 'email' in the request body, so one client can't try
+  many passwords of an account within its IP allowance. It is not keyed on the
+  account alone: anyone could then lock a victim out of their account by sending
+  requests for it.
+
+A bucket holds up to `capacity` requests and refills at `capacity` per `period`
+seconds, so clients may burst but not sustain more than the configured rate. Buckets
+are kept in the 'shared' cache, which is seen by every worker (see myproj/caches.py;
+with the default per-process cache each worker has its own buckets). A throttled
+request gets 429 Too Many Requests with a Retry-After header.
+
+NUM_PROXIES must be set behind a proxy (the Procfile sets 1 for the Render/Heroku
+router): with the default 0 every request seems to come from the proxy, so all
+clients share one bucket and a few failed logins lock everyone out. A request with
+X-Forwarded-For while NUM_PROXIES is 0 logs a warning, once per process.
+
+The buckets are configured in AUTH_THROTTLE_BUCKETS, {scope: (capacity, period)}.
+The read-modify-write of a bucket isn't atomic, so concurrent requests may
+occasionally both take the last token; the limit is approximate by design.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from myproj.caches import SHARED_ALIAS
+
+logger = logging.getLogger(__name__)
+
+# Whether this process has already warned about X-Forwarded-For with NUM_PROXIES=0.
+_warned_unset_proxies = False
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Base class of the token-bucket throttles. Subclasses set `scope` and implement
+    `get_ident_key`.
+    """
+    scope = None
+
+    def __init__(self):
+        self._wait = None
+
+    def get_ident_key(self, request, view):
+        """
+        Returns what the bucket is keyed on, or None to not throttle the request.
+        """
+        raise NotImplementedError
+
+    def client_ip(self, request):
+        """
+        Returns the client IP address of the request, warning once when it seems to
+        come through a proxy NUM_PROXIES doesn't account for.
+        """
+        global _warned_unset_proxies  # pylint: disable=global-statement
+        if (not _warned_unset_proxies and 'HTTP_X_FORWARDED_FOR' in request.META
+                and not api_settings.NUM_PROXIES):
+            _warned_unset_proxies = True
+            logger.warning(
+                "Authentication throttles: X-Forwarded-For received but NUM_PROXIES "
+                "is 0, so clients are throttled as the proxy's address %s. Set "
+                "NUM_PROXIES to the number of proxies in front of the app.",
+                request.META.get('REMOTE_ADDR'))
+        return self.get_ident(request)
+
+    def allow_request(self, request, view):
+        """
+        Takes one token from the request's bucket, if one is available.
+        """
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return True
+
+        capacity, period = settings.AUTH_THROTTLE_BUCKETS[self.scope]
+        refill_rate = capacity / period
+        key = f'throttle:{self.scope}:{ident}'
+        now = time.time()
+        cache = caches[SHARED_ALIAS]
+
+        tokens, updated_at = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+        if tokens < 1:
+            self._wait = (1 - tokens) / refill_rate
+            return False
+
+        cache.set(key, (tokens - 1, now), timeout=int(period) + 1)
+        return True
+
+    def wait(self):
+        """
+        Returns the seconds until the bucket holds a token again.
+        """
+        return self._wait
+
+
+class AuthIPThrottle(TokenBucketThrottle):
+    """
+    Limits authentication requests per client IP address.
+    """
+    scope = 'auth_ip'
+
+    def get_ident_key(self, request, view):
+        return self.client_ip(request)
+
+
+class AuthAccountThrottle(TokenBucketThrottle):
+    """
+    Limits authentication requests per account (username or email) from one client
+    IP address.
+    """
+    scope = 'auth_account'
+
+    def get_ident_key(self, request, view):
+        data = request.data if hasattr(request.data, 'get') else {}
+        account = data.get('username') or data.get('email')
+        if not account or not isinstance(account, str):
+            return None
+        return f'{account.strip().lower()}:{self.client_ip(request)}'
@@ -0,0 +1,206 @@
+"""
+Refresh tokens with an in-memory revocation check.
+
+simplejwt checks every refresh token against the blacklist with a query joining
+BlacklistedToken and OutstandingToken, tables that grow with every login and every
+rotation. `RevocationCache` keeps the revoked token IDs (jti) of this process in a
+set and loads only the rows blacklisted recently, using the BlacklistedToken
+primary key as a cursor, so a revocation check is a set lookup whatever the size of
+the tables. Expired entries, which can't be used anyway and are purged from the
+database by `compact_token_blacklist`, are dropped periodically.
+
+IDs are allocated when a row is inserted but the row is only visible once its
+transaction commits, so on PostgreSQL rows may appear out of ID order: a row can
+commit after a later ID was read. Each refresh therefore re-reads the rows above the
+cursor as it was TOKEN_REVOCATION_RESCAN_WINDOW seconds earlier, and the whole set
+of unexpired revocations is reloaded every TOKEN_REVOCATION_RELOAD_INTERVAL seconds
+for transactions slower than that.
+
+A token revoked by another process is seen here at the next refresh, at most
+TOKEN_REVOCATION_REFRESH_INTERVAL seconds later. Rotation doesn't depend on that
+window: blacklisting the presented token is an insert into a unique column, so a
+token that is replayed concurrently is rejected by `TokenRefreshSerializer` when its
+insert finds the row already there.
+
+Classes:
+- RevocationCache: The set of revoked jtis, refreshed incrementally.
+- RefreshToken: simplejwt's RefreshToken checked against the revocation cache.
+- TokenRefreshSerializer: Rotates refresh tokens, rejecting replayed ones.
+"""
+
+import collections
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+# Seconds between scans that drop expired entries from the cache.
+PRUNE_INTERVAL = 300
+
+
+class RevocationCache:
+    """
+    The revoked refresh token IDs, loaded incrementally from BlacklistedToken.
+
+    Attributes:
+        refresh_interval (float): Seconds between incremental loads; 0 loads before
+            every check.
+        rescan_window (float): Seconds during which rows above a cursor are read
+            again, for rows committed out of ID order.
+        reload_interval (float): Seconds between full loads of the unexpired rows.
+    """
+
+    def __init__(self, refresh_interval, rescan_window=60, reload_interval=3600):
+        self.refresh_interval = refresh_interval
+        self.rescan_window = rescan_window
+        self.reload_interval = reload_interval
+        self._expiry_by_jti = {}
+        self._last_id = 0
+        # (monotonic time, cursor) after past refreshes, oldest first.
+        self._cursors = collections.deque()
+        self._refreshed_at = None
+        self._reloaded_at = None
+        self._pruned_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def is_revoked(self, jti):
+        """
+        Checks whether a token ID has been blacklisted.
+
+        Args:
+            jti (str): The token's 'jti' claim.
+
+        Returns:
+            bool: True if the token is revoked.
+        """
+        now = time.monotonic()
+        if self._refreshed_at is None or now - self._refreshed_at >= self.refresh_interval:
+            self.refresh()
+        return jti in self._expiry_by_jti
+
+    def add(self, jti, expires_at):
+        """
+        Records a token revoked by this process, so it is rejected immediately.
+        """
+        with self._lock:
+            self._expiry_by_jti[jti] = expires_at
+
+    def _rescan_floor(self, now):
+        """
+        Returns the cursor as it was `rescan_window` seconds ago (or at the oldest
+        refresh remembered); the lock must be held.
+        """
+        cursors = self._cursors
+        while len(cursors) > 1 and cursors[1][0] <= now - self.rescan_window:
+            cursors.popleft()
+        return cursors[0][1] if cursors else 0
+
+    def refresh(self):
+        """
+        Loads the tokens blacklisted recently, or all unexpired ones when a full load
+        is due, and drops expired ones.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._reloaded_at is None or now - self._reloaded_at >= self.reload_interval:
+                rows = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+                # No cursor predates the first load, so rows committing after it
+                # with lower IDs are caught by a second full load a window later.
+                first = self._reloaded_at is None
+                self._reloaded_at = (
+                    now - self.reload_interval + self.rescan_window if first else now)
+            else:
+                rows = BlacklistedToken.objects.filter(id__gt=self._rescan_floor(now))
+            for blacklisted_id, jti, expires_at in rows.values_list(
+                    'id', 'token__jti', 'token__expires_at'):
+                self._expiry_by_jti[jti] = expires_at
+                self._last_id = max(self._last_id, blacklisted_id)
+            # One cursor per second is enough; a skipped one only widens the rescan.
+            if not self._cursors or now - self._cursors[-1][0] >= 1:
+                self._cursors.append((now, self._last_id))
+            self._refreshed_at = now
+            if now - self._pruned_at >= PRUNE_INTERVAL:
+                self._prune()
+                self._pruned_at = now
+
+    def _prune(self):
+        """
+        Drops expired tokens; the lock must be held.
+        """
+        current = timezone.now()
+        self._expiry_by_jti = {
+            jti: expires_at for jti, expires_at in self._expiry_by_jti.items()
+            if expires_at > current
+        }
+
+    def __len__(self):
+        return len(self._expiry_by_jti)
+
+
+revocation_cache = RevocationCache(settings.TOKEN_REVOCATION_REFRESH_INTERVAL,
+                                   settings.TOKEN_REVOCATION_RESCAN_WINDOW,
+                                   settings.TOKEN_REVOCATION_RELOAD_INTERVAL)
+
+
+class RefreshToken(tokens.RefreshToken):
+    """
+    A refresh token whose blacklist check uses the revocation cache.
+    """
+
+    def check_blacklist(self):
+        """
+        Raises `TokenError` if this token is in the revocation cache.
+        """
+        if revocation_cache.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """
+        Blacklists this token and records it in the revocation cache.
+
+        Returns:
+            tuple: (BlacklistedToken, created), created being False if the token was
+            already blacklisted.
+        """
+        blacklisted, created = super().blacklist()
+        revocation_cache.add(self.payload[api_settings.JTI_CLAIM],
+                             datetime_from_epoch(self.payload['exp']))
+        return blacklisted, created
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """
+    Issues a new access token (and a rotated refresh token) for a refresh token.
+    """
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        """
+        Validates the refresh token and rotates it when ROTATE_REFRESH_TOKENS is set.
+
+        Raises:
+            InvalidToken: If the token was blacklisted by a concurrent refresh.
+        """
+        refresh = self.token_class(attrs['refresh'])
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                _blacklisted, created = refresh.blacklist()
+                if not created:
+                    raise InvalidToken(_("Token is blacklisted"))
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+
+        return data
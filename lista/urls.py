@@ -5,7 +5,8 @@ This file contains the URL routing configuration for the Django application.
 It registers view sets with a router and maps various API endpoints to their corresponding views.
 
 Key Features:
-- A DefaultRouter is used to automatically generate URLs for the viewsets.
+- Each viewset is registered with a router in its own module of `lista.views`,
+  included under its prefix (/listitem/, /grouplists/, /listitemimages/, /customizations/).
 - Several API endpoints are registered for models like ListItem, GroupList, ListItemImage,
   Customization, and Recommendation.
 - Each URL path is associated with a specific view or viewset that handles the respective request.
@@ -21,41 +22,88 @@ Registered Endpoints:
 8. /reset_password_request/ - Request a password reset.
 9. /reset_password/ - Reset user password.
 10. /recommendations/<listItemId>/ - Get recommendations for a specific ListItem by ID.
+11. /login/refresh/ - Exchange a refresh token for new tokens (rotating the refresh token).
+12. / - The API root, listing the routed viewsets.
+13. /bootstrap/ - The logged-in user's home screen data (lists, shares, images,
+    customization) in one response.
+14. /batch/ - Several list, sharing and image operations applied in one transaction,
+    with idempotency keys.
 
-The URLs are dynamically generated using the DefaultRouter for 
-models that follow the RESTful pattern.
+Each domain's views live in their own module of `lista.views` and are routed lazily
+(see `lista.routing`): a worker imports a domain's views when it receives its first
+request for that domain. API_DOMAINS limits the domains a deployment serves, e.g.
+API_DOMAINS=images for a worker pool dedicated to image uploads; the other URLs then
+return 404 and their views are never imported.
 """
 
-from django.urls import include, path
-from rest_framework.routers import DefaultRouter
-
-from . import views
-from .views import (CustomizationViewSet, GroupListViewSet,
-                    ListItemImageViewSet, ListItemViewSet,
-                    RecommendationViewSet)
-
-router = DefaultRouter()
-router.register(r'listitem', ListItemViewSet, basename='listitem')
-router.register(r'grouplists', GroupListViewSet)
-router.register(r'listitemimages', ListItemImageViewSet)
-router.register(r'customizations', CustomizationViewSet)
-
-urlpatterns = [
-    path('index/', views.index),
-    path('test/', views.test),
-    path('priverty/', views.priverty),
-    path('login/', views.MyTokenObtainPairView.as_view()),
-    path('register/', views.register),
-    path('', include(router.urls)),
-    path('get_user_info/<str:email>/', views.get_user_info_by_email,
-         name='get_user_info_by_email'),
-    path('user/<int:user_id>/', views.update_user, name='update_user'),
-    path('reset_password_request/', views.ResetPasswordRequestView.as_view(),
-         name='reset_password_request'),
-    path('reset_password/', views.ResetPasswordView.as_view(), name='reset_password'),
-    path(
-        'recommendations/<int:list_item_id>/',
-        RecommendationViewSet.as_view({'get': 'recommendations'}),
-    ),
-
-]
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .routing import lazy_include, lazy_view
+
+DOMAINS = {
+    'pages': [
+        lazy_view('index/', 'lista.views.pages.index'),
+        lazy_view('test/', 'lista.views.pages.test'),
+        lazy_view('priverty/', 'lista.views.pages.priverty'),
+    ],
+    'auth': [
+        lazy_view('login/', 'lista.views.auth.MyTokenObtainPairView'),
+        lazy_view('login/refresh/', 'lista.views.auth.MyTokenRefreshView'),
+        lazy_view('register/', 'lista.views.auth.register'),
+        lazy_view('reset_password_request/', 'lista.views.auth.ResetPasswordRequestView',
+                  name='reset_password_request'),
+        lazy_view('reset_password/', 'lista.views.auth.ResetPasswordView',
+                  name='reset_password'),
+    ],
+    'users': [
+        lazy_view('get_user_info/<str:email>/', 'lista.views.users.get_user_info_by_email',
+                  name='get_user_info_by_email'),
+        lazy_view('user/<int:user_id>/', 'lista.views.users.update_user', name='update_user'),
+    ],
+    'lists': [lazy_include('listitem/', 'lista.views.lists')],
+    'groups': [lazy_include('grouplists/', 'lista.views.groups')],
+    'images': [lazy_include('listitemimages/', 'lista.views.images')],
+    'customizations': [lazy_include('customizations/', 'lista.views.customizations')],
+    'recommendations': [
+        lazy_view('recommendations/<int:list_item_id>/',
+                  'lista.views.recommendations.RecommendationViewSet',
+                  actions={'get': 'recommendations'}),
+    ],
+    'bootstrap': [lazy_view('bootstrap/', 'lista.views.bootstrap.bootstrap', name='bootstrap')],
+    'batch': [lazy_view('batch/', 'lista.views.batch.batch', name='batch')],
+}
+
+# The list route of each routed viewset, shown by the API root.
+API_ROOT_ROUTES = {
+    'lists': ('listitem', 'listitem-list'),
+    'groups': ('grouplists', 'grouplist-list'),
+    'images': ('listitemimages', 'listitemimage-list'),
+    'customizations': ('customizations', 'customization-list'),
+}
+
+
+def enabled_domains():
+    """
+    Returns the domains served by this deployment, from API_DOMAINS (all by default).
+
+    Raises:
+        ImproperlyConfigured: If API_DOMAINS names an unknown domain.
+    """
+    if not settings.API_DOMAINS:
+        return list(DOMAINS)
+    unknown = set(settings.API_DOMAINS) - set(DOMAINS)
+    if unknown:
+        raise ImproperlyConfigured(f"Unknown API_DOMAINS {', '.join(sorted(unknown))}; "
+                                   f"expected some of {', '.join(DOMAINS)}")
+    return list(settings.API_DOMAINS)
+
+
+urlpatterns = []
+for domain in enabled_domains():
+    urlpatterns += DOMAINS[domain]
+
+api_root = dict(route for domain, route in API_ROOT_ROUTES.items() if domain in enabled_domains())
+if api_root:
+    urlpatterns.append(lazy_view('', 'rest_framework.routers.APIRootView', name='api-root',
+                                 api_root_dict=api_root))
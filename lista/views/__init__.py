@@ -0,0 +1,51 @@
+"""
+The views of the lista application, one module per domain:
+- auth: login, token refresh, registration and password reset;
+- users: user lookup and profile updates;
+- lists: ListItemViewSet;
+- groups: GroupListViewSet (sharing);
+- images: ListItemImageViewSet;
+- customizations: CustomizationViewSet;
+- recommendations: RecommendationViewSet;
+- bootstrap: the home screen data in one response;
+- batch: several operations of the list, sharing and image views in one transaction;
+- pages: index, test and priverty.
+
+`lista.urls` imports a domain module only when a request for it arrives, so a worker
+imports the views it serves and nothing else. The names below can still be imported
+from `lista.views` directly; the module that defines them is imported on first access.
+"""
+
+from importlib import import_module
+
+_MODULE_BY_NAME = {
+    'MyTokenObtainPairSerializer': 'auth',
+    'MyTokenObtainPairView': 'auth',
+    'MyTokenRefreshView': 'auth',
+    'register': 'auth',
+    'ResetPasswordView': 'auth',
+    'ResetPasswordRequestView': 'auth',
+    'send_password_reset_email': 'auth',
+    'get_user_info_by_email': 'users',
+    'update_user': 'users',
+    'ListItemViewSet': 'lists',
+    'GroupListViewSet': 'groups',
+    'BULK_SHARE_MAX_PAIRS': 'groups',
+    'ListItemImageViewSet': 'images',
+    'CustomizationViewSet': 'customizations',
+    'RecommendationViewSet': 'recommendations',
+    'index': 'pages',
+    'test': 'pages',
+    'priverty': 'pages',
+}
+
+
+def __getattr__(name):
+    module_name = _MODULE_BY_NAME.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f'{__name__}.{module_name}'), name)
+
+
+def __dir__():
+    return sorted([*globals(), *_MODULE_BY_NAME])
@@ -0,0 +1,238 @@
+"""
+Authentication views: login (JWT issue and refresh), registration and password reset.
+
+Served under /login/, /register/, /reset_password_request/ and /reset_password/. These
+endpoints are throttled per IP address and per account, and hash passwords in the
+bounded pool of `lista.hashing`. The password reset email is sent with SendGrid,
+which `lista.providers` imports on first use.
+"""
+
+# Third-party imports
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.decorators import api_view, throttle_classes
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+# Django imports
+from django.contrib.auth.models import User
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+# Local imports
+from ..logging_utils import log
+from ..providers import send_email
+from ..last_login import record_login
+from ..hashing import hash_password
+from ..throttling import AuthAccountThrottle, AuthIPThrottle
+from ..tokens import TokenRefreshSerializer
+
+
+class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Custom serializer for obtaining JWT tokens with additional claims.
+    This serializer is customized to include additional claims like 
+    `username` and `user_id` in the generated JWT token.
+
+    Note:
+    - The `create` and `update` methods are not implemented in this class.
+    - If you are using this serializer as part of a `ModelSerializer`, 
+      you may need to implement the `create` and `update` methods.
+    """
+    @classmethod
+    @log(user_id="request.user.id", object_id="list_item.id")
+    def get_token(cls, user):
+        """
+        Generates a JWT token for the user with additional custom claims.
+
+        This method calls the parent class's `get_token` method to generate
+        a basic token, and then adds the `username` and `user_id` claims
+        to it. The user's `last_login` is also recorded here; it is written to the
+        database in bulk by `lista.last_login` rather than saving the user row.
+
+        Args:
+            user (User): The user object for whom the token is generated.
+
+        Returns:
+            dict: The generated JWT token with added claims.
+        """
+        token = super().get_token(user)
+        token['username'] = user.username
+        token['user_id'] = user.id
+        record_login(user)
+        return token
+
+
+class MyTokenObtainPairView(TokenObtainPairView):
+    """
+    Custom view for obtaining JWT tokens.
+
+    Logins are rate limited per IP address and per account, and the password check
+    runs in the hashing pool (see `lista.backends.PooledPasswordBackend`).
+    """
+    serializer_class = MyTokenObtainPairSerializer
+    throttle_classes = [AuthIPThrottle, AuthAccountThrottle]
+
+
+class MyTokenRefreshView(TokenRefreshView):
+    """
+    Exchanges a refresh token for new tokens, rotating the refresh token and
+    rejecting replayed ones (see `lista.tokens`).
+    """
+    serializer_class = TokenRefreshSerializer
+
+
+@log(user_id="request.user.id", object_id="list_item.id")
+@api_view(['POST'])
+@throttle_classes([AuthIPThrottle, AuthAccountThrottle])
+def register(request):
+    """
+    Register a new user with username, email, and password.
+
+    This endpoint allows the creation of a new user by providing a username, email, password, 
+    first name, and last name. The server checks whether the username or email already exists 
+    in the database, and if so, returns an error. If the registration is successful, 
+    a new user is created, and an authentication token is returned for further use.
+
+    Registrations are rate limited per IP address and per account, and the password
+    is hashed in the bounded hashing pool (see `lista.hashing`). A concurrent
+    registration with the same username or email is also answered with a 400, by the
+    database's unique indexes.
+    """
+    if User.objects.filter(username=request.data['username']).exists():
+        return Response({'error': 'Username already exists.'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    if User.objects.filter(email=request.data['email']).exists():
+        return Response({'error': 'Email already in use.'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    # What `create_user` does, with the hash computed in the hashing pool.
+    user = User(
+        username=User.normalize_username(request.data['username']),
+        email=User.objects.normalize_email(request.data['email']),
+        password=hash_password(request.data['password']),
+        first_name=request.data.get('first_name', ''),
+        last_name=request.data.get('last_name', ''),
+        is_active=True,
+        is_staff=True,
+    )
+    try:
+        with transaction.atomic():
+            user.save()
+    except IntegrityError:
+        return Response({'error': 'Username or email already in use.'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    refresh = MyTokenObtainPairSerializer.get_token(user)
+    access = str(refresh.access_token)
+
+    return Response({
+        'Success': 'New user created',
+        'username': user.username,
+        'user_id': user.id,
+        'access': access
+    }, status=status.HTTP_201_CREATED)
+
+
+class ResetPasswordView(APIView):
+    """
+    View for resetting the user's password.
+
+    Rate limited per IP address and per account; the new password is hashed in the
+    bounded hashing pool.
+    """
+    throttle_classes = [AuthIPThrottle, AuthAccountThrottle]
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    def post(self, request):
+        """
+        Resets the user's password using the provided email and new password.
+        """
+        email = request.data.get("email")
+        new_password = request.data.get("password")
+
+        if not email or not new_password:
+            return Response(
+                {"error": "Email and new password are required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            user = User.objects.get(email=email)
+            user.password = hash_password(new_password)
+            user.save(update_fields=['password'])
+
+            return Response(
+                {"message": "Password reset successfully."},
+                status=status.HTTP_200_OK,
+            )
+        except User.DoesNotExist:
+            return Response(
+                {"error": "User with this email does not exist."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+
+@log(user_id="request.user.id", object_id="list_item.id")
+def send_password_reset_email(email):
+    """
+    Sends a password reset email to the provided address.
+    """
+    subject = "Password Reset Request"
+    text = (
+        "Click the link to reset your password: "
+        f"{settings.FRONTEND_URL}/change-password?email={email}"
+    )
+
+    try:
+        return send_email(email, subject, text)
+    except Exception as e:
+        print(f"Error sending email: {str(e)}")
+        return None
+
+
+class ResetPasswordRequestView(APIView):
+    """
+    View for handling password reset requests.
+
+    This view processes a password reset request by verifying the user's email 
+    and sending a reset email containing a link if the user exists in the database.
+    Rate limited per IP address and per account, like the other authentication views.
+    """
+    throttle_classes = [AuthIPThrottle, AuthAccountThrottle]
+
+    @log(user_id="request.user.id", object_id="None")
+    def post(self, request):
+        """
+        Handles the POST request for initiating a password reset.
+        Takes an email and sends a reset email if the user exists.
+        """
+        email = request.data.get("email")
+        if not email:
+            return Response(
+                {"error": "Email is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            User.objects.get(email=email)
+
+            send_password_reset_email(email)
+
+            return Response(
+                {"message": "Password reset email has been sent."},
+                status=status.HTTP_200_OK,
+            )
+
+        except User.DoesNotExist:
+            return Response(
+                {"error": "User with this email does not exist."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        except Exception as e:
+            return Response(
+                {"error": f"An error occurred: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
@@ -0,0 +1,49 @@
+"""
+Batch view: several list, sharing and image operations in one request and one
+transaction, for offline-first clients replaying their queue of changes.
+
+Served under /batch/. The operations are run by `lista.batch`.
+"""
+
+# Third-party imports
+from rest_framework.response import Response
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+
+# Local imports
+from ..batch import execute_batch, parse_operations
+from ..logging_utils import log
+
+
+@log(user_id="request.user.id", object_id="list_item.id")
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def batch(request):
+    """
+    Applies an ordered list of operations atomically.
+
+    Request body:
+    - operations (required): [{"method": "POST", "path": "/listitem/", "body": {...}}, ...]
+      on the /listitem/, /grouplists/ and /listitemimages/ endpoints. "$<index>.<field>"
+      in a path or as a body value refers to the response of an earlier operation,
+      e.g. "$0.id".
+
+    Headers:
+    - Idempotency-Key (optional): a unique key per batch. Retrying a committed batch
+      with the same key returns the original response, with `Idempotent-Replayed: true`,
+      instead of applying it again.
+
+    Returns:
+    - HTTP 200 OK with {"committed": true, "results": [{"status", "body"}, ...]}.
+    - The failed operation's status with {"committed": false, "failed_operation": index,
+      "results": [...]} when an operation fails; nothing is applied.
+    - HTTP 400 for a malformed batch, 409 while a batch with the same key is being
+      applied, 422 when the key was used for a different batch.
+    """
+    operations = parse_operations(request.data)
+    status_code, body, replayed = execute_batch(
+        request, operations, request.headers.get('Idempotency-Key'))
+    response = Response(body, status=status_code)
+    if replayed:
+        response['Idempotent-Replayed'] = 'true'
+    return response
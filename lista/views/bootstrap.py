@@ -0,0 +1,71 @@
+"""
+Home screen view: everything the app loads on launch, in one response.
+
+Served under /bootstrap/. Replaces the launch sequence of `listitem/by-user`,
+`grouplists/by-user`, `customizations/get_user_customization` and one
+`listitemimages/<id>/get_images_for_list_item` per list, whose number of requests
+grows with the number of lists.
+"""
+
+# Third-party imports
+from rest_framework.response import Response
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+
+# Local imports
+from ..serializer import ListItemReadSerializer, ListItemImageReadSerializer
+from ..models import GroupList, ListItem, ListItemImage
+from ..logging_utils import log
+from ..customization_cache import get_customization
+from ..permissions import get_permission_resolver
+
+
+@log(user_id="request.user.id", object_id="list_item.id")
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def bootstrap(request):
+    """
+    Returns the logged-in user's home screen data.
+
+    The response holds the same data as the endpoints the app calls on launch:
+    - lists: the user's own lists, as `listitem/by-user`;
+    - shared_lists: the lists shared with the user, as `grouplists/by-user`;
+    - permissions: {list ID: {"permission_type", "role"}} for every list above;
+    - images: {list ID: [images, as `get_images_for_list_item`]} for every list above,
+      empty for lists without images;
+    - customization: the user's customization, as `get_user_customization`, or {}.
+
+    It is built with a fixed number of queries whatever the number of lists: the own
+    lists, the shared lists, the images of all of them, and the permissions and the
+    customization (both usually served from the cache).
+
+    Returns:
+        Response: HTTP 200 with the home screen data.
+    """
+    user = request.user
+    lists = ListItemReadSerializer(ListItem.objects.filter(user=user)).data
+    shared_lists = ListItemReadSerializer(ListItem.objects.filter(
+        id__in=GroupList.objects.filter(user=user).values('list_item_id'))).data
+
+    list_item_ids = {item['id'] for item in lists} | {item['id'] for item in shared_lists}
+    images = {str(list_item_id): [] for list_item_id in list_item_ids}
+    if list_item_ids:
+        for image in ListItemImageReadSerializer(
+                ListItemImage.objects.filter(list_item_id__in=list_item_ids),
+                extra_fields=(('list_item', 'list_item_id'),)).data:
+            images[str(image.pop('list_item'))].append(image)
+
+    resolver = get_permission_resolver(request)
+    permissions = {
+        str(list_item_id): {"permission_type": permission_type, "role": role}
+        for list_item_id, (permission_type, role)
+        in resolver.permissions_for(list_item_ids).items()
+    } if list_item_ids else {}
+
+    return Response({
+        "lists": lists,
+        "shared_lists": shared_lists,
+        "permissions": permissions,
+        "images": images,
+        "customization": get_customization(user.id) or {},
+    })
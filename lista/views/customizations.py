@@ -0,0 +1,103 @@
+"""
+Customization views: a user's background and appearance settings.
+
+Served under /customizations/ by the router of this module's `urlpatterns`.
+"""
+
+# Third-party imports
+from rest_framework import viewsets
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action, permission_classes
+from rest_framework.routers import SimpleRouter
+from rest_framework.urlpatterns import format_suffix_patterns
+
+# Local imports
+from ..serializer import CustomizationSerializer
+from ..models import Customization
+from ..logging_utils import log
+from ..customization_cache import get_customization, save_customization
+
+
+class CustomizationViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for handling user background customizations. Allows users to create, update,
+    and retrieve their customization settings (e.g., background image).
+    """
+    queryset = Customization.objects.all()
+    serializer_class = CustomizationSerializer
+    permission_classes = [IsAuthenticated]
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    def create(self, request, *args, **kwargs):
+        """
+        Handle POST request to create or update a user's background customization.
+
+        This method is responsible for:
+        - Checking if the required 'background_image_id' is provided.
+        - Creating or updating the Customization model instance for the authenticated user,
+          which also updates the user's cached customization.
+        - Responding with a success message and the updated data: 201 when the
+          customization was created by this request, 200 when it was updated.
+
+        If 'background_image_id' is missing, a 400 error is returned.
+
+        Args:
+            request: The HTTP request object containing user data.
+
+        Returns:
+            Response: HTTP response with a success or error message.
+        """
+        user = request.user
+        background_image_id = request.data.get('background_image_id', '')
+
+        if not background_image_id:
+            return Response(
+                {"error": "background_image_id is required."},
+                status=400
+            )
+
+        data, created = save_customization(user.id, background_image_id)
+
+        return Response(
+            {
+                "message": "Background updated successfully.",
+                "data": data,
+                "status": "created" if created else "updated"
+            },
+            status=201 if created else 200
+        )
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    @action(detail=False, methods=['GET'], url_path='get_user_customization')
+    def get_customization_for_user(self, request, *args, **kwargs):
+        """
+        Handle GET request to retrieve the customization for the authenticated user.
+
+        This method retrieves the background customization for the authenticated user,
+        from the per-user cache of `lista.customization_cache` when possible.
+        If the customization does not exist, a message indicating the absence of customization
+        is returned with a 200 status.
+
+        Args:
+            request: The HTTP request object containing user data.
+
+        Returns:
+            Response: HTTP response with the user's customization data or a not found message.
+        """
+        data = get_customization(request.user.id)
+        if data is None:
+            return Response({
+                "message": "Customization not found for this user.",
+                "data": {}
+            }, status=200)
+
+        return Response({
+            "message": "Customization retrieved successfully.",
+            "data": data
+        }, status=200)
+
+
+router = SimpleRouter()
+router.register(r'', CustomizationViewSet)
+urlpatterns = format_suffix_patterns(router.urls)
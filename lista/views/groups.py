@@ -0,0 +1,410 @@
+"""
+Sharing views: the GroupList entries that share lists with other users, including
+bulk sharing and unsharing.
+
+Served under /grouplists/ by the router of this module's `urlpatterns`.
+"""
+
+# Third-party imports
+from rest_framework import viewsets, status
+from rest_framework.response import Response
+from rest_framework.decorators import action, permission_classes
+from rest_framework.routers import SimpleRouter
+from rest_framework.urlpatterns import format_suffix_patterns
+
+# Django imports
+from django.db import models, transaction
+from django.contrib.auth.models import User
+
+# Local imports
+from ..serializer import GroupListSerializer, ListItemReadSerializer, GroupListReadSerializer
+from ..models import ListItem, GroupList, ListAccess
+from ..logging_utils import log
+from ..access import sync_list_access
+from ..permissions import HasListPermission, get_permission_resolver
+
+# Maximum number of list/user pairs accepted by a bulk share or unshare request.
+BULK_SHARE_MAX_PAIRS = 500
+
+
+class GroupListViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for managing GroupLists and interacting with associated ListItems.
+    Includes creation, update, and permission checks for groups.
+    """
+    queryset = GroupList.objects.all()
+    serializer_class = GroupListSerializer
+    permission_classes = [HasListPermission]
+    list_item_lookups = {
+        'list': None,
+        'create': ('data', 'list_item'),
+        'list_by_user': None,
+        'get_permission_type': ('query', 'list_item_id'),
+        # The bulk actions check full access to every list themselves.
+        'bulk_share': None,
+        'bulk_unshare': None,
+    }
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    def get_queryset(self):
+        """
+        Returns the GroupLists of every list the logged-in user can access.
+
+        The lists the user owns or that are shared with them are read from the
+        ListAccess table, and all GroupLists of those lists are returned.
+
+        Returns:
+            QuerySet: GroupLists of the lists owned by or shared with the user.
+        """
+        list_item_ids = ListAccess.objects.filter(
+            user_id=self.request.user.id).values('list_item_id')
+        return GroupList.objects.filter(list_item_id__in=list_item_ids)
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    def list(self, request, *args, **kwargs):
+        """
+        Returns the GroupLists of every list the user can access (see `get_queryset`),
+        serialized by `GroupListReadSerializer` without instantiating model objects.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(GroupListReadSerializer(queryset).data)
+
+    def perform_create(self, serializer):
+        """
+        Saves a new GroupList and the access it grants in one transaction.
+        """
+        with transaction.atomic():
+            serializer.save()
+
+    def perform_update(self, serializer):
+        """
+        Saves an updated GroupList and the access it grants in one transaction.
+        """
+        with transaction.atomic():
+            serializer.save()
+
+    def perform_destroy(self, instance):
+        """
+        Deletes a GroupList and revokes the access it granted in one transaction.
+        """
+        with transaction.atomic():
+            instance.delete()
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    def create(self, request, *args, **kwargs):
+        """
+        Creates a new GroupList and associates it with the currently logged-in user.
+        The function accepts data from the request, validates it, and creates a new GroupList.
+
+        Returns:
+            Response: A message with the details of the created GroupList or an error 
+            if creation fails.
+        """
+        data = request.data.copy()
+        data['user'] = request.data.get('user')
+
+        serializer = self.get_serializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response(
+            {'message': 'GroupList created successfully', 'data': serializer.data},
+            status=status.HTTP_201_CREATED
+        )
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    def update(self, request, *args, **kwargs):
+        """
+        Updates the GroupList if the user has the necessary permissions for the update.
+
+        `get_object` checks through `HasListPermission` that the user has full access to
+        the shared list (as its owner or through a full-access share); otherwise a
+        forbidden response is returned. The serializer rejects a `list_item` other than
+        the share's own, so an update cannot move the share to a list that check never
+        saw.
+
+        Returns:
+            Response: A message with the updated GroupList details or an error message
+            if the user is unauthorized.
+        """
+        instance = self.get_object()
+
+        data = request.data.copy()
+        data['user'] = instance.user_id
+        serializer = self.get_serializer(instance, data=data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        return Response(
+            {'message': 'GroupList updated successfully', 'data': serializer.data},
+            status=status.HTTP_200_OK
+        )
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    @action(detail=False, methods=['GET'], url_path=r'by-user/(?P<user_id>\d+)')
+    def list_by_user(self, request, user_id):
+        """
+        Returns the ListItems associated with a specific user based on the user_id.
+
+        The function fetches GroupLists where the logged-in user is associated and retrieves 
+        the ListItems related to those GroupLists.
+
+        Args:
+            user_id (str): The ID of the user whose ListItems are to be fetched.
+
+        Returns:
+            Response: A list of serialized ListItems associated with the user.
+        """
+        user_id = request.user.id
+        group_list = GroupList.objects.filter(models.Q(user_id=user_id))
+        list_item_ids = group_list.values_list('list_item_id', flat=True)
+        items = ListItem.objects.filter(id__in=list_item_ids)
+        serializer = ListItemReadSerializer(items)
+        return Response(serializer.data)
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    @action(detail=False, methods=['GET'], url_path='permission_type')
+    def get_permission_type(self, request):
+        """
+        Fetches the permission type for a specific user and ListItem based on 
+        the provided user_id and list_item_id.
+
+        The function checks if both user_id and list_item_id are provided. If either is missing,
+        it returns an error message. If valid, it returns the effective permission type 
+        for the specified user and ListItem (owners have full access), resolved through
+        the cached `PermissionResolver` instead of querying GroupList.
+
+        Args:
+            user_id (str): The ID of the user whose permission type is being checked.
+            list_item_id (str): The ID of the ListItem for which the permission type
+            is being checked.
+
+        Returns:
+            Response: The permission type for the specified user and ListItem or an error message 
+            if parameters are missing or the group list is not found.
+        """
+        user_id = request.query_params.get('user_id')
+        list_item_id = request.query_params.get('list_item_id')
+
+        if not user_id or not list_item_id:
+            return Response({'message': 'user_id and list_item_id are required'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            permission_type = get_permission_resolver(request, user_id).permission_type(
+                list_item_id)
+        except ValueError:
+            return Response({'message': 'user_id and list_item_id must be integers'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        if not permission_type:
+            return Response(
+                {'message': 'No group list found for the given user and item'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        return Response({'permission_type': permission_type}, status=status.HTTP_200_OK)
+
+    def _parse_bulk_share_request(self, request):
+        """
+        Validates the body of a bulk share/unshare request and resolves its users.
+
+        The users referenced by id or email in all entries are loaded with one query.
+        The caller must have full access to every list, which is checked with one
+        query through the permission resolver.
+
+        Returns:
+            tuple: (list_items, shares, error_response). `list_items` maps each list ID
+            to its owner ID, `shares` is a list of dicts with the original 'entry', the
+            resolved 'user_id' (or None) and the validated 'permission_type' and 'role'.
+            `error_response` is a Response when the request is invalid, otherwise None.
+        """
+        list_item_ids = request.data.get('list_items')
+        entries = request.data.get('shares')
+
+        if not isinstance(list_item_ids, list) or not list_item_ids:
+            return None, None, Response({'message': 'list_items must be a non-empty array'},
+                                        status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(entries, list) or not entries:
+            return None, None, Response({'message': 'shares must be a non-empty array'},
+                                        status=status.HTTP_400_BAD_REQUEST)
+        if len(list_item_ids) * len(entries) > BULK_SHARE_MAX_PAIRS:
+            return None, None, Response(
+                {'message': f'At most {BULK_SHARE_MAX_PAIRS} list/user pairs per request'},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            list_item_ids = {int(list_item_id) for list_item_id in list_item_ids}
+        except (TypeError, ValueError):
+            return None, None, Response({'message': 'list_items must contain list IDs'},
+                                        status=status.HTTP_400_BAD_REQUEST)
+
+        list_items = dict(ListItem.objects.filter(
+            id__in=list_item_ids).values_list('id', 'user_id'))
+        missing = list_item_ids - set(list_items)
+        if missing:
+            return None, None, Response(
+                {'message': 'List items not found', 'list_items': sorted(missing)},
+                status=status.HTTP_404_NOT_FOUND)
+
+        resolver = get_permission_resolver(request)
+        forbidden = [list_item_id for list_item_id in sorted(list_items)
+                     if not resolver.can_write(list_item_id)]
+        if forbidden:
+            return None, None, Response(
+                {'message': 'You are not authorized to share these lists.',
+                 'list_items': forbidden},
+                status=status.HTTP_403_FORBIDDEN)
+
+        user_ids = set()
+        emails = set()
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            if str(entry.get('user', '')).isdigit():
+                user_ids.add(int(entry['user']))
+            elif entry.get('email'):
+                emails.add(entry['email'])
+
+        users_by_id = {}
+        users_by_email = {}
+        if user_ids or emails:
+            for user_id, email in User.objects.filter(
+                models.Q(id__in=user_ids) | models.Q(email__in=emails)
+            ).values_list('id', 'email'):
+                users_by_id[user_id] = user_id
+                users_by_email[email] = user_id
+
+        permission_choices = dict(GroupList.PERMISSION_CHOICES)
+        role_choices = dict(GroupList.ROLE_CHOICES)
+        shares = []
+        for entry in entries:
+            if not isinstance(entry, dict):
+                shares.append({'entry': entry, 'user_id': None, 'error': 'invalid entry'})
+                continue
+            if str(entry.get('user', '')).isdigit():
+                user_id = users_by_id.get(int(entry['user']))
+            else:
+                user_id = users_by_email.get(entry.get('email'))
+            permission_type = entry.get('permission_type', 'read_only')
+            role = entry.get('role', 'member')
+            error = None
+            if permission_type not in permission_choices:
+                error = 'invalid permission_type'
+            elif role not in role_choices:
+                error = 'invalid role'
+            shares.append({'entry': entry, 'user_id': user_id, 'error': error,
+                           'permission_type': permission_type, 'role': role})
+        return list_items, shares, None
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    @action(detail=False, methods=['post'], url_path='bulk_share')
+    def bulk_share(self, request):
+        """
+        Shares one or more lists with many users in a single request.
+
+        Users are given by id or email and resolved with one query. The GroupList rows
+        are upserted with a single `bulk_create(update_conflicts=True)`, so sharing
+        again with a user updates their permission and role. Everything, including the
+        ListAccess rows, is written in one transaction.
+
+        Request data:
+        - list_items (required): An array of list IDs the caller has full access to.
+        - shares (required): An array of {"user": id} or {"email": address}, each with
+          optional "permission_type" (default read_only) and "role" (default member).
+
+        Returns:
+            Response: Per list/user results with a status of 'created', 'updated',
+            'user_not_found', 'is_owner' or 'invalid'.
+        """
+        list_items, shares, error_response = self._parse_bulk_share_request(request)
+        if error_response:
+            return error_response
+
+        results = []
+        rows = {}
+        for list_item_id, owner_id in sorted(list_items.items()):
+            for share in shares:
+                result = {'list_item': list_item_id, 'entry': share['entry'],
+                          'user': share['user_id']}
+                if share['error']:
+                    result['status'] = 'invalid'
+                    result['error'] = share['error']
+                elif share['user_id'] is None:
+                    result['status'] = 'user_not_found'
+                elif share['user_id'] == owner_id:
+                    result['status'] = 'is_owner'
+                else:
+                    rows[(share['user_id'], list_item_id)] = share
+                results.append(result)
+
+        with transaction.atomic():
+            existing = set(GroupList.objects.filter(
+                list_item_id__in=list_items, user_id__in={user_id for user_id, _ in rows}
+            ).values_list('user_id', 'list_item_id'))
+            GroupList.objects.bulk_create(
+                [GroupList(user_id=user_id, list_item_id=list_item_id,
+                           permission_type=share['permission_type'], role=share['role'])
+                 for (user_id, list_item_id), share in rows.items()],
+                update_conflicts=True,
+                unique_fields=['user', 'list_item'],
+                update_fields=['permission_type', 'role'],
+            )
+            # bulk_create does not send signals, so the access rows are rebuilt here.
+            sync_list_access(list_items)
+
+        for result in results:
+            if 'status' not in result:
+                pair = (result['user'], result['list_item'])
+                result['status'] = 'updated' if pair in existing else 'created'
+
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    @action(detail=False, methods=['post'], url_path='bulk_unshare')
+    def bulk_unshare(self, request):
+        """
+        Stops sharing one or more lists with many users in a single request.
+
+        Request data:
+        - list_items (required): An array of list IDs the caller has full access to.
+        - shares (required): An array of {"user": id} or {"email": address}.
+
+        Returns:
+            Response: Per list/user results with a status of 'removed', 'not_shared',
+            'user_not_found', 'is_owner' or 'invalid'.
+        """
+        list_items, shares, error_response = self._parse_bulk_share_request(request)
+        if error_response:
+            return error_response
+
+        user_ids = {share['user_id'] for share in shares
+                    if share['user_id'] is not None and not share['error']}
+        with transaction.atomic():
+            to_remove = GroupList.objects.filter(
+                list_item_id__in=list_items, user_id__in=user_ids)
+            removed = set(to_remove.values_list('user_id', 'list_item_id'))
+            to_remove.delete()
+
+        results = []
+        for list_item_id, owner_id in sorted(list_items.items()):
+            for share in shares:
+                result = {'list_item': list_item_id, 'entry': share['entry'],
+                          'user': share['user_id']}
+                if share['error']:
+                    result['status'] = 'invalid'
+                    result['error'] = share['error']
+                elif share['user_id'] is None:
+                    result['status'] = 'user_not_found'
+                elif share['user_id'] == owner_id:
+                    result['status'] = 'is_owner'
+                elif (share['user_id'], list_item_id) in removed:
+                    result['status'] = 'removed'
+                else:
+                    result['status'] = 'not_shared'
+                results.append(result)
+
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+
+router = SimpleRouter()
+router.register(r'', GroupListViewSet)
+urlpatterns = format_suffix_patterns(router.urls)
@@ -0,0 +1,427 @@
+"""
+List image views: uploads (direct and presigned), listing, similarity search and updates.
+
+Served under /listitemimages/ by the router of this module's `urlpatterns`. Images
+are decoded and stored by `lista.image_processing`, presigned uploads come from
+`lista.storage`.
+"""
+
+# Third-party imports
+from rest_framework import viewsets, status
+from rest_framework.response import Response
+from rest_framework.decorators import action, permission_classes
+from rest_framework.routers import SimpleRouter
+from rest_framework.urlpatterns import format_suffix_patterns
+
+# Django imports
+from django.db import models, transaction
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+# Local imports
+from ..serializer import ListItemImageSerializer, ListItemImageReadSerializer
+from ..models import ListAccess, ListItem, ListItemImage
+from ..logging_utils import log
+from ..image_processing import (
+    PHASH_BANDS,
+    ImageProcessingError,
+    delete_stored_files,
+    extract_metadata,
+    hamming_distance,
+    perceptual_hash_bands,
+    process_images,
+    strip_exif,
+)
+from ..permissions import HasListPermission
+from ..storage import (
+    StorageFeatureUnavailable,
+    generate_presigned_upload,
+    is_direct_upload_key,
+    supports_presigned_urls,
+)
+
+
+def _data_list(data, key):
+    """
+    Returns the values of a list field of the request data: the repeated `key`
+    fields of a form, or the array under `key` (or `key` without its '[]' suffix)
+    of a JSON body, such as the body of a batch operation.
+    """
+    if hasattr(data, 'getlist'):
+        return data.getlist(key)
+    values = data.get(key, data.get(key.removesuffix('[]'), []))
+    return values if isinstance(values, list) else [values]
+
+
+class ListItemImageViewSet(viewsets.ModelViewSet):
+    """
+    A viewset for handling image uploads, retrieval, and updates for list items.
+
+    This viewset provides the following key actions:
+    1. `upload_images`: Allows the user to upload multiple images for a specific list item.
+    2. `get_images_for_list_item`: Retrieves all images associated with a given list item.
+    3. `update_images`: Allows the user to update or delete images for a list item,
+    including modifying their index.
+    4. `presigned_upload` / `confirm_upload`: Direct-to-storage uploads on S3-compatible
+    storage backends.
+    5. `similar`: Finds exact and near-duplicate images across the owner's lists.
+
+    Each action handles different HTTP methods (POST, GET) and validates inputs to ensure
+    correct handling of list item images.
+    """
+
+    queryset = ListItemImage.objects.all()
+    serializer_class = ListItemImageSerializer
+    permission_classes = [HasListPermission]
+    list_item_lookups = {
+        'list': None,
+        'create': ('data', 'list_item'),
+        'upload_images': ('data', 'list_item'),
+        'presigned_upload': ('data', 'list_item'),
+        'confirm_upload': ('data', 'list_item'),
+        'get_images_for_list_item': ('kwargs', 'pk'),
+        'update_images': ('data', 'list_item_id'),
+    }
+
+    def get_queryset(self):
+        """
+        Returns the images; listing only returns those of the lists the logged-in user
+        can access (through ListAccess). Detail routes are checked on the image's list
+        by `HasListPermission`.
+        """
+        queryset = ListItemImage.objects.all()
+        if self.action == 'list':
+            queryset = queryset.filter(list_item_id__in=ListAccess.objects.filter(
+                user_id=self.request.user.id).values('list_item_id'))
+        return queryset
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    @action(detail=False, methods=['post'], url_path='upload_images')
+    def upload_images(self, request):
+        """
+        Handle POST request to upload images for a given list item.
+
+        This endpoint allows the user to upload multiple images for a specific 
+        list item by providing the list item ID and an array of base64 encoded 
+        image data. The images are decoded, verified, stripped of EXIF data and saved
+        to storage in a bounded thread pool, and the corresponding `ListItemImage`
+        instances are created in the database in a single transaction. If any image
+        fails, the files already written for this request are removed.
+
+        Request data:
+        - list_item (required): The ID of the list item to associate images with.
+        - images (required): A list of base64 encoded image data containing 
+          'uri', 'fileName', 'mimeType', and 'index'.
+
+        Returns:
+        - HTTP 201 Created with a success message if the upload is successful.
+        - HTTP 400 Bad Request if the list_item or images array is missing, 
+          or if the base64 decoding fails.
+        """
+        list_item_id = request.data.get('list_item')
+        images_data = request.data.getlist('images')
+
+        if not list_item_id:
+            return Response({"error": "list_item is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if not images_data:
+            return Response({"error": "images array is required."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            list_item = ListItem.objects.get(id=list_item_id)
+        except ListItem.DoesNotExist:
+            return Response({"error": "List item not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            processed_images = process_images(images_data)
+        except ImageProcessingError as e:
+            return Response({"error": "Failed to decode base64 image", "details": str(e)},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        image_instances = [
+            ListItemImage(
+                list_item=list_item,
+                image=processed['file_path'],
+                index=processed['index'],
+                mime_type=processed['mime_type'],
+                **processed['metadata']
+            ) for processed in processed_images
+        ]
+
+        try:
+            with transaction.atomic():
+                ListItemImage.objects.bulk_create(image_instances)
+        except Exception:
+            delete_stored_files([processed['file_path'] for processed in processed_images])
+            raise
+
+        return Response({"status": "Images uploaded successfully"}, status=status.HTTP_201_CREATED)
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    @action(detail=False, methods=['post'], url_path='presigned_upload')
+    def presigned_upload(self, request):
+        """
+        Handle POST request to create a presigned direct-to-storage upload.
+
+        The client posts the returned `fields` together with the file to `url`,
+        then registers the uploaded object with `confirm_upload` using `key`.
+        Only available when an S3-compatible storage backend is configured.
+
+        Request data:
+        - list_item (required): The ID of the list item the image belongs to.
+        - fileName (optional): The original file name.
+        - mimeType (required): The MIME type of the image.
+        - index (optional): The index of the image within the list item.
+
+        Returns:
+        - HTTP 200 OK with the presigned 'url', 'fields' and 'key'.
+        - HTTP 400 Bad Request if required data is missing or the storage does not
+          support direct uploads.
+        - HTTP 404 Not Found if the list item does not exist.
+        """
+        list_item_id = request.data.get('list_item')
+        mime_type = request.data.get('mimeType')
+
+        if not list_item_id or not mime_type:
+            return Response({"error": "list_item and mimeType are required."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not ListItem.objects.filter(id=list_item_id).exists():
+            return Response({"error": "List item not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            presigned = generate_presigned_upload(
+                request.user.id, request.data.get('fileName', ''), mime_type,
+                request.data.get('index', 0))
+        except StorageFeatureUnavailable as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(presigned, status=status.HTTP_200_OK)
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    @action(detail=False, methods=['post'], url_path='confirm_upload')
+    def confirm_upload(self, request):
+        """
+        Handle POST request to register an image uploaded through `presigned_upload`.
+
+        Only keys issued to the logged-in user by `presigned_upload`, and not
+        registered yet, are accepted. The uploaded image is verified and its EXIF
+        metadata stripped, as for `upload_images`; a stripped image is stored under a
+        new key and the uploaded object deleted.
+
+        Request data:
+        - list_item (required): The ID of the list item the image belongs to.
+        - key (required): The storage key returned by `presigned_upload`.
+        - mimeType (optional): The MIME type of the image.
+        - index (optional): The index of the image within the list item.
+
+        Returns:
+        - HTTP 201 Created with the image id and download URL.
+        - HTTP 400 Bad Request if the key is missing, invalid or was not uploaded, or
+          the storage does not support direct uploads.
+        - HTTP 404 Not Found if the list item does not exist.
+        """
+        list_item_id = request.data.get('list_item')
+        key = request.data.get('key', '')
+
+        if not supports_presigned_urls():
+            return Response({"error": "Direct uploads require an S3-compatible storage."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not list_item_id or not key:
+            return Response({"error": "list_item and key are required."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if (not is_direct_upload_key(key, request.user.id)
+                or ListItemImage.objects.filter(image=key).exists()
+                or not default_storage.exists(key)):
+            return Response({"error": "Uploaded file not found."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            list_item = ListItem.objects.get(id=list_item_id)
+        except ListItem.DoesNotExist:
+            return Response({"error": "List item not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            with default_storage.open(key) as uploaded_file:
+                uploaded_bytes = uploaded_file.read()
+            stored_bytes = strip_exif(uploaded_bytes)
+            metadata = extract_metadata(stored_bytes)
+        except ImageProcessingError as e:
+            delete_stored_files([key])
+            return Response({"error": "Uploaded file is not a valid image", "details": str(e)},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        if stored_bytes is not uploaded_bytes:
+            # The storage doesn't overwrite files, so the stripped image gets a new key.
+            stored_key = default_storage.save(key, ContentFile(stored_bytes))
+            delete_stored_files([key])
+            key = stored_key
+
+        image = ListItemImage.objects.create(
+            list_item=list_item,
+            image=key,
+            index=request.data.get('index', 0),
+            mime_type=request.data.get('mimeType'),
+            **metadata
+        )
+        return Response({
+            "id": image.id,
+            "url": default_storage.url(image.image.name),
+            "index": image.index
+        }, status=status.HTTP_201_CREATED)
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    @action(detail=True, methods=['GET'], url_path='get_images_for_list_item')
+    def get_images_for_list_item(self, request, *args, **kwargs):
+        """
+        Handle GET request to retrieve all images associated with a 
+        given list item.
+
+        This endpoint retrieves all images related to a specific list item by 
+        its ID. The images are returned in a JSON response containing the 
+        image URL, index, image ID, and the dimensions and size stored at upload
+        so clients can lay out the images before downloading them.
+
+        Request parameters:
+        - pk (required): The ID of the list item.
+
+        Returns:
+        - HTTP 200 OK with a list of images if found.
+        - HTTP 200 OK with an empty list and a message if no images are found.
+        """
+        list_item_id = kwargs.get('pk')
+
+        image_data = ListItemImageReadSerializer(
+            ListItemImage.objects.filter(list_item_id=list_item_id)).data
+        if not image_data:
+            return Response(
+                {"images": [], "message": "No images found for this list item."}, status=200)
+
+        return Response({"images": image_data})
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    @action(detail=True, methods=['GET'], url_path='similar')
+    def similar(self, request, *args, **kwargs):
+        """
+        Handle GET request to find duplicates of an image across the owner's lists.
+
+        Only the lists the logged-in user can read (through ListAccess) are searched,
+        so a user a list is shared with never sees images of the owner's other lists.
+        Exact duplicates share the same content hash. Near-duplicates have a
+        perceptual hash within `max_distance` bits; candidates are found through the
+        indexed perceptual hash bands and then confirmed by their Hamming distance,
+        so no image file is opened.
+
+        Request parameters:
+        - pk (required): The ID of the image.
+        - max_distance (optional): Maximum Hamming distance, 0 to 3. Defaults to 3.
+
+        Returns:
+        - HTTP 200 OK with the matching images, closest first.
+        - HTTP 400 Bad Request if the image has no stored hashes.
+        - HTTP 404 Not Found if the image does not exist.
+        """
+        image = self.get_object()
+        if not image.perceptual_hash:
+            return Response({"error": "No hashes stored for this image."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            max_distance = int(request.query_params.get('max_distance', PHASH_BANDS - 1))
+        except ValueError:
+            max_distance = PHASH_BANDS - 1
+        max_distance = min(max(max_distance, 0), PHASH_BANDS - 1)
+
+        band_filter = models.Q(content_hash=image.content_hash)
+        for band_field, band_value in perceptual_hash_bands(image.perceptual_hash).items():
+            band_filter |= models.Q(**{band_field: band_value})
+
+        owner_id = image.list_item.user_id
+        readable_list_ids = ListAccess.objects.filter(
+            user_id=request.user.id).values('list_item_id')
+        candidates = ListItemImage.objects.filter(
+            band_filter, list_item__user_id=owner_id, list_item_id__in=readable_list_ids
+        ).exclude(id=image.id).only('id', 'list_item_id', 'image', 'index', 'perceptual_hash')
+
+        matches = []
+        for candidate in candidates:
+            distance = hamming_distance(image.perceptual_hash, candidate.perceptual_hash)
+            if distance <= max_distance:
+                matches.append({
+                    "id": candidate.id,
+                    "list_item": candidate.list_item_id,
+                    "url": default_storage.url(candidate.image.name),
+                    "index": candidate.index,
+                    "distance": distance
+                })
+        matches.sort(key=lambda match: match["distance"])
+        return Response({"images": matches})
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    @action(detail=False, methods=['post'], url_path='update_images')
+    def update_images(self, request, *args, **kwargs):
+        """
+        Handle POST request to update or delete images for a given list item.
+
+        This endpoint allows the user to update the indexes of existing images 
+        and delete images by their index. The `list_item_id` must be provided 
+        along with the indices of images to update or delete.
+
+        Request data:
+        - list_item_id (required): The ID of the list item.
+        - updatedImagesIndex[] (optional): A list of indices of images to 
+          update.
+        - deletedImagesIndex[] (optional): A list of indices of images to 
+          delete.
+        Both are repeated form fields, or arrays in a JSON body.
+
+        Returns:
+        - HTTP 200 OK with a success message if the images are updated and/or 
+          deleted successfully.
+        - HTTP 400 Bad Request if any errors occur during the update or 
+          deletion process.
+        """
+        list_item_id = request.data.get('list_item_id')
+        updated_images_index = _data_list(request.data, 'updatedImagesIndex[]')
+        deleted_images_index = _data_list(request.data, 'deletedImagesIndex[]')
+        try:
+
+            for deleted_index in deleted_images_index:
+                images_to_delete = ListItemImage.objects.filter(
+                    index=deleted_index, list_item_id=list_item_id)
+                print(f"Found images to delete with index"
+                      f"{deleted_index}:{images_to_delete}")
+                for image in images_to_delete:
+                    print(
+                        f"Deleting image {image.id}"
+                        f"with index {image.index}) image.delete()")
+
+            for updated_index in updated_images_index:
+                images_to_update = ListItemImage.objects.filter(
+                    index=updated_index, list_item_id=list_item_id)
+                print(
+                    f"Found images with index"
+                    f"{updated_index}:{images_to_update}")
+                for image in images_to_update:
+                    print(
+                        f"Updating image {image.id} - Old index: {image.index}"
+                    )
+                    image.index -= 1
+
+                    try:
+                        image.save()
+                        print(
+                            f"Image {image.id} saved successfully with new index {image.index}")
+                    except Exception as e:
+                        print(f"Failed to save image {image.id}: {e}")
+
+            return Response(
+                {"message": "Images updated and deleted successfully"}, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            print(f"Error during update: {str(e)}")
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+router = SimpleRouter()
+router.register(r'', ListItemImageViewSet)
+urlpatterns = format_suffix_patterns(router.urls)
@@ -0,0 +1,140 @@
+"""
+List views: creating, reading, updating and deleting a user's lists.
+
+Served under /listitem/ by the router of this module's `urlpatterns`.
+"""
+
+# Third-party imports
+from rest_framework import viewsets
+from rest_framework.response import Response
+from rest_framework.decorators import action, permission_classes
+from rest_framework.routers import SimpleRouter
+from rest_framework.urlpatterns import format_suffix_patterns
+
+# Django imports
+from django.db import transaction
+from django.core.exceptions import PermissionDenied
+
+# Local imports
+from ..serializer import ListItemSerializer, ListItemReadSerializer
+from ..models import ListItem, ListAccess
+from ..logging_utils import log
+from ..permissions import HasListPermission
+
+
+class ListItemViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for managing ListItems, including CRUD operations
+    and functionality for soft deletion of items.
+    """
+    queryset = ListItem.objects.all()
+    serializer_class = ListItemSerializer
+    permission_classes = [HasListPermission]
+    # Actions that involve no single list; `list` is scoped to the user's lists.
+    list_item_lookups = {
+        'list': None,
+        'create': None,
+        'get_by_user': None,
+        'accessible': None,
+    }
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    def get_queryset(self):
+        """
+        Retrieves the list items, filtered by user_id (the owner) if provided.
+
+        Listing only returns the lists the logged-in user can access (through
+        ListAccess); detail routes look any list up and `HasListPermission` checks it.
+        """
+        queryset = ListItem.objects.all()
+        if self.action == 'list':
+            queryset = queryset.filter(id__in=ListAccess.objects.filter(
+                user_id=self.request.user.id).values('list_item_id'))
+        user_id = self.request.query_params.get('user_id')
+        return queryset.filter(user_id=user_id) if user_id else queryset
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    @action(detail=False, methods=['GET'], url_path=r'by-user/(?P<user_id>\d+)')
+    def get_by_user(self, request, user_id=None):
+        """
+        Retrieves the list items for a specific user.
+
+        The rows are serialized by `ListItemReadSerializer` straight from the database
+        columns, without instantiating ListItem objects.
+        """
+        user = request.user
+        if user.is_anonymous:
+            raise PermissionDenied("User not logged in.")
+        user_items = ListItem.objects.filter(user=user)
+        serializer = ListItemReadSerializer(user_items)
+        return Response(serializer.data)
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    @action(detail=False, methods=['GET'], url_path='accessible')
+    def accessible(self, request):
+        """
+        Retrieves every list the logged-in user owns or that is shared with them,
+        together with the user's effective permission and role on each list.
+
+        The lists are read from the denormalized ListAccess table with a single
+        indexed range scan on the user, joined to the lists themselves.
+        """
+        user = request.user
+        if user.is_anonymous:
+            raise PermissionDenied("User not logged in.")
+        entries = ListAccess.objects.filter(user=user)
+        serializer = ListItemReadSerializer(
+            entries,
+            column_prefix='list_item__',
+            extra_fields=(('permission_type', 'permission_type'), ('role', 'role')),
+        )
+        return Response(serializer.data)
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    def perform_update(self, serializer):
+        """
+        Perform update of list item, ensuring the user is authenticated.
+        The list and its access rows are saved in one transaction. The list keeps its
+        owner, whoever edits it (a user it is shared with, or a `user` in the body).
+        """
+        user = self.request.user
+        if user.is_anonymous:
+            raise PermissionDenied("User not logged in.")
+        with transaction.atomic():
+            serializer.save(user=serializer.instance.user)
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    def perform_create(self, serializer):
+        """
+        Perform creation of a list item, ensuring the user is authenticated.
+        The list and its owner access row are created in one transaction.
+        """
+        user = self.request.user
+        if user.is_anonymous:
+            raise PermissionDenied("User not logged in.")
+        with transaction.atomic():
+            serializer.save(user=user)
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    @action(detail=True, methods=['patch'])
+    def delete_item(self, request, pk=None):
+        """
+        Soft delete the list item by setting `is_active` to False.
+        """
+        user = request.user
+        if user.is_anonymous:
+            raise PermissionDenied("User not logged in.")
+        try:
+            list_item = self.get_object()
+            list_item.is_active = False
+            list_item.save()
+            return Response(
+                {"message": "Item successfully deleted!"}, status=200)
+
+        except ListItem.DoesNotExist:
+            return Response({"error": "Item not found!"}, status=404)
+
+
+router = SimpleRouter()
+router.register(r'', ListItemViewSet, basename='listitem')
+urlpatterns = format_suffix_patterns(router.urls)
@@ -0,0 +1,39 @@
+"""
+Simple informational endpoints: /index/, /test/ and /priverty/.
+"""
+
+# Third-party imports
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import api_view, permission_classes
+
+# Local imports
+from ..logging_utils import log
+
+
+@log(user_id="request.user.id", object_id="list_item.id")
+@api_view(['GET'])
+def index():
+    """
+    A simple index view for testing the API.
+    """
+    return Response({'hello': 'world'})
+
+
+@log(user_id="request.user.id", object_id="list_item.id")
+@api_view(['GET'])
+def test():
+    """
+    A test view to check basic functionality.
+    """
+    return Response({'test': 'success'})
+
+
+@log(user_id="request.user.id", object_id="list_item.id")
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def priverty():
+    """
+    A view to test access for authenticated users.
+    """
+    return Response({'privacy': 'success'})
@@ -0,0 +1,70 @@
+"""
+Recommendation views: shopping list suggestions generated with OpenAI.
+
+Served under /recommendations/.
+"""
+
+# Third-party imports
+from rest_framework import viewsets, status
+from rest_framework.response import Response
+from rest_framework.exceptions import NotFound
+
+# Local imports
+from ..serializer import RecommendationSerializer
+from ..models import ListItem, Recommendation
+from ..logging_utils import log
+from ..providers import get_openai
+
+
+class RecommendationViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for handling recommendations related to list items.
+    Allows creating and viewing recommendations for items in a shopping list.
+    """
+    queryset = Recommendation.objects.all()
+    serializer_class = RecommendationSerializer
+
+    @log(user_id="request.user.id", object_id="list_item.id")
+    def recommendations(self, request, list_item_id):
+        """
+        Generates recommendations for a shopping list based on the provided list item ID.
+        Uses OpenAI to generate a list of recommended items.
+        """
+        openai = get_openai()
+        try:
+            list_item = ListItem.objects.filter(id=list_item_id).first()
+            print(f"Fetching recommendations for list item with ID: {list_item_id}")
+
+            if not list_item or not list_item.items:
+                raise NotFound("No items found in the list.")
+
+            items = [item.strip() for item in list_item.items.split('|')]
+            prompt = f"Recommend items for a shopping list that includes: {', '.join(items)}"
+
+            response = openai.completions.create(
+                model="gpt-3.5-turbo",
+                prompt=prompt,
+                max_tokens=100
+            )
+
+            recommendations = response['choices'][0]['message']['content'].strip().split(',')
+
+            recommendation = Recommendation.objects.create(
+                list_item=list_item,
+                recommended_items=",".join(recommendations)
+            )
+
+            serializer = self.get_serializer(recommendation)
+            return Response(serializer.data)
+
+        except NotFound as e:
+            return Response({"error": str(e)},
+                            status=status.HTTP_404_NOT_FOUND)
+        except openai.OpenAIError as e:
+            print(f"Error occurred with OpenAI: {str(e)}")
+            return Response({"error": f"OpenAI error: {str(e)}"},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        except Exception as e:
+            print(f"Unexpected error: {str(e)}")
+            return Response({"error": "An unexpected error occurred."},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,110 @@
+"""
+User profile views: looking a user up by email and reading or updating a profile.
+
+Served under /get_user_info/ and /user/.
+"""
+
+# Third-party imports
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.decorators import api_view
+
+# Django imports
+from django.core.validators import validate_email
+from django.shortcuts import get_object_or_404
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+# Local imports
+from ..serializer import UserSerializer
+from ..logging_utils import log
+
+
+@log(user_id="request.user.id", object_id="list_item.id")
+@api_view(['GET'])
+def get_user_info_by_email(request, email):
+    """
+    Fetch user information by email.
+    Returns user details if found, otherwise an error.
+    """
+    if not email:
+        return Response({"error": "Email parameter is required."}, status=400)
+
+    try:
+        user = User.objects.get(email=email)
+        serializer = UserSerializer(user)
+        return Response(serializer.data)
+
+    except User.DoesNotExist:
+        return Response({"error": "User not found."}, status=404)
+
+
+@log(user_id="request.user.id", object_id="list_item.id")
+@api_view(['GET', 'PATCH'])
+def update_user(request, user_id):
+    """
+    Update user profile information.
+
+    This view handles two types of requests:
+    1. GET: Fetches the current profile data (username, first name, last name, email).
+    2. PATCH: Updates the user's profile with the provided data.
+
+    When updating, the function performs several checks:
+    - Ensures that the provided email is valid and unique.
+    - Ensures that the provided username is unique.
+    - Ensures that the request is being made by the user themselves 
+    (no one else can update the profile of another user).
+
+    If any of the required fields (email, username) already exist in the system,
+    a 400 error will be returned.
+    If the request is successful, a 200 status with a success message is returned.
+    If the request is unauthorized, a 403 error is returned.
+    """
+    user = get_object_or_404(User, pk=user_id)
+
+    if request.method == 'GET':
+        user_data = {
+            "username": user.username,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "email": user.email
+        }
+        return Response(user_data, status=status.HTTP_200_OK)
+
+    if request.method == 'PATCH':
+        data = request.data
+
+        if 'username' in data:
+            username = data['username']
+            if User.objects.filter(username=username).exclude(id=user.id).exists():
+                return Response({'error': 'Username already exists.'},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+        if 'email' in data:
+            email = data['email']
+            try:
+                validate_email(email)
+            except ValidationError:
+                return Response(
+                    {"error": "Invalid email format."}, status=status.HTTP_400_BAD_REQUEST)
+
+            if User.objects.filter(email=email).exclude(id=user.id).exists():
+                return Response({'error': 'Email already in use.'},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+        user.username = data.get('username', user.username)
+        user.first_name = data.get('first_name', user.first_name)
+        user.last_name = data.get('last_name', user.last_name)
+        user.email = data.get('email', user.email)
+        try:
+            with transaction.atomic():
+                user.save()
+        except IntegrityError:
+            # Taken concurrently, after the checks above.
+            return Response({'error': 'Username or email already in use.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"message": "Profile updated successfully!"}, status=status.HTTP_200_OK)
+
+    return Response({"error": "Invalid request method."}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
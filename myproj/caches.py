@@ -0,0 +1,104 @@
+"""
+Environment-driven cache configuration for the myproj project.
+
+Two cache aliases are configured:
+- 'shared': the cache shared by every worker and instance (L2), selected by
+  CACHE_URL. Use it for data that must be seen by all processes at once, such as
+  throttle buckets, locks and the versions of namespaced keys.
+- 'default': what `django.core.cache.cache` returns. When the shared cache is remote
+  (Redis, files) and CACHE_L1_SIZE is not 0, it is a `lista.cache_backends.TieredCache`:
+  a small in-process LRU (L1) in front of 'shared'. Otherwise it is 'shared' itself.
+
+An entry cached in a worker's L1 may outlive a change made by another worker for up
+to CACHE_L1_TIMEOUT seconds. Changes made by the same worker are seen at once.
+
+Environment variables:
+- CACHE_URL: the shared cache (default 'locmem://', i.e. per process):
+  - 'redis://[:password@]host:6379/0' or 'rediss://...': Redis, through Django's
+    Redis backend (the `redis` package). `python manage.py run_redis_standin` serves a
+    Redis-compatible stand-in for local runs and tests;
+  - 'file:///var/tmp/lista-cache': files in a directory shared by the workers of a host;
+  - 'locmem://': per process memory, for development;
+  - 'dummy://': no caching.
+- CACHE_KEY_PREFIX: prefix of every key, e.g. to share a Redis between deployments.
+- CACHE_TIMEOUT: default seconds an entry is kept, default 300.
+- CACHE_L1_SIZE: entries kept in each process's L1, default 1024; 0 disables it.
+- CACHE_L1_TIMEOUT: maximum seconds an entry is served from L1, default 5.
+"""
+
+import os
+from urllib.parse import urlparse
+
+LOCMEM_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+REDIS_BACKEND = 'django.core.cache.backends.redis.RedisCache'
+FILE_BACKEND = 'django.core.cache.backends.filebased.FileBasedCache'
+DUMMY_BACKEND = 'django.core.cache.backends.dummy.DummyCache'
+TIERED_BACKEND = 'lista.cache_backends.TieredCache'
+
+SHARED_ALIAS = 'shared'
+
+# Backends of the shared cache that are visible to other processes.
+_REMOTE_BACKENDS = (REDIS_BACKEND, FILE_BACKEND)
+
+
+def is_remote(cache):
+    """
+    Tells whether a cache configuration is visible to other processes (Redis, files).
+
+    Args:
+        cache (dict): One entry of the CACHES setting.
+
+    Returns:
+        bool: True when every worker reads and writes the same entries.
+    """
+    return cache.get('BACKEND') in _REMOTE_BACKENDS
+
+
+def _shared_cache_from_url(url):
+    """
+    Returns the BACKEND and LOCATION of the shared cache described by CACHE_URL.
+
+    Raises:
+        ValueError: If the URL's scheme isn't supported.
+    """
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    if scheme in ('redis', 'rediss', 'unix'):
+        return {'BACKEND': REDIS_BACKEND, 'LOCATION': url}
+    if scheme == 'file':
+        return {'BACKEND': FILE_BACKEND, 'LOCATION': parsed.path}
+    if scheme == 'locmem':
+        return {'BACKEND': LOCMEM_BACKEND, 'LOCATION': parsed.netloc or 'lista'}
+    if scheme == 'dummy':
+        return {'BACKEND': DUMMY_BACKEND}
+    raise ValueError(f"Unsupported CACHE_URL scheme: {scheme!r}")
+
+
+def cache_config():
+    """
+    Builds the CACHES setting from the environment.
+
+    Returns:
+        dict: The 'default' and 'shared' cache configurations.
+    """
+    common = {
+        'TIMEOUT': int(os.getenv('CACHE_TIMEOUT', '300')),
+        'KEY_PREFIX': os.getenv('CACHE_KEY_PREFIX', ''),
+    }
+    shared = {**_shared_cache_from_url(os.getenv('CACHE_URL', 'locmem://')), **common}
+
+    l1_size = int(os.getenv('CACHE_L1_SIZE', '1024'))
+    if not is_remote(shared) or l1_size <= 0:
+        # Two locmem aliases with the same LOCATION share their storage.
+        return {'default': dict(shared), SHARED_ALIAS: shared}
+
+    default = {
+        'BACKEND': TIERED_BACKEND,
+        'LOCATION': SHARED_ALIAS,
+        'TIMEOUT': common['TIMEOUT'],
+        'OPTIONS': {
+            'L1_SIZE': l1_size,
+            'L1_TIMEOUT': float(os.getenv('CACHE_L1_TIMEOUT', '5')),
+        },
+    }
+    return {'default': default, SHARED_ALIAS: shared}
@@ -0,0 +1,138 @@
+"""
+Gunicorn configuration of the production runtime.
+
+Used by the Procfile and the container entrypoint:
+
+    gunicorn -c python:myproj.gunicorn_config
+
+The worker count follows the CPUs available to the container (cgroup quota and
+CPU affinity, not the host's CPU count), so the same image scales with the
+instance size. The API is synchronous Django, so the default worker class is
+gthread: each worker process serves GUNICORN_THREADS requests concurrently, which
+keeps requests waiting on the database, S3 or the password hashing pool from
+blocking the rest. To resize a running server, send TTIN/TTOU to the master process.
+
+Environment variables:
+- PORT: Port to listen on, default 8000 (set by Render).
+- WEB_CONCURRENCY: Number of worker processes. Default: 1 per CPU + 1 for gthread
+  and uvicorn workers, whose threads or event loop already overlap waits, and
+  2 per CPU + 1 for sync workers; at most GUNICORN_MAX_WORKERS (default 8).
+- GUNICORN_WORKER_CLASS: 'gthread' (default), 'sync' or 'uvicorn'. uvicorn serves
+  myproj.asgi with uvicorn's gunicorn worker (`pip install uvicorn`); Django runs
+  the synchronous views of an ASGI worker one at a time, so it only pays off for
+  async views.
+- GUNICORN_THREADS: Threads per gthread worker, default 4. With the PostgreSQL pool,
+  keep DB_POOL_MAX_SIZE at least this large.
+- GUNICORN_PRELOAD: 'true' (default) imports the application once in the master
+  before forking, so workers start faster and share memory pages; the lazily
+  routed views of the served domains (API_DOMAINS) are imported then too. Nothing
+  may open a database connection or start a thread at import time.
+- GUNICORN_MAX_REQUESTS, GUNICORN_MAX_REQUESTS_JITTER: Restart a worker after about
+  this many requests (default 1000 +/- 100), so slow leaks can't accumulate and
+  workers don't all restart at once.
+- GUNICORN_TIMEOUT: Seconds a silent worker is given before it is killed, default 30.
+- GUNICORN_GRACEFUL_TIMEOUT: Seconds workers get to finish their requests on
+  restart or shutdown, default 30.
+- GUNICORN_KEEPALIVE: Seconds an idle keep-alive connection is held open, default 5.
+  Keep it above the idle timeout of the load balancer in front.
+
+Workers write their pending last_login timestamps (lista.last_login) when they exit.
+"""
+
+import math
+import os
+from pathlib import Path
+
+from myproj.database import env_bool
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+
+
+def available_cpus():
+    """
+    Returns the number of CPUs this process may use, honouring the cgroup CPU quota
+    of a container.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    try:
+        quota, period = Path('/sys/fs/cgroup/cpu.max').read_text().split()
+        if quota != 'max':
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def default_workers(cpus, worker_class_name):
+    """
+    Returns the default number of worker processes for `cpus` CPUs.
+    """
+    per_cpu = 2 if worker_class_name == 'sync' else 1
+    return min(per_cpu * cpus + 1, int(os.getenv('GUNICORN_MAX_WORKERS', '8')))
+
+
+worker_class_name = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+if worker_class_name not in WORKER_CLASSES:
+    raise ValueError(f"Unknown GUNICORN_WORKER_CLASS {worker_class_name!r}, "
+                     f"expected one of {', '.join(WORKER_CLASSES)}")
+
+wsgi_app = 'myproj.asgi:application' if worker_class_name == 'uvicorn' else 'myproj.wsgi:application'
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = WORKER_CLASSES[worker_class_name]
+workers = int(os.getenv('WEB_CONCURRENCY') or default_workers(available_cpus(), worker_class_name))
+threads = int(os.getenv('GUNICORN_THREADS', '4')) if worker_class_name == 'gthread' else 1
+preload_app = env_bool('GUNICORN_PRELOAD', default=True)
+
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+# Heartbeat files in memory: a container's overlay filesystem can stall workers.
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def when_ready(server):
+    """
+    With preload, imports the views of the served domains in the master, so the
+    workers inherit them instead of each importing them on its first requests.
+    """
+    if preload_app:
+        # pylint: disable=import-outside-toplevel
+        from lista.routing import load_all
+
+        load_all()
+
+
+def worker_exit(server, worker):
+    """
+    Writes the worker's pending last_login timestamps before it exits.
+    """
+    # pylint: disable=import-outside-toplevel
+    from django.apps import apps
+    from django.db import connections
+
+    if not apps.ready:
+        # The worker failed before loading the application.
+        return
+
+    from lista.last_login import flush_last_logins
+
+    try:
+        flush_last_logins()
+    finally:
+        connections.close_all()
@@ -15,6 +15,9 @@ from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
 
+from myproj.caches import cache_config
+from myproj.database import database_config, env_bool
+
 load_dotenv()
 
 SENDGRID_API_KEY = os.getenv("SENDGRID_API_KEY")
@@ -51,6 +54,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'lista.compression.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -84,15 +88,23 @@ WSGI_APPLICATION = 'myproj.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
+# SQLite by default; set DATABASE_URL or DB_ENGINE=postgres for PostgreSQL
+# (see myproj/database.py for the supported variables).
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(BASE_DIR)
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/ref/settings/#caches
+# Per-process memory by default; set CACHE_URL (e.g. redis://host:6379/0) for a cache
+# shared by every worker, with an in-process L1 in front of it
+# (see myproj/caches.py for the supported variables).
+
+CACHES = cache_config()
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -111,6 +123,28 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Passwords are checked by a ModelBackend that hashes in the bounded pool of
+# lista.hashing instead of on the request worker.
+AUTHENTICATION_BACKENDS = ['lista.backends.PooledPasswordBackend']
+
+# Password hashing pool (lista.hashing): concurrent hashes per process, hashes
+# allowed to wait for the pool before requests get 503, and seconds a request
+# waits for its hash. PASSWORD_HASHING_WORKERS=0 hashes on the request worker.
+PASSWORD_HASHING_WORKERS = int(os.getenv("PASSWORD_HASHING_WORKERS", "2"))
+PASSWORD_HASHING_MAX_QUEUE = int(os.getenv("PASSWORD_HASHING_MAX_QUEUE", "8"))
+PASSWORD_HASHING_TIMEOUT = float(os.getenv("PASSWORD_HASHING_TIMEOUT", "10"))
+
+# Token buckets of the login, registration and password reset throttles
+# (lista.throttling), as (capacity, period in seconds): a client may burst up to
+# `capacity` requests and is refilled at `capacity` per `period`. 'auth_ip' is per
+# client IP, 'auth_account' per account and client IP.
+AUTH_THROTTLE_BUCKETS = {
+    'auth_ip': (int(os.getenv("AUTH_THROTTLE_IP_CAPACITY", "20")),
+                float(os.getenv("AUTH_THROTTLE_IP_PERIOD", "60"))),
+    'auth_account': (int(os.getenv("AUTH_THROTTLE_ACCOUNT_CAPACITY", "5")),
+                     float(os.getenv("AUTH_THROTTLE_ACCOUNT_PERIOD", "60"))),
+}
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -138,6 +172,79 @@ STATICFILES_DIRS = [
 MEDIA_ROOT = BASE_DIR / 'static/images'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Media storage
+# STORAGE_BACKEND=local keeps uploads in MEDIA_ROOT (single instance / development).
+# STORAGE_BACKEND=s3 stores them in an S3-compatible bucket (AWS S3, MinIO, moto server),
+# which is shared between instances and survives redeploys.
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+if STORAGE_BACKEND == 's3':
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
+
+    STORAGES['default'] = {
+        'BACKEND': 'storages.backends.s3.S3Storage',
+        'OPTIONS': {
+            'bucket_name': os.getenv("S3_BUCKET_NAME", "lista-media"),
+            'endpoint_url': os.getenv("S3_ENDPOINT_URL") or None,
+            'region_name': os.getenv("S3_REGION_NAME") or None,
+            'access_key': os.getenv("S3_ACCESS_KEY_ID"),
+            'secret_key': os.getenv("S3_SECRET_ACCESS_KEY"),
+            'addressing_style': os.getenv("S3_ADDRESSING_STYLE") or None,
+            'file_overwrite': False,
+            'default_acl': None,
+            # Downloads are served through presigned URLs returned by image.url.
+            'querystring_auth': True,
+            'querystring_expire': int(os.getenv("S3_PRESIGNED_EXPIRE", "3600")),
+            'client_config': Config(
+                signature_version='s3v4',
+                max_pool_connections=int(os.getenv("S3_MAX_POOL_CONNECTIONS", "20")),
+                retries={'max_attempts': 3, 'mode': 'standard'},
+            ),
+            'transfer_config': TransferConfig(
+                multipart_threshold=int(os.getenv("S3_MULTIPART_THRESHOLD", str(8 * 1024 * 1024))),
+                multipart_chunksize=int(os.getenv("S3_MULTIPART_CHUNKSIZE", str(8 * 1024 * 1024))),
+            ),
+        },
+    }
+
+# Maximum size accepted for direct-to-storage (presigned) uploads.
+PRESIGNED_UPLOAD_MAX_BYTES = int(os.getenv("PRESIGNED_UPLOAD_MAX_BYTES", str(20 * 1024 * 1024)))
+
+# Image uploads are decoded, verified and saved in a shared thread pool.
+# IMAGE_UPLOAD_MAX_CONCURRENCY limits how many images of a single request run at once.
+IMAGE_UPLOAD_POOL_SIZE = int(os.getenv("IMAGE_UPLOAD_POOL_SIZE", "8"))
+IMAGE_UPLOAD_MAX_CONCURRENCY = int(os.getenv("IMAGE_UPLOAD_MAX_CONCURRENCY", "4"))
+
+
+# Response compression (see lista/compression.py). zstd and Brotli are used when the
+# optional zstandard/brotli packages are installed, gzip otherwise.
+COMPRESSION_ENCODINGS = [
+    encoding.strip() for encoding in
+    os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",") if encoding.strip()
+]
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_LEVELS = {
+    'gzip': int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+    'br': int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4")),
+    'zstd': int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3")),
+}
+COMPRESSION_EXCLUDED_TYPES = [
+    'image/', 'video/', 'audio/', 'font/woff2',
+    'application/zip', 'application/gzip', 'application/x-gzip',
+    'application/zstd', 'application/x-brotli', 'application/pdf',
+]
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -182,12 +289,45 @@ APPEND_SLASH = False
 
 
 
+# Responses are JSON by default, or MessagePack for clients sending
+# `Accept: application/msgpack` (see lista/renderers.py).
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+        'lista.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        'lista.renderers.MessagePackRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+        'lista.renderers.MessagePackParser',
+    ),
+    # Number of reverse proxies in front of the application (e.g. 1 behind the
+    # Heroku router or a load balancer). Client IPs, used by the throttles, are
+    # taken that many hops from the end of X-Forwarded-For. With 0 the header is
+    # ignored and the connection's address is used: a client could otherwise send
+    # any X-Forwarded-For and pick the IP it is throttled as. Behind a proxy it must
+    # be set (the Procfile sets 1 for the Render router), or every client is
+    # throttled as the proxy and shares one login bucket.
+    'NUM_PROXIES': int(os.getenv("NUM_PROXIES", "0")),
 }
 
+# FAST_JSON=true renders and parses JSON with orjson (see lista/renderers.py).
+# The output is identical to DRF's JSON renderer.
+if env_bool("FAST_JSON"):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
+        'lista.renderers.ORJSONRenderer',
+        *REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'][1:],
+    )
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = (
+        'lista.renderers.ORJSONParser',
+        *REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'][1:],
+    )
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=25),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=90),
@@ -218,6 +358,46 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
 }
 
+# Validated access tokens and their user are reused for JWT_AUTH_CACHE_TTL seconds
+# (never past the token's expiry) by lista.authentication.CachedJWTAuthentication.
+JWT_AUTH_CACHE_TTL = int(os.getenv("JWT_AUTH_CACHE_TTL", "60"))
+JWT_AUTH_CACHE_SIZE = int(os.getenv("JWT_AUTH_CACHE_SIZE", "1024"))
+
+# last_login is coalesced in memory and written in bulk every
+# LAST_LOGIN_FLUSH_INTERVAL seconds (see lista/last_login.py).
+LAST_LOGIN_WRITE_BEHIND = env_bool("LAST_LOGIN_WRITE_BEHIND", default=True)
+LAST_LOGIN_FLUSH_INTERVAL = float(os.getenv("LAST_LOGIN_FLUSH_INTERVAL", "10"))
+LAST_LOGIN_FLUSH_SIZE = int(os.getenv("LAST_LOGIN_FLUSH_SIZE", "500"))
+
+# Revoked refresh tokens are checked in memory (see lista/tokens.py); tokens revoked
+# by another worker are loaded at most this many seconds later.
+TOKEN_REVOCATION_REFRESH_INTERVAL = float(os.getenv("TOKEN_REVOCATION_REFRESH_INTERVAL", "5"))
+# Revocations committed out of ID order are caught by re-reading the rows of the last
+# RESCAN_WINDOW seconds, and by a full reload every RELOAD_INTERVAL seconds.
+TOKEN_REVOCATION_RESCAN_WINDOW = float(os.getenv("TOKEN_REVOCATION_RESCAN_WINDOW", "60"))
+TOKEN_REVOCATION_RELOAD_INTERVAL = float(os.getenv("TOKEN_REVOCATION_RELOAD_INTERVAL", "3600"))
+
+# Seconds a user's customization stays in the cache (lista.customization_cache),
+# and the number of lookups between two logs of the cache's hit rate (0: never).
+CUSTOMIZATION_CACHE_TIMEOUT = int(os.getenv("CUSTOMIZATION_CACHE_TIMEOUT", "3600"))
+CUSTOMIZATION_CACHE_STATS_INTERVAL = int(os.getenv("CUSTOMIZATION_CACHE_STATS_INTERVAL", "1000"))
+
+# API domains served by this deployment (lista.urls.DOMAINS), comma-separated,
+# e.g. 'images' for a dedicated image upload pool. Empty serves all of them.
+API_DOMAINS = [domain.strip() for domain in os.getenv("API_DOMAINS", "").split(",")
+               if domain.strip()]
+
+# Seconds a user's resolved list permissions stay in the cache. Entries are
+# invalidated by version whenever the user's access rows change. They are only
+# cached when the shared cache is remote (CACHE_URL), so that every worker sees the
+# invalidation; otherwise they are read from the database on every request.
+PERMISSION_CACHE_TIMEOUT = int(os.getenv("PERMISSION_CACHE_TIMEOUT", "300"))
+
+# Maximum number of operations in a /batch/ request, and seconds the response of a
+# batch sent with an Idempotency-Key is replayed to retries (see lista/batch.py).
+BATCH_MAX_OPERATIONS = int(os.getenv("BATCH_MAX_OPERATIONS", "100"))
+BATCH_IDEMPOTENCY_TTL = int(os.getenv("BATCH_IDEMPOTENCY_TTL", str(24 * 60 * 60)))
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:8081", "https://lista-project.netlify.app"
 ]